@@ -0,0 +1,2 @@
+from gedcom.reader import iter_records, fetch_record, peek_gedcom_file
+from gedcom.line_table import read_line_table
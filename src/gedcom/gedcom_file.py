@@ -1,5 +1,36 @@
 import re
-import gedcom
+import io
+import os
+import mmap
+import codecs
+from collections import namedtuple, Counter
+import gedcom.tags
+
+
+def get_gedcom_relevant_end(gedcom_lines, start=0, end=None, valid_top_level_tags = None):
+    '''
+    Return the offset (exclusive) where the structure starting in gedcom_lines[start] ends, without copying gedcom_lines
+    :param gedcom_lines: list of GEDCOM lines containing the record
+    :param start: offset of the first line of the structure
+    :param end: offset (exclusive) where the search stops; if None the search goes on until the end of gedcom_lines
+    :param valid_top_level_tags: if the GEDCOM structure does not have a hierarchical structure of levels (e.g. ADDRESS_STRUCTURE)
+                                 then this is a list of valid top level tags (e.g.['ADDR', 'PHON', 'EMAIL', 'FAX', 'WWW'] ) 
+    '''
+    if end is None:
+        end = len(gedcom_lines)
+    if start >= end:
+        return start
+    if isinstance(gedcom_lines, GedcomLines):
+        return min(gedcom_lines.get_subtree_end(start, valid_top_level_tags), end)
+    starting_level = gedcom_lines[start].level
+    index = start + 1
+    while index < end:
+        line = gedcom_lines[index]
+        if line.level > starting_level or (valid_top_level_tags and line.tag in valid_top_level_tags and line.level == starting_level):
+            index += 1
+        else:
+            break
+    return index
 
 
 def get_gedcom_relevant_lines(gedcom_lines, valid_top_level_tags = None):
@@ -9,20 +40,316 @@ def get_gedcom_relevant_lines(gedcom_lines, valid_top_level_tags = None):
     :param valid_top_level_tags: if the GEDCOM structure does not have a hierarchical structure of levels (e.g. ADDRESS_STRUCTURE)
                                  then this is a list of valid top level tags (e.g.['ADDR', 'PHON', 'EMAIL', 'FAX', 'WWW'] ) 
     '''
-    relevant_lines = []
-    if gedcom_lines and len(gedcom_lines)>0:
-            element = None
-            for line in gedcom_lines[1:]:
-                if line.level > gedcom_lines[0].level or (valid_top_level_tags and line.tag in valid_top_level_tags and line.level == gedcom_lines[0].level):
-                    element = line
-                else:
-                    break
-            if element == None:
-                index = 0
-            else:
-                index = gedcom_lines.index(element)
-            relevant_lines = gedcom_lines[:index+1]
-    return relevant_lines
+    return gedcom_lines[:get_gedcom_relevant_end(gedcom_lines, 0, None, valid_top_level_tags)]
+
+
+# Each line should have the following (bracketed items optional):
+# level + ' ' + [pointer + ' ' +] tag + [' ' + line_value] + terminator
+# Level must start with non-negative int, no leading zeros; pointer, if it exists, must be flanked by `@`;
+# tag must be an alphanumeric string; value consists of anything after a space to end of line;
+# end of line is defined by `\n` or `\r`. The terminator is optional here so that the same regex
+# can tokenize GEDCOM chunks whose last line has no terminator; validation checks it separately.
+GEDCOM_LINE_REGEX = re.compile('^(0|[1-9][0-9]*) (?:(@[^@]+@) )?([A-Za-z0-9_]+)(?: ([^\n\r]*))?([\r\n]{1,2})?$')
+GEDCOM_TRAILER_LINE = '0 ' + gedcom.tags.GEDCOM_TAG_TRAILER
+# Validation modes of GEDCOM lines of an import, turned into the validate and trusted arguments of the reading functions
+# by get_validation_arguments: STRICT_VALIDATION skips the lines not satisfying is_valid_gedcom_line; LENIENT_VALIDATION 
+# accepts also lines without terminator; TRUSTED_INPUT splits the lines on spaces without any check (see split_gedcom_line), 
+# for files known to be valid
+STRICT_VALIDATION = "strict"
+LENIENT_VALIDATION = "lenient"
+TRUSTED_INPUT = "trusted"
+VALIDATION_MODES = (STRICT_VALIDATION, LENIENT_VALIDATION, TRUSTED_INPUT)
+# Ids of the CONC and CONT tags, checked on every continuation line by join_continued_text
+CONCATENATION_TAG_ID = gedcom.tags.get_tag_id(gedcom.tags.GEDCOM_TAG_CONCATENATION)
+CONTINUED_TAG_ID = gedcom.tags.get_tag_id(gedcom.tags.GEDCOM_TAG_CONTINUED)
+# Size of the blocks of bytes copied out of a GedcomFileMap at once when counting lines
+GEDCOM_MAP_BLOCK_SIZE = 1 << 24
+# Tag of a level 0 line and of a level 1 line, on raw bytes
+GEDCOM_RECORD_TAG_REGEX = re.compile(rb'0 (?:@[^@\r\n]+@ )?([A-Za-z0-9_]+)(?=[ \r\n]|\Z)')
+GEDCOM_SUBSTRUCTURE_TAG_REGEX = re.compile(rb'1 (?:@[^@\r\n]+@ )?([A-Za-z0-9_]+)(?=[ \r\n]|\Z)')
+
+
+class GedcomToken(namedtuple('GedcomToken', ['level', 'pointer', 'tag', 'value', 'line_number'])):
+    """
+    Fields of a single GEDCOM line, as produced by tokenize_gedcom
+    """
+    __slots__ = ()
+
+
+def split_gedcom_line(line, line_number=0):
+    '''
+    Splits a GEDCOM line into a GedcomToken on its first spaces, without any regex nor check: it is the fast path of
+    trusted input (see TRUSTED_INPUT), and the result for lines not satisfying is_valid_gedcom_line is undefined
+    :param line: GEDCOM line, including its terminator
+    :param line_number: line number of the line in the GEDCOM file
+    :return: GedcomToken, or None if the line is blank
+    '''
+    level, _, rest = line.rstrip("\r\n").partition(" ")
+    if not rest:
+        return None
+    if rest[0] == "@":
+        pointer, _, rest = rest.partition(" ")
+    else:
+        pointer = ""
+    tag, _, value = rest.partition(" ")
+    return GedcomToken(int(level), pointer, tag, value.strip(), line_number)
+
+
+def get_validation_arguments(validation):
+    '''
+    Return the validate and trusted arguments of the reading functions (e.g. read_gedcom_lines) for a validation mode
+    :param validation: STRICT_VALIDATION, LENIENT_VALIDATION or TRUSTED_INPUT
+    '''
+    if validation not in VALIDATION_MODES:
+        raise ValueError("unknown validation mode %r, expected one of %s" % (validation, ", ".join(VALIDATION_MODES)))
+    return validation != LENIENT_VALIDATION, validation == TRUSTED_INPUT
+
+
+def match_gedcom_line(line, line_number=0, validate=True, trusted=False):
+    '''
+    Splits a GEDCOM line into a GedcomToken with a single regex match
+    :param line: GEDCOM line, including its terminator
+    :param line_number: line number of the line in the GEDCOM file
+    :param validate: if True, lines not satisfying is_valid_gedcom_line are rejected; otherwise also lines without terminator are accepted
+    :param trusted: if True, the line is split by split_gedcom_line without any check, and validate is ignored
+    :return: GedcomToken, or None if the line is rejected
+    '''
+    if trusted:
+        return split_gedcom_line(line, line_number)
+    match = GEDCOM_LINE_REGEX.match(line)
+    if match is None:
+        return None
+    if validate and not match.group(5) and line != GEDCOM_TRAILER_LINE:
+        return None
+    value = match.group(4)
+    return GedcomToken(int(match.group(1)), match.group(2) or "", match.group(3), value.strip() if value else "", line_number)
+
+
+def tokenize_gedcom(lines, validate=True, trusted=False):
+    '''
+    Scans GEDCOM lines once, yielding a GedcomToken (level, pointer, tag, value, line number) for each accepted line
+    :param lines: iterable of GEDCOM lines (e.g. an open text file)
+    :param validate: if True, lines not satisfying is_valid_gedcom_line are skipped
+    :param trusted: if True, lines are split by split_gedcom_line without any check
+    '''
+    for line_number, line in enumerate(lines):
+        token = match_gedcom_line(line, line_number, validate, trusted)
+        if token is not None:
+            yield token
+
+
+def read_gedcom_lines(lines, validate=True, first_line_number=0, keep_content=False, trusted=False):
+    '''
+    Returns the list of GedcomLine objects built from lines, tokenizing each line only once
+    :param lines: iterable of GEDCOM lines (e.g. an open text file)
+    :param validate: if True, lines not satisfying is_valid_gedcom_line are skipped
+    :param first_line_number: line number of the first line in the GEDCOM file
+    :param keep_content: if True each GedcomLine keeps its raw content, as needed to write the lines back unchanged
+    :param trusted: if True, lines are split by split_gedcom_line without any check
+    '''
+    gedcom_lines_list = []
+    if trusted:
+        for line_number, line in enumerate(lines, first_line_number):
+            token = split_gedcom_line(line, line_number)
+            if token is not None:
+                gedcom_lines_list.append(GedcomLine(line, line_number, token, keep_content))
+        return gedcom_lines_list
+    for line_number, line in enumerate(lines, first_line_number):
+        token = match_gedcom_line(line, line_number, validate)
+        if token is not None:
+            gedcom_lines_list.append(GedcomLine(line, line_number, token, keep_content))
+    return gedcom_lines_list
+
+
+def read_gedcom_file(input_path, validate=True, keep_content=False, trusted=False):
+    '''
+    Reads a GEDCOM file in a single pass and returns its lines as a list of GedcomLine objects
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+    :param validate: if True, lines not satisfying is_valid_gedcom_line are skipped
+    :param keep_content: if True each GedcomLine keeps its raw content, as needed to write the lines back unchanged
+    :param trusted: if True, lines are split by split_gedcom_line without any check
+    '''
+    with open(input_path, mode='r', encoding='utf-8-sig') as content_file:
+        return read_gedcom_lines(content_file, validate, keep_content=keep_content, trusted=trusted)
+
+
+class GedcomRecordSpan(namedtuple('GedcomRecordSpan', ['pointer', 'tag', 'start', 'end', 'line_number'])):
+    """
+    Location of a level 0 record in the bytes of a GEDCOM file, as produced by GedcomFileMap.iter_record_spans:
+    pointer and tag of its first line, start and end (exclusive) byte offsets, line number of its first line
+    """
+    __slots__ = ()
+
+
+class GedcomFileMap(object):
+    """
+    Read-only memory map of a GEDCOM file.
+    Line and level 0 record boundaries are found on the raw bytes of the mapping, and only the records
+    actually read through read_record_lines are decoded: the bodies of the other records are never decoded nor copied.
+    It can be used as a context manager, closing the mapping on exit.
+    """
+    def __init__(self, input_path):
+        self.__file = open(input_path, mode='rb')
+        if os.fstat(self.__file.fileno()).st_size > 0:
+            self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(self.__map, 'madvise'):
+                self.__map.madvise(mmap.MADV_SEQUENTIAL)
+        else:
+            self.__map = b""
+        self.__start = len(codecs.BOM_UTF8) if self.__map[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+        # GEDCOM lines are terminated by \n or \r\n, or by \r alone in files coming from older systems
+        self.__terminator = b"\r" if self.__map.find(b"\n") < 0 and self.__map.find(b"\r") >= 0 else b"\n"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if isinstance(self.__map, mmap.mmap):
+            self.__map.close()
+        self.__file.close()
+
+    def get_bytes(self, start, end):
+        '''
+        Return the raw bytes of the file between the offsets start and end (exclusive)
+        '''
+        return self.__map[start:end]
+
+    def write_bytes(self, output, start, end):
+        '''
+        Writes the raw bytes of the file between the offsets start and end (exclusive) to a binary stream, 
+        straight from the mapping, without copying them
+        '''
+        with memoryview(self.__map)[start:end] as view:
+            output.write(view)
+
+    def __count_lines(self, start, end):
+        return sum(self.__map[offset:min(offset + GEDCOM_MAP_BLOCK_SIZE, end)].count(self.__terminator) 
+                   for offset in range(start, end, GEDCOM_MAP_BLOCK_SIZE))
+
+    def __find_record_start(self, offset):
+        # Return the offset of the first level 0 line starting at or after offset
+        if offset == self.__start and self.__map[offset:offset + 2] == b"0 ":
+            return offset
+        start = self.__map.find(self.__terminator + b"0 ", max(offset - len(self.__terminator), self.__start))
+        return len(self.__map) if start < 0 else start + len(self.__terminator)
+
+    def split_records(self, chunks):
+        '''
+        Splits the records of the file into at most chunks contiguous groups of similar size in bytes
+        Return a list of (start, end, line_number) tuples, whose offsets are boundaries of level 0 records
+        and can be passed to iter_record_spans
+        :param chunks: maximum number of groups
+        '''
+        first_start = self.__find_record_start(self.__start)
+        size = len(self.__map) - first_start
+        starts = sorted(set(self.__find_record_start(first_start + size * chunk // chunks) for chunk in range(chunks)))
+        ends = starts[1:] + [len(self.__map)]
+        line_number = self.__count_lines(self.__start, first_start)
+        split = []
+        for start, end in zip(starts, ends):
+            if start < end:
+                split.append((start, end, line_number))
+                line_number += self.__count_lines(start, end)
+        return split
+
+    def iter_record_spans(self, start=None, end=None, line_number=None):
+        '''
+        Scans the mapping for level 0 lines, yielding a GedcomRecordSpan for each record without decoding its body
+        :param start: offset of the first record to be scanned, which must be a boundary of a level 0 record; if None the scan starts from the first record
+        :param end: offset (exclusive) where the scan stops, which must be a boundary of a level 0 record; if None the scan goes on until the end of the file
+        :param line_number: line number of the line starting at start; if None it is counted
+        '''
+        separator = self.__terminator + b"0 "
+        if start is None:
+            start = self.__find_record_start(self.__start)
+        if end is None:
+            end = len(self.__map)
+        if line_number is None:
+            line_number = self.__count_lines(self.__start, start)
+        while start < end:
+            record_end = self.__map.find(separator, start, end)
+            record_end = end if record_end < 0 else record_end + len(self.__terminator)
+            line_end = self.__map.find(self.__terminator, start, record_end)
+            first_line = self.__map[start:record_end if line_end < 0 else line_end + 1].decode('utf-8', errors='replace')
+            token = match_gedcom_line(first_line, line_number, validate=False)
+            yield GedcomRecordSpan(token.pointer if token else "", token.tag if token else "", start, record_end, line_number)
+            line_number += self.__count_lines(start, record_end)
+            start = record_end
+
+    def count_record_tags(self):
+        '''
+        Counts the level 0 records by tag with a raw scan of the mapping, in blocks of about GEDCOM_MAP_BLOCK_SIZE bytes
+        starting at a line terminator, without splitting, copying nor decoding the records
+        :return: Counter of the number of records by tag (e.g. counts["INDI"])
+        '''
+        counts = Counter()
+        start = self.__find_record_start(self.__start)
+        match = GEDCOM_RECORD_TAG_REGEX.match(self.__map, start)
+        if match:
+            counts[match.group(1)] += 1
+        # the other level 0 lines follow a terminator: a literal prefix lets the regex engine skip quickly to them
+        scan_regex = re.compile(re.escape(self.__terminator) + GEDCOM_RECORD_TAG_REGEX.pattern)
+        while start < len(self.__map):
+            end = self.__map.rfind(self.__terminator, start + 1, start + GEDCOM_MAP_BLOCK_SIZE)
+            if end < 0:
+                # last block, or line longer than a block
+                end = self.__map.find(self.__terminator, start + GEDCOM_MAP_BLOCK_SIZE)
+                end = len(self.__map) if end < 0 else end
+            counts.update(scan_regex.findall(self.__map, start, end))
+            start = end
+        return Counter({tag.decode('ascii'): count for tag, count in counts.items()})
+
+    def finditer(self, regex, span):
+        '''
+        Return an iterator over the matches of a bytes regex in the record located by span, without copying nor decoding the record
+        :param regex: compiled regular expression on bytes
+        :param span: GedcomRecordSpan yielded by iter_record_spans
+        '''
+        return regex.finditer(self.__map, span.start, span.end)
+
+    def __iter_projected_runs(self, span, tags):
+        # Yields the (start, end, line_number) runs of contiguous lines of the record located by span made of its level 0 line
+        # and of its level 1 substructures with a tag in tags; the other substructures are skipped by their level 1 lines only
+        separator = self.__terminator + b"1 "
+        line_number = span.line_number
+        run_start = span.start
+        run_end = self.__map.find(separator, span.start, span.end)
+        run_end = span.end if run_end < 0 else run_end + len(self.__terminator)
+        while run_end < span.end:
+            substructure_end = self.__map.find(separator, run_end, span.end)
+            substructure_end = span.end if substructure_end < 0 else substructure_end + len(self.__terminator)
+            match = GEDCOM_SUBSTRUCTURE_TAG_REGEX.match(self.__map, run_end, substructure_end)
+            if match is None or match.group(1) not in tags:
+                if run_start < run_end:
+                    yield run_start, run_end, line_number
+                line_number += self.__count_lines(run_start, substructure_end)
+                run_start = substructure_end
+            run_end = substructure_end
+        if run_start < run_end:
+            yield run_start, run_end, line_number
+
+    def read_record_lines(self, span, validate=True, keep_content=False, tags=None, trusted=False):
+        '''
+        Decodes the record located by span, returning its lines as a GedcomLines object
+        :param span: GedcomRecordSpan yielded by iter_record_spans
+        :param validate: if True, lines not satisfying is_valid_gedcom_line are skipped
+        :param keep_content: if True each GedcomLine keeps its raw content
+        :param tags: level 1 tags of the substructures to be read (e.g. ["NAME", "BIRT"]); the other substructures are skipped 
+                     on the raw bytes, without being decoded nor tokenized; if None all the substructures are read
+        :param trusted: if True, lines are split by split_gedcom_line without any check
+        '''
+        if tags is None:
+            runs = [(span.start, span.end, span.line_number)]
+        else:
+            runs = self.__iter_projected_runs(span, {tag.encode('ascii') for tag in tags})
+        gedcom_lines = []
+        for start, end, line_number in runs:
+            run_text = self.__map[start:end].decode('utf-8')
+            gedcom_lines.extend(read_gedcom_lines(io.StringIO(run_text, newline=None), validate, line_number, keep_content, trusted))
+        return GedcomLines(gedcom_lines)
 
 
 def is_valid_gedcom_line(line):
@@ -30,19 +357,7 @@ def is_valid_gedcom_line(line):
     Each line should have the following (bracketed items optional):
     level + ' ' + [pointer + ' ' +] tag + [' ' + line_value]
     '''
-    # Level must start with non-negative int, no leading zeros.
-    level_regex = '^(0|[1-9]+[0-9]*) '
-    # Pointer optional, if it exists it must be flanked by `@`
-    pointer_regex = '(@[^@]+@ |)'
-    # Tag must be an alphanumeric string
-    tag_regex = '([A-Za-z0-9_]+)'
-    # Value optional, consists of anything after a space to end of line
-    value_regex = '( [^\n\r]*|)'
-    # End of line defined by `\n` or `\r`
-    end_of_line_regex = '([\r\n]{1,2})'
-    # Complete regex
-    gedcom_line_regex = level_regex + pointer_regex + tag_regex + value_regex + end_of_line_regex
-    return (re.match(gedcom_line_regex, line) is not None) or (line == '0 '+ gedcom.tags.GEDCOM_TAG_TRAILER) and (len(line) <=255)
+    return match_gedcom_line(line) is not None
 
 
 def split_text_for_gedcom(full_text, initial_tag, level, max_length):
@@ -58,12 +373,92 @@ def split_text_for_gedcom(full_text, initial_tag, level, max_length):
     if len(split_text) == 0:
         return gedcom_repr.strip()
     split_notes = [note.replace("\n", "\n" + str(level+1) +  " " + gedcom.tags.GEDCOM_TAG_CONTINUED + " ") for note in split_text]
+    # chunks are joined once, so that the time is linear in the length of the text
+    chunks = [gedcom_repr]
     for i, note_list in enumerate(split_notes):
         if i > 0 and not (gedcom.tags.GEDCOM_TAG_CONTINUED in note_list):
-            gedcom_repr = gedcom_repr + "\n" + str(level+1) + " "  + gedcom.tags.GEDCOM_TAG_CONCATENATION + " " + "".join(note_list)
+            chunks.append("\n" + str(level+1) + " "  + gedcom.tags.GEDCOM_TAG_CONCATENATION + " " + note_list)
         else:
-            gedcom_repr += "".join(note_list)
-    return gedcom_repr 
+            chunks.append(note_list)
+    return "".join(chunks)
+
+
+def join_continued_text(gedcom_lines, start, end=None):
+    '''
+    Reassembles a text split in GEDCOM format with CONC and CONT tags, as by split_text_for_gedcom, joining in a single pass
+    the value of gedcom_lines[start] and the values of the CONC and CONT lines immediately following it one level below
+    :param gedcom_lines: list of GEDCOM lines containing the text
+    :param start: offset of the line with the first chunk of the text (e.g. a NOTE or TEXT line)
+    :param end: offset (exclusive) where the search stops; if None the search goes on until the end of gedcom_lines
+    :return: the text, and the offset (exclusive) of its last continuation line
+    '''
+    if end is None:
+        end = len(gedcom_lines)
+    continuation_level = gedcom_lines[start].level + 1
+    chunks = [gedcom_lines[start].value]
+    index = start + 1
+    while index < end:
+        line = gedcom_lines[index]
+        if line.level != continuation_level:
+            break
+        if line.tag_id == CONCATENATION_TAG_ID:
+            chunks.append(line.value)
+        elif line.tag_id == CONTINUED_TAG_ID:
+            chunks.append("\n")
+            chunks.append(line.value)
+        else:
+            break
+        index += 1
+    return "".join(chunks), index
+
+
+class GedcomLines(tuple):
+    """
+    Immutable sequence of GedcomLine objects with a precomputed index of the extent of every structure.
+    The end offset (exclusive) of the subtree of each line is computed once, in a single stack-based pass,
+    so that get_gedcom_relevant_end does not need to scan the lines again at every nesting level.
+    Structures without a hierarchical structure of levels (e.g. ADDRESS_STRUCTURE, EVENT_DETAIL) extend over
+    their following siblings having a valid top level tag: those extents are resolved jumping from sibling to
+    sibling through the same index, and are memoized for each list of valid top level tags.
+    """
+    def __new__(cls, gedcom_lines=()):
+        self = super().__new__(cls, gedcom_lines)
+        self.__levels = [line.level for line in self]
+        self.__subtree_ends = [len(self)] * len(self)
+        self.__extents = {}
+        stack = []
+        for index, level in enumerate(self.__levels):
+            while stack and self.__levels[stack[-1]] >= level:
+                self.__subtree_ends[stack.pop()] = index
+            stack.append(index)
+        return self
+
+    def get_subtree_end(self, index, valid_top_level_tags=None):
+        '''
+        Return the offset (exclusive) where the structure starting in self[index] ends
+        :param index: offset of the first line of the structure
+        :param valid_top_level_tags: list of tags which, at the same level of self[index], still belong to the structure
+        '''
+        subtree_end = self.__subtree_ends[index]
+        if not valid_top_level_tags:
+            return subtree_end
+        key = tuple(valid_top_level_tags)
+        if key not in self.__extents:
+            self.__extents[key] = (set(valid_top_level_tags), {})
+        valid_tags, extents = self.__extents[key]
+        if index in extents:
+            return extents[index]
+        siblings = [index]
+        level = self.__levels[index]
+        while subtree_end < len(self) and self.__levels[subtree_end] == level and self[subtree_end].tag in valid_tags:
+            if subtree_end in extents:
+                subtree_end = extents[subtree_end]
+                break
+            siblings.append(subtree_end)
+            subtree_end = self.__subtree_ends[subtree_end]
+        for sibling in siblings:
+            extents[sibling] = subtree_end
+        return subtree_end
 
 
 class GedcomLine(object):
@@ -77,15 +472,27 @@ class GedcomLine(object):
         optional_line_value is the value associated to the tag
         terminator is carriage return and/or line feed
         implicit delimiter of elements is the space character
+    GEDCOM lines are kept in memory during the whole import, so they use slots instead of an instance dictionary,
+    store their tag as an id of gedcom.tags.TAG_NAMES and keep their raw content only if keep_content is True;
+    tags not in gedcom.tags.TAG_NAMES (e.g. user defined tags) have id gedcom.tags.UNKNOWN_TAG_ID and are kept as strings
     """
     gedcom_line_format = re.compile("^(?P<level>[0-9]+) ((?P<id>@[-a-zA-Z0-9_]+@) )?(?P<tag>[_A-Z0-9]+)( (?P<value>.*))?$")
+    __slots__ = ('__content', '__gedcom_index', '__level', '__pointer', '__tag_id', '__unknown_tag', '__value')
 
-    def __init__(self, line_content, index=0):
-        self.__content = line_content
+    def __init__(self, line_content, index=0, token=None, keep_content=True):
+        self.__content = line_content if keep_content else None
         self.__gedcom_index = index
         self.__level = None
         self.__pointer = ""
+        self.__unknown_tag = None
         self.__value = ""
+        if token is not None:
+            # line already split by tokenize_gedcom/read_gedcom_lines: no need to match it again
+            self.__level = token.level
+            self.__pointer = token.pointer
+            self.set_tag(token.tag)
+            self.__value = token.value
+            return
         match = re.match(GedcomLine.gedcom_line_format, line_content)
         if match:
             self.__level = int(match[1])
@@ -93,7 +500,7 @@ class GedcomLine(object):
                 self.__pointer = match[2].strip()
             else:
                 self.__pointer = ""
-            self.__tag = match[4].strip()
+            self.set_tag(match[4].strip())
             if match[5]:
                 self.__value = match[5].strip()
             else:
@@ -101,10 +508,10 @@ class GedcomLine(object):
     
 
     def is_last_gedcom_line(self):
-        return self.__content.strip() == ('0 '+ gedcom.tags.GEDCOM_TAG_TRAILER).strip()
+        return self.__level == 0 and self.tag == gedcom.tags.GEDCOM_TAG_TRAILER
     
     def is_user_defined_tag(self):
-        return self.__tag[0:1] == '_'
+        return self.tag[0:1] == '_'
 
     def get_content(self):
         return self.__content
@@ -119,7 +526,12 @@ class GedcomLine(object):
         return self.__pointer
 
     def get_tag(self):
-        return self.__tag
+        if self.__unknown_tag is not None:
+            return self.__unknown_tag
+        return gedcom.tags.TAG_NAMES[self.__tag_id]
+
+    def get_tag_id(self):
+        return self.__tag_id
 
     def get_value(self):
         return self.__value
@@ -140,7 +552,12 @@ class GedcomLine(object):
         self.__pointer = value
 
     def set_tag(self, value):
-        self.__tag = value
+        self.__tag_id = gedcom.tags.get_tag_id(value)
+        self.__unknown_tag = value if self.__tag_id == gedcom.tags.UNKNOWN_TAG_ID else None
+
+    def set_tag_id(self, value):
+        self.__tag_id = value
+        self.__unknown_tag = None
 
     def set_value(self, value):
         self.__value = value
@@ -161,7 +578,11 @@ class GedcomLine(object):
         del self.__pointer
 
     def del_tag(self):
-        del self.__tag
+        del self.__tag_id
+        self.__unknown_tag = None
+
+    def del_tag_id(self):
+        del self.__tag_id
 
     def del_value(self):
         del self.__value
@@ -170,15 +591,18 @@ class GedcomLine(object):
         del self.__content
         
     def __str__(self):
-        return self.__content
+        if self.__content is not None:
+            return self.__content
+        return " ".join(str(field) for field in (self.__level, self.__pointer, self.tag, self.__value) if field != "")
 
     def __repr__(self):
-        return self.__content
+        return str(self)
     
-    content = property(get_content, set_content, del_content, "content's docstring")
+    content = property(get_content, set_content, del_content, "raw content of the line, None if it was not kept")
     gedcom_index = property(get_gedcom_index, set_gedcom_index, del_gedcom_index, "gedcom_index's docstring")
     level = property(get_level, set_level, del_level, "level's docstring")
     pointer = property(get_pointer, set_pointer, del_pointer, "pointer's docstring")
     tag = property(get_tag, set_tag, del_tag, "tag's docstring")
+    tag_id = property(get_tag_id, set_tag_id, del_tag_id, "id of the tag in gedcom.tags.TAG_NAMES, gedcom.tags.UNKNOWN_TAG_ID if it is not there")
     value = property(get_value, set_value, del_value, "value's docstring")
     line_content = property(get_line_content, set_line_content, del_line_content, "line_content's docstring")
@@ -0,0 +1,183 @@
+import re
+from array import array
+from itertools import compress
+import gedcom.tags
+import gedcom.gedcom_file as gf
+
+
+# A single line of a GEDCOM file, terminator included, on raw bytes: lines not satisfying the GEDCOM line syntax
+# are matched by the second alternative, without groups, so that the scan of a record never loses its line alignment
+GEDCOM_LINE_BYTES_REGEX = re.compile(rb'(?:(0|[1-9][0-9]*) (?:(@[^@\r\n]+@) )?([A-Za-z0-9_]+)(?: ([^\r\n]*))?|[^\r\n]*)(?:\r\n|\r|\n|\Z)')
+# Value of the parent and pointer columns for lines without parent or pointer
+NO_INDEX = -1
+
+
+class GedcomLineTable(object):
+    """
+    Columnar table of the lines of a GEDCOM file, for bulk analytics that need only a few fields per line.
+    Each line is a row, stored in array-backed columns: level, tag id (see tag_names), pointer id,
+    value offset and length in a shared heap of the values, index of the parent line.
+    Queries scan whole columns at once (e.g. get_values(GEDCOM_TAG_DATE, GEDCOM_TAG_BIRTH)), without building
+    GedcomLine, Individual or Family objects.
+    """
+    def __init__(self):
+        self.__levels = array('B')
+        self.__tag_ids = array('H')
+        self.__pointer_ids = array('i')
+        self.__value_offsets = array('Q')
+        self.__value_lengths = array('I')
+        self.__parents = array('i')
+        self.__pointers = []
+        # gedcom.tags.TAG_NAMES followed by the tags of the file not defined there (e.g. user defined tags)
+        self.__tag_names = list(gedcom.tags.TAG_NAMES)
+        self.__tag_name_ids = dict(gedcom.tags.TAG_IDS)
+        self.__heap = b""
+
+    def load(self, input_path):
+        '''
+        Fills the table with the lines of a GEDCOM file, replacing its content, scanning the memory-mapped bytes of the file once
+        Lines not satisfying the GEDCOM line syntax, or with a level above gedcom.tags.MAX_LEVEL, are skipped
+        :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+        '''
+        self.__init__()
+        heap = bytearray()
+        pointer_ids = {}
+        tag_ids = {}
+        # (level, row) of the last line of each level above the current line
+        ancestors = []
+        with gf.GedcomFileMap(input_path) as gedcom_map:
+            for span in gedcom_map.iter_record_spans():
+                for match in gedcom_map.finditer(GEDCOM_LINE_BYTES_REGEX, span):
+                    level, pointer, tag, value = match.groups()
+                    if level is None or int(level) > gedcom.tags.MAX_LEVEL:
+                        continue
+                    level = int(level)
+                    while ancestors and ancestors[-1][0] >= level:
+                        ancestors.pop()
+                    self.__parents.append(ancestors[-1][1] if ancestors else NO_INDEX)
+                    ancestors.append((level, len(self.__levels)))
+                    self.__levels.append(level)
+                    tag_id = tag_ids.get(tag)
+                    if tag_id is None:
+                        tag_id = self.__tag_name_ids.get(tag.decode('ascii'))
+                        if tag_id is None:
+                            tag_id = self.__tag_name_ids[tag.decode('ascii')] = len(self.__tag_names)
+                            self.__tag_names.append(tag.decode('ascii'))
+                        tag_ids[tag] = tag_id
+                    self.__tag_ids.append(tag_id)
+                    if pointer:
+                        pointer_id = pointer_ids.get(pointer)
+                        if pointer_id is None:
+                            pointer_id = pointer_ids[pointer] = len(self.__pointers)
+                            self.__pointers.append(pointer.decode('utf-8'))
+                        self.__pointer_ids.append(pointer_id)
+                    else:
+                        self.__pointer_ids.append(NO_INDEX)
+                    value = value.strip() if value else b""
+                    self.__value_offsets.append(len(heap))
+                    self.__value_lengths.append(len(value))
+                    heap += value
+        self.__heap = bytes(heap)
+        return self
+
+    def __len__(self):
+        return len(self.__levels)
+
+    def get_levels(self):
+        return self.__levels
+
+    def get_tag_ids(self):
+        return self.__tag_ids
+
+    def get_pointer_ids(self):
+        return self.__pointer_ids
+
+    def get_value_offsets(self):
+        return self.__value_offsets
+
+    def get_value_lengths(self):
+        return self.__value_lengths
+
+    def get_parents(self):
+        return self.__parents
+
+    def get_pointers(self):
+        return self.__pointers
+
+    def get_heap(self):
+        return self.__heap
+
+    def get_tag_names(self):
+        return self.__tag_names
+
+    def get_tag_id(self, tag):
+        '''
+        Return the id of a tag in tag_names, NO_INDEX if no line of the table has it
+        '''
+        return self.__tag_name_ids.get(tag, NO_INDEX)
+
+    def get_tag(self, row):
+        return self.__tag_names[self.__tag_ids[row]]
+
+    def get_pointer(self, row):
+        pointer_id = self.__pointer_ids[row]
+        return self.__pointers[pointer_id] if pointer_id != NO_INDEX else ""
+
+    def get_value(self, row):
+        offset = self.__value_offsets[row]
+        return self.__heap[offset:offset + self.__value_lengths[row]].decode('utf-8')
+
+    def get_record_row(self, row):
+        '''
+        Return the row of the level 0 line of the record containing the line in row
+        '''
+        while self.__parents[row] != NO_INDEX:
+            row = self.__parents[row]
+        return row
+
+    def get_rows(self, tag, parent_tag=None):
+        '''
+        Return the rows of the lines with the given tag, in file order
+        :param tag: tag of the lines (e.g. "DATE")
+        :param parent_tag: if not None, only lines whose parent line has this tag are returned (e.g. "BIRT")
+        '''
+        rows = list(compress(range(len(self.__tag_ids)), map(self.get_tag_id(tag).__eq__, self.__tag_ids)))
+        if parent_tag is None:
+            return rows
+        parent_tag_id = self.get_tag_id(parent_tag)
+        return [row for row in rows if self.__parents[row] != NO_INDEX and self.__tag_ids[self.__parents[row]] == parent_tag_id]
+
+    def get_values(self, tag, parent_tag=None):
+        '''
+        Return the values of the lines with the given tag, in file order (e.g. all DATE values under BIRT)
+        :param tag: tag of the lines (e.g. "DATE")
+        :param parent_tag: if not None, only lines whose parent line has this tag are considered (e.g. "BIRT")
+        '''
+        return [self.get_value(row) for row in self.get_rows(tag, parent_tag)]
+
+    def get_record_values(self, tag, parent_tag=None):
+        '''
+        Return the (record pointer, value) pairs of the lines with the given tag, in file order
+        (e.g. the birth dates of the individuals, by their reference)
+        :param tag: tag of the lines (e.g. "DATE")
+        :param parent_tag: if not None, only lines whose parent line has this tag are considered (e.g. "BIRT")
+        '''
+        return [(self.get_pointer(self.get_record_row(row)), self.get_value(row)) for row in self.get_rows(tag, parent_tag)]
+
+    levels = property(get_levels, None, None, "level of each line")
+    tag_ids = property(get_tag_ids, None, None, "id of the tag of each line in tag_names")
+    tag_names = property(get_tag_names, None, None, "tags of the lines by tag id: gedcom.tags.TAG_NAMES, then the tags not defined there")
+    pointer_ids = property(get_pointer_ids, None, None, "index in pointers of the pointer of each line, NO_INDEX if it has no pointer")
+    value_offsets = property(get_value_offsets, None, None, "offset of the value of each line in heap")
+    value_lengths = property(get_value_lengths, None, None, "length of the value of each line in heap, in bytes")
+    parents = property(get_parents, None, None, "row of the parent line of each line, NO_INDEX for level 0 lines")
+    pointers = property(get_pointers, None, None, "distinct pointers of the lines, by pointer id")
+    heap = property(get_heap, None, None, "UTF-8 encoded values of all the lines")
+
+
+def read_line_table(input_path):
+    '''
+    Loads a GEDCOM file into a GedcomLineTable
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+    '''
+    return GedcomLineTable().load(input_path)
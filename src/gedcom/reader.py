@@ -0,0 +1,594 @@
+import re
+import io
+import os
+import json
+import hashlib
+from collections import namedtuple
+import gedcom.tags
+import gedcom.structures as gd
+import gedcom.gedcom_file as gf
+
+
+# Classes of the GEDCOM records that can be fully parsed, by level 0 tag
+RECORD_CLASSES = {gedcom.tags.GEDCOM_TAG_INDIVIDUAL: gd.Individual,
+                  gedcom.tags.GEDCOM_TAG_FAMILY: gd.Family,
+                  gedcom.tags.GEDCOM_TAG_NOTE: gd.Note,
+                  gedcom.tags.GEDCOM_TAG_SOURCE: gd.Source,
+                  gedcom.tags.GEDCOM_TAG_OBJECT: gd.Multimedia,
+                  gedcom.tags.GEDCOM_TAG_REPOSITORY: gd.Repository}
+
+# Level 1 lines linking individuals and families, found on the raw bytes of the records without parsing them
+GEDCOM_LINK_REGEX = re.compile(("(?<=[\r\n])1 (%s)(?: ([^\r\n]*))?" % "|".join([gedcom.tags.GEDCOM_TAG_FAMILY_CHILD, 
+                                                                             gedcom.tags.GEDCOM_TAG_FAMILY_SPOUSE, 
+                                                                             gedcom.tags.GEDCOM_TAG_HUSBAND, 
+                                                                             gedcom.tags.GEDCOM_TAG_WIFE, 
+                                                                             gedcom.tags.GEDCOM_TAG_CHILD])).encode('ascii'))
+
+# Prefixes of the references assigned to renumbered records, by level 0 tag (e.g. "@I" + "12" + "@")
+REFERENCE_PREFIXES = {gedcom.tags.GEDCOM_TAG_INDIVIDUAL: "@I",
+                      gedcom.tags.GEDCOM_TAG_FAMILY: "@F",
+                      gedcom.tags.GEDCOM_TAG_NOTE: "@N",
+                      gedcom.tags.GEDCOM_TAG_SOURCE: "@S",
+                      gedcom.tags.GEDCOM_TAG_OBJECT: "@O",
+                      gedcom.tags.GEDCOM_TAG_REPOSITORY: "@R"}
+
+# Size in bytes of the content hashes of the records (see hash_records)
+RECORD_HASH_SIZE = 8
+
+# Suffix added to the path of a GEDCOM file to get the path of its record index
+RECORD_INDEX_SUFFIX = ".idx"
+# Version of the format of the record index files, to be increased whenever the format changes
+RECORD_INDEX_VERSION = 1
+
+
+def is_discarded_record(tag):
+    '''
+    Return True if the content of level 0 records with the given tag is discarded in this implementation:
+    header, submission, submitter and user-defined records
+    '''
+    return tag in (gedcom.tags.GEDCOM_TAG_HEADER, gedcom.tags.GEDCOM_TAG_SUBMITTER, gedcom.tags.GEDCOM_TAG_SUBMISSION) or tag[0:1] == '_'
+
+
+def get_record_tags(types=None):
+    '''
+    Return the level 0 tags of the given record classes (e.g. ["INDI", "FAM"] for (gedcom.structures.Individual, gedcom.structures.Family))
+    :param types: record classes; if None the tags of all the classes in RECORD_CLASSES are returned
+    '''
+    return [tag for tag, record_class in RECORD_CLASSES.items() if types is None or record_class in types]
+
+
+class GedcomSummary(namedtuple('GedcomSummary', ['header', 'record_counts'])):
+    """
+    Metadata of a GEDCOM file, as returned by peek_gedcom_file: its parsed Header and the Counter of its level 0 records by tag
+    """
+    __slots__ = ()
+
+
+def get_file_stat(input_path):
+    '''
+    Return the size and the modification time of a file, which change whenever the file is written
+    '''
+    file_stat = os.stat(input_path)
+    return file_stat.st_size, file_stat.st_mtime_ns
+
+
+class LazyRecordSource(object):
+    """
+    Memory map of the GEDCOM file of the lazy records of an import (see read_lazy_records).
+    Records are read only while the file keeps the size and the modification time it had when it was mapped,
+    since their spans no longer locate them once the file is changed; the map is closed as soon as no lazy record uses it.
+    """
+    def __init__(self, input_path):
+        self.__input_path = input_path
+        self.__file_stat = get_file_stat(input_path)
+        self.__gedcom_map = gf.GedcomFileMap(input_path)
+        self.__records = 0
+
+    def get_gedcom_map(self):
+        return self.__gedcom_map
+
+    def acquire(self):
+        '''
+        Counts a lazy record using the map
+        '''
+        self.__records += 1
+
+    def release(self):
+        '''
+        Uncounts a lazy record using the map, closing the map if it was the last one
+        '''
+        self.__records -= 1
+        if self.__records == 0:
+            self.__gedcom_map.close()
+
+    def read_record_lines(self, span, validate=True, keep_content=False, tags=None, trusted=False):
+        '''
+        Decodes the record located by span as GedcomFileMap.read_record_lines does, if the file has not changed since it was mapped
+        '''
+        if get_file_stat(self.__input_path) != self.__file_stat:
+            raise RuntimeError("GEDCOM file %s has changed since its lazy import, its records can no longer be parsed" % self.__input_path)
+        return self.__gedcom_map.read_record_lines(span, validate, keep_content, tags, trusted)
+
+    def __del__(self):
+        # lazy records discarded without being parsed (e.g. together with their genealogy) no longer use the map
+        self.__gedcom_map.close()
+
+
+class LazyRecord(object):
+    """
+    Placeholder of a record which is parsed on first access to any of its attributes.
+    It stores only the span of the record in the file of a LazyRecordSource, whose pointer is the reference of the record;
+    when it is parsed, it turns in place into an instance of its record class, so that every reference to it
+    (e.g. in dictionaries or in the relationships graph) stays valid.
+    Lazy records are instances of lazy subclasses of the record classes, see LAZY_RECORD_CLASSES.
+    """
+    def __init__(self, source, span, validate=True, tags=None, keep_content=False, trusted=False):
+        source.acquire()
+        object.__setattr__(self, '_LazyRecord__source', source)
+        object.__setattr__(self, '_LazyRecord__span', span)
+        object.__setattr__(self, '_LazyRecord__validate', validate)
+        object.__setattr__(self, '_LazyRecord__tags', tags)
+        object.__setattr__(self, '_LazyRecord__keep_content', keep_content)
+        object.__setattr__(self, '_LazyRecord__trusted', trusted)
+
+    def __getattr__(self, name):
+        # Called only for attributes missing from the instance, i.e. for all the attributes of the record before it is parsed
+        if name.startswith('_LazyRecord__'):
+            raise AttributeError(name)
+        self.materialize()
+        return getattr(self, name)
+
+    def __setattr__(self, name, value):
+        self.materialize()
+        setattr(self, name, value)
+
+    def __delattr__(self, name):
+        self.materialize()
+        delattr(self, name)
+
+    def materialize(self):
+        '''
+        Parses the record, turning this object into an instance of its record class
+        '''
+        source, span = self.__source, self.__span
+        record_lines = source.read_record_lines(span, self.__validate, self.__keep_content, self.__tags, self.__trusted)
+        object.__setattr__(self, '__class__', RECORD_CLASSES[span.tag])
+        self.__dict__.clear()
+        self.__init__()
+        self.parse_gedcom(record_lines)
+        self.set_source_span(span)
+        source.release()
+
+    def relocate(self, source, span):
+        '''
+        Moves the record, not yet parsed, to its span in the file of another source (e.g. the same file after an edit 
+        not changing the record, see Genealogy.reload_changed)
+        :param source: LazyRecordSource of the file
+        :param span: GedcomRecordSpan of the record in the file, whose bytes are the same of the current span
+        '''
+        source.acquire()
+        self.__source.release()
+        object.__setattr__(self, '_LazyRecord__source', source)
+        object.__setattr__(self, '_LazyRecord__span', span)
+
+    def get_reference(self):
+        return self.__span.pointer
+
+    def get_source_span(self):
+        # a record not yet parsed is unchanged
+        return self.__span
+
+    def mark_dirty(self):
+        # the span is kept by the record once parsed, and discarded there together with its cached representation
+        self.materialize()
+        self.mark_dirty()
+
+    def set_reference(self, value):
+        self.materialize()
+        self.reference = value
+
+    def del_reference(self):
+        self.materialize()
+        del self.reference
+
+    reference = property(get_reference, set_reference, del_reference, "reference of the record, available without parsing it")
+
+
+# Lazy subclasses of the record classes, by level 0 tag
+LAZY_RECORD_CLASSES = {tag: type("Lazy" + record_class.__name__, (LazyRecord, record_class), {}) 
+                       for tag, record_class in RECORD_CLASSES.items()}
+
+
+def iter_record_lines(lines, tags=None, validate=True, keep_content=False, trusted=False):
+    '''
+    Groups GEDCOM lines by level 0 record, yielding a GedcomLines object for each record and keeping in memory only one record at a time
+    The iteration stops at the trailer; lines of records not in tags are neither tokenized nor kept
+    :param lines: iterable of GEDCOM lines (e.g. an open text file)
+    :param tags: level 0 tags of the records to be yielded (e.g. ['INDI', 'FAM']); if None all the records are yielded
+    :param validate: if True, lines not satisfying is_valid_gedcom_line are skipped
+    :param keep_content: if True each GedcomLine keeps its raw content
+    :param trusted: if True, lines are split by gedcom.gedcom_file.split_gedcom_line without any check
+    '''
+    record_lines = []
+    skip_record = False
+    for line_number, line in enumerate(lines):
+        if skip_record and not line.startswith("0 "):
+            continue
+        token = gf.match_gedcom_line(line, line_number, validate, trusted)
+        if token is None:
+            continue
+        if token.level == 0:
+            if record_lines:
+                yield gf.GedcomLines(record_lines)
+                record_lines = []
+            if token.tag == gedcom.tags.GEDCOM_TAG_TRAILER:
+                return
+            skip_record = tags is not None and token.tag not in tags
+        if not skip_record:
+            record_lines.append(gf.GedcomLine(line, line_number, token, keep_content))
+    if record_lines:
+        yield gf.GedcomLines(record_lines)
+
+
+def iter_records(input_path, types=None, validate=True):
+    '''
+    Parses a GEDCOM file record by record, yielding each Individual, Family, Note, Source, Multimedia and Repository record as soon as it is read
+    Memory usage does not depend on the size of the file, since the file is memory-mapped and only the record being parsed is decoded
+    Header, submission, submitter and user-defined records are skipped
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+    :param types: record classes to be yielded (e.g. (gedcom.structures.Individual, gedcom.structures.Family)); if None all of them are yielded
+    :param validate: if True, lines not satisfying is_valid_gedcom_line are skipped
+    '''
+    tags = get_record_tags(types)
+    with gf.GedcomFileMap(input_path) as gedcom_map:
+        for span in gedcom_map.iter_record_spans():
+            if span.tag == gedcom.tags.GEDCOM_TAG_TRAILER:
+                return
+            if span.tag in tags:
+                record = RECORD_CLASSES[span.tag]()
+                record.parse_gedcom(gedcom_map.read_record_lines(span, validate))
+                yield record
+
+
+def read_raw_record(gedcom_map, span):
+    '''
+    Return a record of a GedcomFileMap as a gedcom.structures.RawStructure made of the lines of its raw bytes, without tokenizing them
+    '''
+    return gd.RawStructure(gedcom_map.get_bytes(span.start, span.end).decode('utf-8').splitlines(), span.tag)
+
+
+def rename_references(gedcom_lines, references):
+    '''
+    Replaces in place the pointers of the lines, and their values which are pointers, found in references
+    :param gedcom_lines: GEDCOM lines of a record
+    :param references: dictionary of the new references by old reference (e.g. {"@PERSON1@": "@I12@"})
+    '''
+    for line in gedcom_lines:
+        if line.pointer in references:
+            line.pointer = references[line.pointer]
+        if line.value[0:1] == "@" and line.value in references:
+            line.value = references[line.value]
+
+
+def parse_record_chunk(input_path, start=None, end=None, line_number=None, validate=True, tags=None, projection=None, references=None, 
+                       passthrough=False, trusted=False):
+    '''
+    Parses the records of a GEDCOM file between the byte offsets start and end, as returned by GedcomFileMap.split_records
+    It can be run in a worker process, since it takes and returns only picklable objects
+    Header, submission, submitter and user-defined records are skipped without being decoded, unless passthrough is True;
+    the parsing stops at the trailer or at the first record with an unknown tag
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+    :param start: offset of the first record of the chunk; if None the chunk starts from the first record
+    :param end: offset (exclusive) where the chunk ends; if None the chunk goes on until the end of the file
+    :param line_number: line number of the line starting at start; if None it is counted
+    :param validate: if True, lines not satisfying is_valid_gedcom_line are skipped
+    :param tags: level 0 tags of the records to be parsed (see get_record_tags); the other records are skipped without being decoded;
+                 if None all the records are parsed
+    :param projection: dictionary of the level 1 tags of the substructures to be parsed, by level 0 tag of the records 
+                       (e.g. {"INDI": ["NAME", "BIRT", "DEAT", "FAMC", "FAMS"]}); the other substructures are skipped without 
+                       being decoded (see GedcomFileMap.read_record_lines); records whose tag is not in projection are fully parsed
+    :param references: if not None, dictionary of the new references by old reference, replaced in the lines before parsing them
+                       (see rename_references)
+    :param passthrough: if True, header, submission, submitter and user-defined records are returned as RawStructure objects 
+                        (see read_raw_record), and the structures of the records not parsed by current implementation are kept
+                        as raw structures (see gedcom.structures.raw_structure_handler), instead of being skipped
+    :param trusted: if True, lines are split by gedcom.gedcom_file.split_gedcom_line without any check
+    :return: list of parsed records, and False if the parsing stopped before the end of the chunk
+    '''
+    records = []
+    projection = projection or {}
+    with gf.GedcomFileMap(input_path) as gedcom_map:
+        for span in gedcom_map.iter_record_spans(start, end, line_number):
+            if span.tag in RECORD_CLASSES:
+                if tags is not None and span.tag not in tags:
+                    continue
+                record_lines = gedcom_map.read_record_lines(span, validate, passthrough, projection.get(span.tag), trusted)
+                if references:
+                    rename_references(record_lines, references)
+                record = RECORD_CLASSES[span.tag]()
+                record.parse_gedcom(record_lines)
+                records.append(record)
+            elif is_discarded_record(span.tag):
+                if passthrough:
+                    records.append(read_raw_record(gedcom_map, span))
+            else:
+                return records, False
+    return records, True
+
+
+def project_record_lines(record_lines, tags):
+    '''
+    Return the lines of a record made of its level 0 line and of its level 1 substructures with a tag in tags, 
+    as GedcomFileMap.read_record_lines does on the raw bytes of a record
+    :param record_lines: GedcomLines object of the record
+    :param tags: level 1 tags of the substructures to be kept (e.g. ["NAME", "BIRT"])
+    '''
+    projected_lines = []
+    kept = True
+    for line in record_lines:
+        if line.level == 1:
+            kept = line.tag in tags
+        if kept or line.level == 0:
+            projected_lines.append(line)
+    return gf.GedcomLines(projected_lines)
+
+
+def parse_record_stream(lines, validate=True, tags=None, projection=None, passthrough=False, trusted=False):
+    '''
+    Parses the records of a stream of GEDCOM lines, as parse_record_chunk does for a chunk of a file, keeping in memory only one record at a time
+    It is used for inputs that cannot be memory-mapped, e.g. compressed files (see gedcom.streams.open_gedcom_stream)
+    :param lines: iterable of GEDCOM lines (e.g. an open text file)
+    :param validate: if True, lines not satisfying is_valid_gedcom_line are skipped
+    :param tags: level 0 tags of the records to be parsed, as in parse_record_chunk
+    :param projection: level 1 tags of the substructures to be parsed by level 0 tag of the records, as in parse_record_chunk
+    :param passthrough: if True, records and structures not parsed by current implementation are kept raw, as in parse_record_chunk
+    :param trusted: if True, lines are split by gedcom.gedcom_file.split_gedcom_line without any check
+    :return: list of parsed records, and False if the parsing stopped before the trailer or the end of the stream
+    '''
+    records = []
+    projection = projection or {}
+    for record_lines in iter_record_lines(lines, validate=validate, keep_content=passthrough, trusted=trusted):
+        tag = record_lines[0].tag
+        if tag in RECORD_CLASSES:
+            if tags is not None and tag not in tags:
+                continue
+            if tag in projection:
+                record_lines = project_record_lines(record_lines, projection[tag])
+            record = RECORD_CLASSES[tag]()
+            record.parse_gedcom(record_lines)
+            records.append(record)
+        elif is_discarded_record(tag):
+            if passthrough:
+                raw_record = gd.RawStructure()
+                raw_record.parse_gedcom(record_lines)
+                records.append(raw_record)
+        else:
+            return records, False
+    return records, True
+
+
+def get_record_spans(input_path, tags=None):
+    '''
+    Locates each record with a pointer of a GEDCOM file, with a raw scan of its bytes, without decoding nor parsing it
+    If a reference is repeated, the last record wins, as in an import
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+    :param tags: level 0 tags of the records to be located (see get_record_tags); if None the records of all the tags are located
+    :return: dictionary of GedcomRecordSpan objects by reference
+    '''
+    with gf.GedcomFileMap(input_path) as gedcom_map:
+        return {span.pointer: span for span in gedcom_map.iter_record_spans() if span.pointer and (tags is None or span.tag in tags)}
+
+
+def hash_records(input_path, tags=None):
+    '''
+    Computes a content hash of each record with a pointer of a GEDCOM file, with a raw scan of its bytes, without decoding nor parsing it
+    If a reference is repeated, the last record wins, as in an import
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+    :param tags: level 0 tags of the records to be hashed (see get_record_tags); if None the records of all the tags are hashed
+    :return: dictionary of (span, hash) pairs by reference, where span is the GedcomRecordSpan of the record 
+             and hash the BLAKE2 digest of its bytes, of RECORD_HASH_SIZE bytes
+    '''
+    record_hashes = {}
+    with gf.GedcomFileMap(input_path) as gedcom_map:
+        for span in gedcom_map.iter_record_spans():
+            if span.pointer and (tags is None or span.tag in tags):
+                record_hashes[span.pointer] = (span, hashlib.blake2b(gedcom_map.get_bytes(span.start, span.end), digest_size=RECORD_HASH_SIZE).digest())
+    return record_hashes
+
+
+def parse_record_spans(input_path, spans, validate=True, projection=None, trusted=False):
+    '''
+    Parses only the records of a GEDCOM file located by spans (e.g. the changed ones, see hash_records)
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+    :param spans: GedcomRecordSpan objects of the records, whose tags must be in RECORD_CLASSES
+    :param validate: if True, lines not satisfying is_valid_gedcom_line are skipped
+    :param projection: level 1 tags of the substructures to be parsed by level 0 tag of the records, as in parse_record_chunk
+    :param trusted: if True, lines are split by gedcom.gedcom_file.split_gedcom_line without any check
+    :return: list of parsed records
+    '''
+    records = []
+    projection = projection or {}
+    with gf.GedcomFileMap(input_path) as gedcom_map:
+        for span in spans:
+            record = RECORD_CLASSES[span.tag]()
+            record.parse_gedcom(gedcom_map.read_record_lines(span, validate, tags=projection.get(span.tag), trusted=trusted))
+            records.append(record)
+    return records
+
+
+def parse_renumbered_file(input_path, first_numbers, validate=True, trusted=False):
+    '''
+    Parses all the records of a GEDCOM file as parse_record_chunk does, renumbering their references: the records of each tag
+    are numbered consecutively in file order, starting from first_numbers[tag], with the prefix in REFERENCE_PREFIXES
+    (e.g. @PERSON1@, @PERSON2@ become @I101@, @I102@); pointers to them are renamed accordingly
+    Records of several files can be merged without renaming them, if the ranges of numbers reserved for each file are wide enough 
+    (e.g. the counts of GedcomFileMap.count_record_tags); it can be run in a worker process
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+    :param first_numbers: dictionary of the first number of the references by level 0 tag (e.g. {"INDI": 101, "FAM": 31})
+    :param validate: if True, lines not satisfying is_valid_gedcom_line are skipped
+    :param trusted: if True, lines are split by gedcom.gedcom_file.split_gedcom_line without any check
+    :return: list of parsed records, and False if the parsing stopped before the end of the file
+    '''
+    references = {}
+    numbers = dict(first_numbers)
+    with gf.GedcomFileMap(input_path) as gedcom_map:
+        for span in gedcom_map.iter_record_spans():
+            if span.pointer and span.tag in numbers and span.pointer not in references:
+                references[span.pointer] = "%s%s@" % (REFERENCE_PREFIXES[span.tag], numbers[span.tag])
+                numbers[span.tag] += 1
+    return parse_record_chunk(input_path, validate=validate, references=references, trusted=trusted)
+
+
+def peek_gedcom_file(input_path, validate=True):
+    '''
+    Parses only the header of a GEDCOM file and counts its records by tag (e.g. summary.record_counts["INDI"]) 
+    with a raw scan of its bytes, without decoding nor parsing any other record
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+    :param validate: if True, lines of the header not satisfying is_valid_gedcom_line are skipped
+    :return: GedcomSummary
+    '''
+    header = gd.Header()
+    with gf.GedcomFileMap(input_path) as gedcom_map:
+        for span in gedcom_map.iter_record_spans():
+            if span.tag == gedcom.tags.GEDCOM_TAG_HEADER:
+                header.parse_gedcom(gedcom_map.read_record_lines(span, validate))
+            break
+        return GedcomSummary(header, gedcom_map.count_record_tags())
+
+
+def read_lazy_records(input_path, validate=True, tags=None, projection=None, passthrough=False, trusted=False):
+    '''
+    Scans a GEDCOM file as parse_record_chunk does, but returns a LazyRecord for each record instead of parsing it
+    The file stays memory-mapped until all its lazy records are parsed, and they can be parsed only while the file is unchanged
+    (see LazyRecordSource)
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+    :param validate: if True, lines not satisfying is_valid_gedcom_line are skipped when the records are parsed
+    :param tags: level 0 tags of the records to be returned, as in parse_record_chunk
+    :param projection: level 1 tags of the substructures to be parsed by level 0 tag of the records, as in parse_record_chunk
+    :param passthrough: if True, records and structures not parsed by current implementation are kept raw, as in parse_record_chunk;
+                        raw records are returned together with the lazy records
+    :param trusted: if True, lines are split by gedcom.gedcom_file.split_gedcom_line without any check when the records are parsed
+    :return: list of lazy and raw records, and dictionary of the (tag, reference) pairs of the FAMC, FAMS, HUSB, WIFE and CHIL lines 
+             of each record, by record reference
+    '''
+    records = []
+    links = {}
+    projection = projection or {}
+    source = LazyRecordSource(input_path)
+    gedcom_map = source.get_gedcom_map()
+    # held until the scan is over, so that the map is closed only afterwards if no lazy record is returned
+    source.acquire()
+    for span in gedcom_map.iter_record_spans():
+        if span.tag in LAZY_RECORD_CLASSES:
+            if tags is not None and span.tag not in tags:
+                continue
+            substructure_tags = projection.get(span.tag)
+            records.append(LAZY_RECORD_CLASSES[span.tag](source, span, validate, substructure_tags, passthrough, trusted))
+            if span.tag in (gedcom.tags.GEDCOM_TAG_INDIVIDUAL, gedcom.tags.GEDCOM_TAG_FAMILY):
+                links[span.pointer] = [(match.group(1).decode('ascii'), (match.group(2) or b"").decode('utf-8').strip()) 
+                                       for match in gedcom_map.finditer(GEDCOM_LINK_REGEX, span)
+                                       if substructure_tags is None or match.group(1).decode('ascii') in substructure_tags]
+        elif is_discarded_record(span.tag):
+            if passthrough:
+                records.append(read_raw_record(gedcom_map, span))
+        else:
+            break
+    source.release()
+    return records, links
+
+
+def get_file_hash(input_path):
+    '''
+    Return the SHA-256 hex digest of the content of a file, read in blocks of GEDCOM_MAP_BLOCK_SIZE bytes
+    '''
+    file_hash = hashlib.sha256()
+    with open(input_path, mode='rb') as input_file:
+        for block in iter(lambda: input_file.read(gf.GEDCOM_MAP_BLOCK_SIZE), b""):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+
+def build_record_index(input_path):
+    '''
+    Scans a GEDCOM file and returns its record index: a dictionary with the size, modification time and hash of the file
+    and, for each record with a pointer, its level 0 tag, byte offset, length in bytes and line number
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+    '''
+    file_stat = os.stat(input_path)
+    records = {}
+    with gf.GedcomFileMap(input_path) as gedcom_map:
+        for span in gedcom_map.iter_record_spans():
+            if span.pointer:
+                records[span.pointer] = (span.tag, span.start, span.end - span.start, span.line_number)
+    return {"version": RECORD_INDEX_VERSION, 
+            "size": file_stat.st_size, 
+            "mtime": file_stat.st_mtime_ns, 
+            "hash": get_file_hash(input_path), 
+            "records": records}
+
+
+def load_record_index(input_path, index_path=None):
+    '''
+    Return the record index of a GEDCOM file, as built by build_record_index, reading it from its index file
+    The index file is (re)built when it is missing or when it is stale, i.e. when the size of the GEDCOM file changed or
+    its modification time changed together with its content; a rebuilt index is written back if possible
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged"), as a string or a path-like object
+    :param index_path: path of the index file; if None it is input_path followed by RECORD_INDEX_SUFFIX
+    '''
+    if index_path is None:
+        index_path = os.fspath(input_path) + RECORD_INDEX_SUFFIX
+    file_stat = os.stat(input_path)
+    record_index = None
+    try:
+        with open(index_path, mode='r', encoding='utf-8') as index_file:
+            record_index = json.load(index_file)
+    except (OSError, ValueError):
+        pass
+    if record_index is not None and record_index.get("version") == RECORD_INDEX_VERSION and record_index.get("size") == file_stat.st_size:
+        if record_index.get("mtime") == file_stat.st_mtime_ns:
+            return record_index
+        if record_index.get("hash") == get_file_hash(input_path):
+            # file touched but not changed: the records are still valid
+            record_index["mtime"] = file_stat.st_mtime_ns
+            save_record_index(record_index, index_path)
+            return record_index
+    record_index = build_record_index(input_path)
+    save_record_index(record_index, index_path)
+    return record_index
+
+
+def save_record_index(record_index, index_path):
+    '''
+    Writes a record index to its index file, replacing it atomically; errors (e.g. a read-only directory) are ignored, 
+    since the index can always be rebuilt
+    '''
+    temporary_path = "%s.%s.tmp" % (index_path, os.getpid())
+    try:
+        with open(temporary_path, mode='w', encoding='utf-8') as index_file:
+            json.dump(record_index, index_file)
+        os.replace(temporary_path, index_path)
+    except OSError:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+def fetch_record(input_path, reference, validate=True, index_path=None):
+    '''
+    Parses only the record with the given reference, reading its bytes at the offset found in the record index of the file
+    (see load_record_index), instead of importing the whole file
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+    :param reference: reference of the record (e.g. "@I500719@")
+    :param validate: if True, lines not satisfying is_valid_gedcom_line are skipped
+    :param index_path: path of the index file; if None it is input_path followed by RECORD_INDEX_SUFFIX
+    :return: the Individual, Family, Note, Source, Multimedia or Repository record, or None if there is no such record
+    '''
+    record_location = load_record_index(input_path, index_path)["records"].get(reference)
+    if record_location is None or record_location[0] not in RECORD_CLASSES:
+        return None
+    tag, start, length, line_number = record_location
+    with open(input_path, mode='rb') as input_file:
+        input_file.seek(start)
+        record_text = input_file.read(length).decode('utf-8')
+    record = RECORD_CLASSES[tag]()
+    record.parse_gedcom(gf.GedcomLines(gf.read_gedcom_lines(io.StringIO(record_text, newline=None), validate, line_number)))
+    return record
@@ -0,0 +1,232 @@
+import io
+import os
+import codecs
+import gzip
+import queue
+import zipfile
+import threading
+import contextlib
+try:
+    import zstandard
+except ImportError:
+    # optional dependency, needed only to read Zstandard-compressed GEDCOM files
+    zstandard = None
+
+
+# Size of the blocks read from a GEDCOM stream at a time
+GEDCOM_STREAM_BLOCK_SIZE = 1 << 20
+# Blocks read ahead by the background thread of a BackgroundReader, bounding the memory used by the decompressed data
+GEDCOM_STREAM_QUEUE_SIZE = 8
+# Compression formats of GEDCOM files, detected from their first bytes (see get_compression)
+GZIP_COMPRESSION = "gzip"
+ZSTD_COMPRESSION = "zstd"
+ZIP_COMPRESSION = "zip"
+COMPRESSION_MAGIC_NUMBERS = {b"\x1f\x8b": GZIP_COMPRESSION,
+                             b"\x28\xb5\x2f\xfd": ZSTD_COMPRESSION,
+                             b"PK\x03\x04": ZIP_COMPRESSION}
+# Name of the GEDCOM file in the root of a GEDZIP archive
+GEDZIP_GEDCOM_NAME = "gedcom.ged"
+
+
+def get_compression(input_path):
+    '''
+    Return the compression format of a file (GZIP_COMPRESSION, ZSTD_COMPRESSION or ZIP_COMPRESSION),
+    detected from its first bytes regardless of its extension, or None if the file is not compressed
+    :param input_path: input file path (e.g. "C:\\users\\public\\mytree.ged.gz")
+    '''
+    with open(input_path, mode='rb') as input_file:
+        magic_number = input_file.read(4)
+    for prefix, compression in COMPRESSION_MAGIC_NUMBERS.items():
+        if magic_number.startswith(prefix):
+            return compression
+    return None
+
+
+def get_gedzip_gedcom_name(archive):
+    '''
+    Return the name of the GEDCOM file of a zip archive: GEDZIP_GEDCOM_NAME if present, as in a GEDZIP archive,
+    otherwise the first member with a .ged extension
+    :param archive: zipfile.ZipFile object
+    '''
+    names = archive.namelist()
+    if GEDZIP_GEDCOM_NAME in names:
+        return GEDZIP_GEDCOM_NAME
+    for name in names:
+        if name.lower().endswith(".ged"):
+            return name
+    raise ValueError("no GEDCOM file found in zip archive %s" % archive.filename)
+
+
+def open_decompressed_file(input_path):
+    '''
+    Opens a file as a binary stream of its decompressed content, without decompressing it in advance
+    Gzip, Zstandard (requires the zstandard package) and zip archives (e.g. GEDZIP) are supported; other files are opened as they are
+    :param input_path: input file path (e.g. "C:\\users\\public\\mytree.ged.gz")
+    '''
+    compression = get_compression(input_path)
+    if compression == GZIP_COMPRESSION:
+        return gzip.open(input_path, mode='rb')
+    if compression == ZSTD_COMPRESSION:
+        if zstandard is None:
+            raise ImportError("the zstandard package is required to read Zstandard-compressed file %s" % input_path)
+        return zstandard.ZstdDecompressor().stream_reader(open(input_path, mode='rb'), read_across_frames=True, closefd=True)
+    if compression == ZIP_COMPRESSION:
+        # the archive file stays open until its member is closed
+        with zipfile.ZipFile(input_path) as archive:
+            return archive.open(get_gedzip_gedcom_name(archive))
+    return open(input_path, mode='rb')
+
+
+class BackgroundReader(io.RawIOBase):
+    """
+    Read-only binary stream reading the blocks of another binary stream on a background thread.
+    Up to queue_size blocks are read ahead (e.g. decompressed) while the previous ones are being consumed,
+    so that decompression overlaps with parsing; errors of the background thread are raised by readinto.
+    """
+    def __init__(self, stream, block_size=GEDCOM_STREAM_BLOCK_SIZE, queue_size=GEDCOM_STREAM_QUEUE_SIZE):
+        '''
+        :param stream: binary stream to be read, i.e. any object with read(size) and close() methods; it is closed together with the reader
+        :param block_size: size of the blocks read from stream
+        :param queue_size: maximum number of blocks read ahead
+        '''
+        super().__init__()
+        self.__stream = stream
+        self.__block_size = block_size
+        self.__blocks = queue.Queue(queue_size)
+        self.__block = memoryview(b"")
+        self.__eof = False
+        self.__closing = threading.Event()
+        self.__thread = threading.Thread(target=self.__read_blocks, daemon=True)
+        self.__thread.start()
+
+    def __read_blocks(self):
+        # Runs on the background thread: an empty block marks the end of the stream
+        try:
+            while not self.__closing.is_set():
+                block = self.__stream.read(self.__block_size)
+                self.__put_block(block)
+                if not block:
+                    return
+        except Exception as error:
+            self.__put_block(error)
+
+    def __put_block(self, block):
+        # Waits for room in the queue, giving up if the reader is closed before all the blocks are consumed
+        while not self.__closing.is_set():
+            try:
+                self.__blocks.put(block, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self.__block:
+            if self.__eof:
+                return 0
+            block = self.__blocks.get()
+            if isinstance(block, Exception):
+                self.__eof = True
+                raise block
+            if not block:
+                self.__eof = True
+                return 0
+            self.__block = memoryview(block)
+        size = min(len(buffer), len(self.__block))
+        buffer[:size] = self.__block[:size]
+        self.__block = self.__block[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self.__closing.set()
+            self.__thread.join()
+            self.__stream.close()
+        super().close()
+
+
+class BorrowedReader(io.RawIOBase):
+    """
+    Read-only binary stream reading another binary stream on the calling thread, leaving it open when closed,
+    for streams owned by the caller (e.g. sys.stdin.buffer), which must not be read any more once the caller gets them back
+    """
+    def __init__(self, stream):
+        '''
+        :param stream: binary stream to be read, i.e. any object with a read(size) method returning bytes
+        '''
+        super().__init__()
+        self.__stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        block = self.__stream.read(len(buffer))
+        buffer[:len(block)] = block
+        return len(block)
+
+
+def open_gedcom_stream(input_path, block_size=GEDCOM_STREAM_BLOCK_SIZE):
+    '''
+    Opens a GEDCOM file, compressed or not (see open_decompressed_file), as a text stream of its lines
+    The file is decompressed on a background thread (see BackgroundReader) as the lines are read,
+    keeping in memory only a few blocks of the decompressed content
+    :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged.zst")
+    :param block_size: size of the blocks of decompressed content
+    '''
+    reader = BackgroundReader(open_decompressed_file(input_path), block_size)
+    return io.TextIOWrapper(io.BufferedReader(reader, block_size), encoding='utf-8-sig')
+
+
+def open_gedcom_input(source, block_size=GEDCOM_STREAM_BLOCK_SIZE):
+    '''
+    Opens a GEDCOM input which is not a file path as a text stream of its lines, to be used in a with statement
+    Binary inputs are read in blocks of block_size on the calling thread (see BorrowedReader), so that the lines can be parsed
+    as the blocks arrive (e.g. from a pipe or a socket), keeping in memory one block at a time; nothing reads them once the text stream is closed
+    :param source: bytes, binary stream (e.g. sys.stdin.buffer, io.BytesIO, socket.makefile('rb'), an upload handler) 
+                   or text stream (e.g. sys.stdin, io.StringIO); streams are read from their current position and are not closed
+    :param block_size: size of the blocks read from a binary stream; text streams are read through their own buffer, and ignore it
+    '''
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    if isinstance(source.read(0), str):
+        # text streams already decode and buffer their content
+        return contextlib.nullcontext(source)
+    return io.TextIOWrapper(io.BufferedReader(BorrowedReader(source), block_size), encoding='utf-8-sig')
+
+
+@contextlib.contextmanager
+def open_gedcom_output(destination, block_size=GEDCOM_STREAM_BLOCK_SIZE):
+    '''
+    Opens a GEDCOM output as a text stream writing UTF-8 encoded text, to be used in a with statement
+    Written text is buffered and reaches destination in blocks of block_size, so that the memory used does not depend on the size of the output
+    :param destination: output file path, binary stream (e.g. sys.stdout.buffer, io.BytesIO, socket.makefile('wb')) 
+                        or text stream (e.g. sys.stdout, io.StringIO); streams are written from their current position and are not closed
+    :param block_size: size of the blocks written to destination
+    '''
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, mode='w', encoding='utf-8', newline='', buffering=block_size) as output_file:
+            yield output_file
+    elif isinstance(destination, io.TextIOBase):
+        yield destination
+    else:
+        output = io.TextIOWrapper(io.BufferedWriter(destination, block_size), encoding='utf-8', newline='')
+        try:
+            yield output
+        finally:
+            # detaching flushes the buffers without closing destination
+            output.detach().detach()
+
+
+def get_binary_output(output):
+    '''
+    Return the binary stream under a text stream writing UTF-8 encoded text (e.g. as opened by open_gedcom_output),
+    to which UTF-8 encoded bytes can be written once the text stream is flushed, or None if there is none (e.g. io.StringIO)
+    :param output: text stream
+    '''
+    encoding = getattr(output, 'encoding', None)
+    if not encoding or codecs.lookup(encoding).name != 'utf-8':
+        return None
+    return getattr(output, 'buffer', None)
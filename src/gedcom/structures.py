@@ -3,22 +3,363 @@ from abc import abstractclassmethod
 import gedcom.gedcom_file as gf
 
 
+# Key of the handler of user-defined tags (i.e. starting with an underscore) in a parse table, at any level
+USER_DEFINED_TAGS = "_"
+
+
+def build_parse_table(*entries):
+    '''
+    Builds the dispatch table of a structure parser, mapping (tag id, level relative to the first line of the structure) to a handler
+    A handler is called as handler(structure, gedcom_lines, index, end) and returns the number of lines it parsed,
+    or None if it parsed gedcom_lines[index] only
+    :param entries: (tags, relative_level, handler) tuples, where tags is a tag, a list of tags or USER_DEFINED_TAGS and 
+                    relative_level is None for any level; as in an if/elif chain, the first entry matching a line wins
+    '''
+    parse_table = {}
+    for tags, relative_level, handler in entries:
+        if tags == USER_DEFINED_TAGS:
+            parse_table.setdefault((USER_DEFINED_TAGS, None), handler)
+            continue
+        for tag in ([tags] if isinstance(tags, str) else tags):
+            tag_id = gedcom.tags.get_tag_id(tag)
+            if tag_id == gedcom.tags.UNKNOWN_TAG_ID:
+                raise ValueError("tag %s is not defined in gedcom.tags and cannot be dispatched by id" % tag)
+            for level in (range(gedcom.tags.MAX_LEVEL + 1) if relative_level is None else [relative_level]):
+                parse_table.setdefault((tag_id, level), handler)
+    return parse_table
+
+
+def value_handler(attribute):
+    '''
+    Return a parse table handler storing the value of the line in an attribute of the structure
+    '''
+    def handler(structure, gedcom_lines, index, end):
+        setattr(structure, attribute, gedcom_lines[index].value)
+    return handler
+
+
+def appended_value_handler(attribute):
+    '''
+    Return a parse table handler appending the value of the line to a list attribute of the structure
+    '''
+    def handler(structure, gedcom_lines, index, end):
+        getattr(structure, attribute).append(gedcom_lines[index].value)
+    return handler
+
+
+def concatenated_value_handler(attribute, separator=""):
+    '''
+    Return a parse table handler concatenating the value of the line to an attribute of the structure
+    :param separator: "" for CONC lines, "\n" for CONT lines
+    '''
+    def handler(structure, gedcom_lines, index, end):
+        setattr(structure, attribute, getattr(structure, attribute) + separator + gedcom_lines[index].value)
+    return handler
+
+
+def continued_value_handler(attribute):
+    '''
+    Return a parse table handler storing in an attribute of the structure the value of the line joined with the values 
+    of its CONC and CONT lines, which are consumed in the same pass (see gedcom_file.join_continued_text)
+    Continuation lines not immediately following the line are left to concatenated_value_handler
+    '''
+    def handler(structure, gedcom_lines, index, end):
+        text, text_end = gf.join_continued_text(gedcom_lines, index, end)
+        setattr(structure, attribute, text)
+        return text_end - index
+    return handler
+
+
+def substructure_handler(new_substructure, attribute, append=True):
+    '''
+    Return a parse table handler parsing the substructure starting in the line
+    :param new_substructure: function returning a new substructure object (e.g. NoteStructure)
+    :param attribute: attribute of the structure where the substructure is stored
+    :param append: if True the attribute is a list and the substructure is appended to it 
+    '''
+    def handler(structure, gedcom_lines, index, end):
+        substructure = new_substructure()
+        parsed_lines = substructure.parse_gedcom(gedcom_lines, index, end)
+        if parsed_lines:
+            substructure.set_owner(structure)
+            if append:
+                getattr(structure, attribute).append(substructure)
+            else:
+                setattr(structure, attribute, substructure)
+        return parsed_lines
+    return handler
+
+
+def scope_handler(structure, gedcom_lines, index, end):
+    '''
+    Parse table handler of a line without a value of its own, which only opens the scope of its tag (see Record.parse_scoped_lines)
+    '''
+    pass
+
+
+def ignored_structure_handler(structure, gedcom_lines, index, end):
+    '''
+    Parse table handler skipping the structure starting in the line, which is ignored by current implementation
+    '''
+    return Record().parse_gedcom(gedcom_lines, index, end)
+
+
+def raw_structure_handler(structure, gedcom_lines, index, end):
+    '''
+    Parse table handler keeping the structure starting in the line, which is not parsed by current implementation,
+    as a RawStructure appended to the raw_structures of the structure, to be written back unchanged by get_gedcom_repr
+    The structure is kept only if the lines keep their raw content (see gedcom_file.read_gedcom_lines), otherwise it is skipped
+    '''
+    if gedcom_lines[index].content is None:
+        return ignored_structure_handler(structure, gedcom_lines, index, end)
+    raw_structure = RawStructure()
+    parsed_lines = raw_structure.parse_gedcom(gedcom_lines, index, end)
+    raw_structure.set_owner(structure)
+    structure.raw_structures.append(raw_structure)
+    return parsed_lines
+
+
+def adopt_substructures(structure):
+    '''
+    Sets each substructure of a structure, at any depth, as owned by the structure containing it (see Record.set_owner),
+    so that changes made in place to substructures attached after parsing (e.g. appended to a list attribute) mark the record dirty
+    '''
+    owner = structure.get_owner()
+    for value in vars(structure).values():
+        for item in (value if isinstance(value, list) else (value,)):
+            if isinstance(item, Record) and item is not owner:
+                item.set_owner(structure)
+                adopt_substructures(item)
+
+
+def user_reference_number_handler(structure, gedcom_lines, index, end):
+    '''
+    Parse table handler appending a REFN line, and its optional TYPE line, to the user_reference_numbers of the structure
+    '''
+    if index + 1 < end and gedcom_lines[index+1].tag == gedcom.tags.GEDCOM_TAG_TYPE:
+        structure.user_reference_numbers.append((gedcom_lines[index].value, gedcom_lines[index+1].value))
+        return 2
+    structure.user_reference_numbers.append((gedcom_lines[index].value, ""))
+
+
 class Record():
     '''
     Record is the parent class of all GEDCOM structures and substructures classes
     GEDCOM structures are defined as per GEDCOM 5.5.1 grammar, described in http://www.phpgedview.net/ged551-5.pdf
     '''
+    # GEDCOM representation of the record cached by get_cached_gedcom_repr, None if the record is dirty
+    __gedcom_cache = None
+    # Span of the record in the GEDCOM file it has been parsed from, kept by set_source_span until the record is marked dirty
+    __source_span = None
+    # Structure containing the substructure, marked dirty together with it; None for records and detached substructures
+    __owner = None
+    # True while all the substructures of the structure are owned by it, i.e. from its parsing until it is marked dirty
+    __substructures_owned = False
+
     def __init__(self):
         pass
+
+    def get_cached_gedcom_repr(self):
+        '''
+        Return the GEDCOM representation of the record at level 0, serializing the record only if it is dirty, 
+        i.e. if it has been changed since the last call
+        Setters and methods of the records and of their substructures mark them dirty (e.g. individual.notes[0].text = "...", 
+        see set_owner); changes made in place to their list attributes (e.g. family.children_references.append("@I1@")) 
+        must be followed by mark_dirty
+        '''
+        if self.__gedcom_cache is None:
+            self.__gedcom_cache = self.get_gedcom_repr(0)
+            self.__adopt_substructures()
+        return self.__gedcom_cache
+
+    def cache_gedcom_repr(self, gedcom_repr):
+        '''
+        Keeps gedcom_repr as the GEDCOM representation returned by get_cached_gedcom_repr until the record is marked dirty
+        :param gedcom_repr: GEDCOM representation of the record at level 0, e.g. serialized by another process (see genealogy.get_gedcom_reprs)
+        '''
+        self.__gedcom_cache = gedcom_repr
+        if gedcom_repr is not None:
+            self.__adopt_substructures()
+
+    def __adopt_substructures(self):
+        # substructures attached since the structure was parsed are found by a walk, done only once after each change
+        if not self.__substructures_owned:
+            adopt_substructures(self)
+            self.__substructures_owned = True
+
+    def mark_dirty(self):
+        '''
+        Discards the GEDCOM representation cached by get_cached_gedcom_repr, so that it is serialized again on the next call,
+        and the span of the record in its source file, which no longer matches the record; the owner of the structure, if any,
+        is marked dirty as well
+        '''
+        if self.__gedcom_cache is not None:
+            self.__gedcom_cache = None
+        if self.__source_span is not None:
+            self.__source_span = None
+        if self.__substructures_owned:
+            self.__substructures_owned = False
+        if self.__owner is not None:
+            self.__owner.mark_dirty()
+
+    def is_dirty(self):
+        return self.__gedcom_cache is None
+
+    def get_source_span(self):
+        return self.__source_span
+
+    def get_owner(self):
+        return self.__owner
+
+    def set_owner(self, owner):
+        '''
+        Sets the structure containing this substructure, which is marked dirty whenever this substructure is marked dirty,
+        e.g. by its setters, so that in-place changes of a substructure are not missed by the caches and the spans of its record
+        Substructures are owned by the structure they are parsed in (see substructure_handler), and adopted by the structure
+        containing them when their record is serialized (see get_cached_gedcom_repr)
+        :param owner: structure containing this substructure
+        '''
+        self.__owner = owner
+
+    def set_source_span(self, span):
+        '''
+        Keeps the span of the record in the GEDCOM file it has been parsed from, returned by get_source_span 
+        until the record is marked dirty, so that the bytes of an unchanged record can be copied from the file
+        :param span: gedcom.gedcom_file.GedcomRecordSpan of the record
+        '''
+        self.__source_span = span
     
-    def parse_gedcom(self, gedcom_lines):
-        return gf.get_gedcom_relevant_lines(gedcom_lines)
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        return gf.get_gedcom_relevant_end(gedcom_lines, start, end) - start
+
+    def parse_lines(self, parse_table, gedcom_lines, start, end, starting_level=None):
+        '''
+        Parses the lines of the structure from start to end (exclusive), dispatching each line to its handler in parse_table 
+        with a single lookup; lines without a handler are skipped
+        :param parse_table: dispatch table built by build_parse_table
+        :param starting_level: level of the first line of the structure; if None it is the level of gedcom_lines[start]
+        '''
+        if start >= end:
+            return
+        if starting_level is None:
+            starting_level = gedcom_lines[start].level
+        index = start
+        while index < end:
+            line = gedcom_lines[index]
+            handler = parse_table.get((line.tag_id, line.level - starting_level))
+            if handler is None and line.tag[0:1] == USER_DEFINED_TAGS:
+                handler = parse_table.get((USER_DEFINED_TAGS, None))
+            index += (handler(self, gedcom_lines, index, end) if handler else None) or 1
+        # substructures are owned by the structure as they are parsed (see substructure_handler)
+        self.__substructures_owned = True
+
+    def parse_scoped_lines(self, parse_table, scoped_parse_tables, gedcom_lines, start, end, starting_level=None):
+        '''
+        Parses the lines of the structure as parse_lines does, for structures where the meaning of a line depends on the lines before it
+        (e.g. VERS under SOUR or under GEDC in a header): each line with a handler in parse_table opens the scope of its tag, 
+        and the lines following it are looked up first in the dispatch table of that scope, if any
+        :param parse_table: dispatch table built by build_parse_table
+        :param scoped_parse_tables: dispatch tables built by build_parse_table, by tag of the line opening their scope
+        :param starting_level: level of the first line of the structure; if None it is the level of gedcom_lines[start]
+        '''
+        if start >= end:
+            return
+        if starting_level is None:
+            starting_level = gedcom_lines[start].level
+        scoped_parse_table = None
+        index = start
+        while index < end:
+            line = gedcom_lines[index]
+            key = (line.tag_id, line.level - starting_level)
+            handler = scoped_parse_table.get(key) if scoped_parse_table is not None else None
+            if handler is None:
+                handler = parse_table.get(key)
+                if handler is not None:
+                    scoped_parse_table = scoped_parse_tables.get(line.tag)
+                elif line.tag[0:1] == USER_DEFINED_TAGS:
+                    handler = parse_table.get((USER_DEFINED_TAGS, None))
+            index += (handler(self, gedcom_lines, index, end) if handler else None) or 1
+        self.__substructures_owned = True
     
+    def get_gedcom_repr(self, level=0):
+        '''
+        Return the GEDCOM representation of the structure, joining once the lines appended by emit_gedcom_lines
+        '''
+        lines = []
+        self.emit_gedcom_lines(lines, level)
+        return "\n".join(lines)
+
     @abstractclassmethod
-    def get_gedcom_repr(self, level):
+    def emit_gedcom_lines(self, lines, level):
+        '''
+        Appends the GEDCOM lines of the structure to lines, a list shared by the structure and its substructures,
+        so that the representation of a record is built in linear time; an item may hold several lines joined by "\n" 
+        (e.g. a text split by gedcom_file.split_text_for_gedcom)
+        :param lines: list of the lines emitted so far
+        :param level: GEDCOM level of the first line of the structure
+        '''
         pass
 
 
+class RawStructure(Record):
+    '''
+    Structure kept as the raw text of its lines, without parsing it (e.g. a user-defined structure or a SUBM record)
+    It is written back unchanged, or with its levels shifted if it is written at a different level
+    '''
+    def __init__(self, lines=None, tag=""):
+        '''
+        :param lines: raw lines of the structure, without line terminators (e.g. ["1 _UID 0123", "2 _SRC ABC"])
+        :param tag: tag of the first line of the structure
+        '''
+        self.__lines = lines if lines is not None else []
+        self.__tag = tag
+        super().__init__()
+
+    def get_lines(self):
+        return self.__lines
+
+    def get_tag(self):
+        return self.__tag
+
+    def get_level(self):
+        return int(self.__lines[0].split(None, 1)[0]) if self.__lines else 0
+
+    def set_lines(self, value):
+        self.__lines = value
+        self.mark_dirty()
+
+    def set_tag(self, value):
+        self.__tag = value
+        self.mark_dirty()
+
+    def del_lines(self):
+        del self.__lines
+        self.mark_dirty()
+
+    def del_tag(self):
+        del self.__tag
+        self.mark_dirty()
+
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__lines = [str(gedcom_lines[index]).rstrip("\r\n") for index in range(start, relevant_end)]
+        self.__tag = gedcom_lines[start].tag
+        return relevant_end - start
+
+    def emit_gedcom_lines(self, lines, level=0):
+        shift = level - self.get_level()
+        if not shift:
+            lines.extend(self.__lines)
+            return
+        for line in self.__lines:
+            line_level, line_rest = line.split(None, 1)
+            lines.append("%s %s" % (int(line_level) + shift, line_rest))
+
+    lines = property(get_lines, set_lines, del_lines, "raw lines of the structure, without line terminators")
+    tag = property(get_tag, set_tag, del_tag, "tag of the first line of the structure")
+    level = property(get_level, None, None, "level of the first line of the structure")
+
+
 class Header(Record):
     def __init__(self, source_system_version="", source_system_name="", gedcom_version=""):
         super().__init__()
@@ -114,274 +455,233 @@ class Header(Record):
 
     def set_source_system_id(self, value):
         self.__source_system_id = value
+        self.mark_dirty()
 
     def set_source_system_version(self, value):
         self.__source_system_version = value
+        self.mark_dirty()
 
     def set_source_system_name(self, value):
         self.__source_system_name = value
+        self.mark_dirty()
 
     def set_source_system_corporate(self, value):
         self.__source_system_corporate = value
+        self.mark_dirty()
 
     def set_source_system_corporate_address(self, value):
         self.__source_system_corporate_address = value
+        self.mark_dirty()
 
     def set_source_system_data(self, value):
         self.__source_system_data = value
+        self.mark_dirty()
 
     def set_source_system_data_date(self, value):
         self.__source_system_data_date = value
+        self.mark_dirty()
 
     def set_source_system_data_copyright(self, value):
         self.__source_system_data_copyright = value
+        self.mark_dirty()
 
     def set_destination_system(self, value):
         self.__destination_system = value
+        self.mark_dirty()
 
     def set_transmission_date(self, value):
         self.__transmission_date = value
+        self.mark_dirty()
 
     def set_transmission_date_time(self, value):
         self.__transmission_date_time = value
+        self.mark_dirty()
 
     def set_submitter_record_reference(self, value):
         self.__submitter_record_reference = value
+        self.mark_dirty()
 
     def set_submission_record_reference(self, value):
         self.__submission_record_reference = value
+        self.mark_dirty()
 
     def set_file_name(self, value):
         self.__file_name = value
+        self.mark_dirty()
 
     def set_copyright(self, value):
         self.__copyright = value
+        self.mark_dirty()
 
     def set_gedcom_version(self, value):
         self.__gedcom_version = value
+        self.mark_dirty()
 
     def set_gedcom_form(self, value):
         self.__gedcom_form = value
+        self.mark_dirty()
 
     def set_character_set(self, value):
         self.__character_set = value
+        self.mark_dirty()
 
     def set_character_set_version(self, value):
         self.__character_set_version = value
+        self.mark_dirty()
 
     def set_language(self, value):
         self.__language = value
+        self.mark_dirty()
 
     def set_place_form(self, value):
         self.__place_form = value
+        self.mark_dirty()
 
     def set_note(self, value):
         self.__note = value
+        self.mark_dirty()
 
     def del_source_system_id(self):
         del self.__source_system_id
+        self.mark_dirty()
 
     def del_source_system_version(self):
         del self.__source_system_version
+        self.mark_dirty()
 
     def del_source_system_name(self):
         del self.__source_system_name
+        self.mark_dirty()
 
     def del_source_system_corporate(self):
         del self.__source_system_corporate
+        self.mark_dirty()
 
     def del_source_system_corporate_address(self):
         del self.__source_system_corporate_address
+        self.mark_dirty()
 
     def del_source_system_data(self):
         del self.__source_system_data
+        self.mark_dirty()
 
     def del_source_system_data_date(self):
         del self.__source_system_data_date
+        self.mark_dirty()
 
     def del_source_system_data_copyright(self):
         del self.__source_system_data_copyright
+        self.mark_dirty()
 
     def del_destination_system(self):
         del self.__destination_system
+        self.mark_dirty()
 
     def del_transmission_date(self):
         del self.__transmission_date
+        self.mark_dirty()
 
     def del_transmission_date_time(self):
         del self.__transmission_date_time
+        self.mark_dirty()
 
     def del_submitter_record_reference(self):
         del self.__submitter_record_reference
+        self.mark_dirty()
 
     def del_submission_record_reference(self):
         del self.__submission_record_reference
+        self.mark_dirty()
 
     def del_file_name(self):
         del self.__file_name
+        self.mark_dirty()
 
     def del_copyright(self):
         del self.__copyright
+        self.mark_dirty()
 
     def del_gedcom_version(self):
         del self.__gedcom_version
+        self.mark_dirty()
 
     def del_gedcom_form(self):
         del self.__gedcom_form
+        self.mark_dirty()
 
     def del_character_set(self):
         del self.__character_set
+        self.mark_dirty()
 
     def del_character_set_version(self):
         del self.__character_set_version
+        self.mark_dirty()
 
     def del_language(self):
         del self.__language
+        self.mark_dirty()
 
     def del_place_form(self):
         del self.__place_form
+        self.mark_dirty()
 
     def del_note(self):
         del self.__note
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        scope = ""
-        index = 0
-        while index < len(relevant_lines):
-            line = gedcom_lines[index]
-            tag = line.tag
-            if tag == gedcom.tags.GEDCOM_TAG_SOURCE:
-                self.__source_system_id = line.value
-                scope = gedcom.tags.GEDCOM_TAG_SOURCE
-            elif tag == gedcom.tags.GEDCOM_TAG_VERSION and scope == gedcom.tags.GEDCOM_TAG_SOURCE:
-                self.__source_system_version = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_NAME and scope == gedcom.tags.GEDCOM_TAG_SOURCE:
-                self.__source_system_name = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CORPORATE and scope == gedcom.tags.GEDCOM_TAG_SOURCE:
-                self.__source_system_corporate = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_ADDRESS and scope == gedcom.tags.GEDCOM_TAG_SOURCE:
-                address = AddressStructure()
-                parsed_lines = address.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__source_system_corporate_address = address
-                    index += parsed_lines
-                    continue
-            elif tag == gedcom.tags.GEDCOM_TAG_DATA and scope == gedcom.tags.GEDCOM_TAG_SOURCE:
-                self.__source_system_data = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_DATE and scope == gedcom.tags.GEDCOM_TAG_SOURCE:
-                self.__source_system_data_date = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_COPYRIGHT and scope == gedcom.tags.GEDCOM_TAG_SOURCE:
-                self.__source_system_data_copyright = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CONTINUED and scope == gedcom.tags.GEDCOM_TAG_SOURCE:
-                self.__source_system_data_copyright = self.__source_system_data_copyright + "\n" + line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CONCATENATION and scope == gedcom.tags.GEDCOM_TAG_SOURCE:
-                self.__source_system_data_copyright = self.__source_system_data_copyright + line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_DESTINATION:
-                scope = ""
-                self.__destination_system = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_DATE:
-                scope = ""
-                self.__transmission_date = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_TIME:
-                scope = ""
-                self.__transmission_date_time = line.value    
-            elif tag == gedcom.tags.GEDCOM_TAG_SUBMITTER:
-                scope = ""
-                self.__submitter_record_reference = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_SUBMISSION:
-                scope = ""
-                self.__submission_record_reference = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_FILE:
-                scope = ""
-                self.__file_name = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_COPYRIGHT:
-                scope = ""
-                self.__copyright = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_GEDCOM:
-                scope = gedcom.tags.GEDCOM_TAG_GEDCOM
-            elif tag == gedcom.tags.GEDCOM_TAG_VERSION and scope == gedcom.tags.GEDCOM_TAG_GEDCOM:
-                self.__gedcom_version = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_FORMAT and scope == gedcom.tags.GEDCOM_TAG_GEDCOM:
-                self.__gedcom_form = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CHARACTER_SET:
-                scope = gedcom.tags.GEDCOM_TAG_CHARACTER_SET
-                self.__character_set = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_VERSION and scope == gedcom.tags.GEDCOM_TAG_CHARACTER_SET:
-                self.__character_set_version = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_LANGUAGE:
-                scope = ""
-                self.__language = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_PLACE:
-                scope = gedcom.tags.GEDCOM_TAG_PLACE
-            elif tag == gedcom.tags.GEDCOM_TAG_FORMAT and scope == gedcom.tags.GEDCOM_TAG_PLACE:
-                self.__place_form = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_NOTE:
-                scope = gedcom.tags.GEDCOM_TAG_NOTE
-                self.__note = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CONTINUED and scope == gedcom.tags.GEDCOM_TAG_NOTE:
-                self.__note = self.__note + "\n" + line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CONCATENATION and scope == gedcom.tags.GEDCOM_TAG_NOTE:
-                self.__note = self.__note + line.value
-            elif line.is_user_defined_tag():
-                # current implementation ignores the the user defined tags
-                record = Record()
-                parsed_lines = record.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    index += len(parsed_lines)
-                    continue
-            index += 1
-        return len(relevant_lines)
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.parse_scoped_lines(Header.PARSE_TABLE, Header.SCOPED_PARSE_TABLES, gedcom_lines, start, relevant_end)
+        return relevant_end - start
 
-    def get_gedcom_repr(self, level):
-        gedcom_repr = "%s %s" % (level, gedcom.tags.GEDCOM_TAG_HEADER)
+    def emit_gedcom_lines(self, lines, level):
+        lines.append("%s %s" % (level, gedcom.tags.GEDCOM_TAG_HEADER))
         if self.__source_system_id:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_SOURCE, self.__source_system_id)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_SOURCE, self.__source_system_id))
         if self.__source_system_version:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_VERSION, self.__source_system_version)
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_VERSION, self.__source_system_version))
         if self.__source_system_name:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_NAME, self.__source_system_name)
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_NAME, self.__source_system_name))
         if self.__source_system_corporate:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_CORPORATE, self.__source_system_corporate)
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_CORPORATE, self.__source_system_corporate))
         if self.__source_system_corporate_address:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, self.__source_system_corporate_address.get_gedcom_repr(level+3))
+            self.__source_system_corporate_address.emit_gedcom_lines(lines, level+3)
         if self.__source_system_data:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_DATA, self.__source_system_data)
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_DATA, self.__source_system_data))
         if self.__source_system_data_date:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+3, gedcom.tags.GEDCOM_TAG_DATE, self.__source_system_data_date)
+            lines.append("%s %s %s" % (level+3, gedcom.tags.GEDCOM_TAG_DATE, self.__source_system_data_date))
         if self.__source_system_data_copyright:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, gf.split_text_for_gedcom(self.__source_system_data_copyright, gedcom.tags.GEDCOM_TAG_COPYRIGHT, level+3, gedcom.tags.MAX_TEXT_LENGTH))
+            lines.append(gf.split_text_for_gedcom(self.__source_system_data_copyright, gedcom.tags.GEDCOM_TAG_COPYRIGHT, level+3, gedcom.tags.MAX_TEXT_LENGTH))
         if self.__destination_system:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_DESTINATION, self.__destination_system)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_DESTINATION, self.__destination_system))
         if self.__transmission_date:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_DATE, self.__transmission_date)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_DATE, self.__transmission_date))
         if self.__transmission_date_time:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_TIME, self.__transmission_date_time)
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_TIME, self.__transmission_date_time))
         if self.__submission_record_reference:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_SUBMISSION, self.__submission_record_reference)    
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_SUBMISSION, self.__submission_record_reference))
         if self.__submitter_record_reference:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_SUBMITTER, self.__submitter_record_reference)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_SUBMITTER, self.__submitter_record_reference))
         if self.__file_name:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_FILE, self.__file_name)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_FILE, self.__file_name))
         if self.__copyright:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_COPYRIGHT, self.__copyright)
-        gedcom_repr = "%s\n%s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_GEDCOM)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_COPYRIGHT, self.__copyright))
+        lines.append("%s %s" % (level+1, gedcom.tags.GEDCOM_TAG_GEDCOM))
         if self.__gedcom_version:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_VERSION, self.__gedcom_version)
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_VERSION, self.__gedcom_version))
         if self.__gedcom_form:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_FORMAT, self.__gedcom_form)
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_FORMAT, self.__gedcom_form))
         if self.__character_set:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_CHARACTER_SET, self.__character_set)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_CHARACTER_SET, self.__character_set))
         if self.__character_set_version:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_VERSION, self.__character_set_version)
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_VERSION, self.__character_set_version))
         if self.__language:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_LANGUAGE, self.__language)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_LANGUAGE, self.__language))
         if self.__place_form:
-            gedcom_repr = "%s\n%s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_PLACE)
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_FORMAT, self.__place_form)
+            lines.append("%s %s" % (level+1, gedcom.tags.GEDCOM_TAG_PLACE))
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_FORMAT, self.__place_form))
         if self.__note:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, gf.split_text_for_gedcom(self.__note, gedcom.tags.GEDCOM_TAG_NOTE, level+1, gedcom.tags.MAX_TEXT_LENGTH))
-        return gedcom_repr
+            lines.append(gf.split_text_for_gedcom(self.__note, gedcom.tags.GEDCOM_TAG_NOTE, level+1, gedcom.tags.MAX_TEXT_LENGTH))
     source_system_id = property(get_source_system_id, set_source_system_id, del_source_system_id, "source_system_id's docstring")
     source_system_version = property(get_source_system_version, set_source_system_version, del_source_system_version, "source_system_version's docstring")
     source_system_name = property(get_source_system_name, set_source_system_name, del_source_system_name, "source_system_name's docstring")
@@ -405,6 +705,45 @@ class Header(Record):
     place_form = property(get_place_form, set_place_form, del_place_form, "place_form's docstring")
     note = property(get_note, set_note, del_note, "note's docstring")
 
+    # each line in PARSE_TABLE opens the scope of its tag; the structure of the header lines is checked through their levels
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_SOURCE, 1, value_handler("source_system_id")),
+                                    (gedcom.tags.GEDCOM_TAG_DESTINATION, 1, value_handler("destination_system")),
+                                    (gedcom.tags.GEDCOM_TAG_DATE, 1, value_handler("transmission_date")),
+                                    (gedcom.tags.GEDCOM_TAG_TIME, 2, value_handler("transmission_date_time")),
+                                    (gedcom.tags.GEDCOM_TAG_SUBMITTER, 1, value_handler("submitter_record_reference")),
+                                    (gedcom.tags.GEDCOM_TAG_SUBMISSION, 1, value_handler("submission_record_reference")),
+                                    (gedcom.tags.GEDCOM_TAG_FILE, 1, value_handler("file_name")),
+                                    (gedcom.tags.GEDCOM_TAG_COPYRIGHT, 1, value_handler("copyright")),
+                                    (gedcom.tags.GEDCOM_TAG_GEDCOM, 1, scope_handler),
+                                    (gedcom.tags.GEDCOM_TAG_CHARACTER_SET, 1, value_handler("character_set")),
+                                    (gedcom.tags.GEDCOM_TAG_LANGUAGE, 1, value_handler("language")),
+                                    (gedcom.tags.GEDCOM_TAG_PLACE, 1, scope_handler),
+                                    (gedcom.tags.GEDCOM_TAG_NOTE, 1, continued_value_handler("note")),
+                                    (USER_DEFINED_TAGS, None, ignored_structure_handler))
+
+    # lines parsed only in the scope of a SOUR, GEDC, CHAR, PLAC or NOTE line
+    SCOPED_PARSE_TABLES = {gedcom.tags.GEDCOM_TAG_SOURCE: 
+                               build_parse_table((gedcom.tags.GEDCOM_TAG_VERSION, 2, value_handler("source_system_version")),
+                                                 (gedcom.tags.GEDCOM_TAG_NAME, 2, value_handler("source_system_name")),
+                                                 (gedcom.tags.GEDCOM_TAG_CORPORATE, 2, value_handler("source_system_corporate")),
+                                                 (gedcom.tags.GEDCOM_TAG_ADDRESS, 3, 
+                                                  substructure_handler(lambda: AddressStructure(), "source_system_corporate_address", append=False)),
+                                                 (gedcom.tags.GEDCOM_TAG_DATA, 2, value_handler("source_system_data")),
+                                                 (gedcom.tags.GEDCOM_TAG_DATE, 3, value_handler("source_system_data_date")),
+                                                 (gedcom.tags.GEDCOM_TAG_COPYRIGHT, 3, continued_value_handler("source_system_data_copyright")),
+                                                 (gedcom.tags.GEDCOM_TAG_CONTINUED, 4, concatenated_value_handler("source_system_data_copyright", "\n")),
+                                                 (gedcom.tags.GEDCOM_TAG_CONCATENATION, 4, concatenated_value_handler("source_system_data_copyright"))),
+                           gedcom.tags.GEDCOM_TAG_GEDCOM: 
+                               build_parse_table((gedcom.tags.GEDCOM_TAG_VERSION, 2, value_handler("gedcom_version")),
+                                                 (gedcom.tags.GEDCOM_TAG_FORMAT, 2, value_handler("gedcom_form"))),
+                           gedcom.tags.GEDCOM_TAG_CHARACTER_SET: 
+                               build_parse_table((gedcom.tags.GEDCOM_TAG_VERSION, 2, value_handler("character_set_version"))),
+                           gedcom.tags.GEDCOM_TAG_PLACE: 
+                               build_parse_table((gedcom.tags.GEDCOM_TAG_FORMAT, 2, value_handler("place_form"))),
+                           gedcom.tags.GEDCOM_TAG_NOTE: 
+                               build_parse_table((gedcom.tags.GEDCOM_TAG_CONTINUED, 2, concatenated_value_handler("note", "\n")),
+                                                 (gedcom.tags.GEDCOM_TAG_CONCATENATION, 2, concatenated_value_handler("note")))}
+
 
 class Family(Record):
     def __init__(self):
@@ -422,6 +761,7 @@ class Family(Record):
         self.__notes = []
         self.__sources = []
         self.__multimedia_links = []     
+        self.__raw_structures = []
         super().__init__()
 
     def get_partner_of(self, individual):
@@ -437,12 +777,15 @@ class Family(Record):
     def add_child(self, child):
         if child.reference not in self.__children_references:
             self.__children_references.append(child.reference)
+            self.mark_dirty()
     
     def add_partner_reference(self, individual):
         if individual.is_male():
             self.__husband_reference = individual.reference
+            self.mark_dirty()
         elif individual.is_female():
             self.__wife_reference = individual.reference
+            self.mark_dirty()
 
     def has_individual_reference(self, indi_ref):
         return indi_ref in self.__children_references or indi_ref == self.__husband_reference or indi_ref == self.__wife_reference
@@ -458,6 +801,7 @@ class Family(Record):
                 self.__wife_reference = ""
             else:
                 self.__children_references.remove(indi_ref)
+            self.mark_dirty()
 
     def __str__(self):
         return self.__reference
@@ -518,189 +862,165 @@ class Family(Record):
 
     def set_reference(self, value):
         self.__reference = value
+        self.mark_dirty()
 
     def set_restriction_notice(self, value):
         self.__restriction_notice = value
+        self.mark_dirty()
 
     def set_family_event_structures(self, value):
         self.__family_event_structures = value
+        self.mark_dirty()
 
     def set_husband_reference(self, value):
         self.__husband_reference = value
+        self.mark_dirty()
 
     def set_wife_reference(self, value):
         self.__wife_reference = value
+        self.mark_dirty()
 
     def set_children_references(self, value):
         self.__children_references = value
+        self.mark_dirty()
 
     def set_number_children(self, value):
         self.__number_children = value
+        self.mark_dirty()
 
     def set_submitter_records(self, value):
         self.__submitter_records = value
+        self.mark_dirty()
 
     def set_user_reference_numbers(self, value):
         self.__user_reference_numbers = value
+        self.mark_dirty()
 
     def set_automated_record_id(self, value):
         self.__automated_record_id = value
+        self.mark_dirty()
 
     def set_change_date(self, value):
         self.__change_date = value
+        self.mark_dirty()
 
     def set_notes(self, value):
         self.__notes = value
+        self.mark_dirty()
 
     def set_sources(self, value):
         self.__sources = value
+        self.mark_dirty()
 
     def set_multimedia_links(self, value):
         self.__multimedia_links = value
+        self.mark_dirty()
 
     def del_reference(self):
         del self.__reference
+        self.mark_dirty()
 
     def del_restriction_notice(self):
         del self.__restriction_notice
+        self.mark_dirty()
 
     def del_family_event_structures(self):
         del self.__family_event_structures
+        self.mark_dirty()
 
     def del_husband_reference(self):
         del self.__husband_reference
+        self.mark_dirty()
 
     def del_wife_reference(self):
         del self.__wife_reference
+        self.mark_dirty()
 
     def del_children_references(self):
         del self.__children_references
+        self.mark_dirty()
 
     def del_number_children(self):
         del self.__number_children
+        self.mark_dirty()
 
     def del_submitter_records(self):
         del self.__submitter_records
+        self.mark_dirty()
 
     def del_user_reference_numbers(self):
         del self.__user_reference_numbers
+        self.mark_dirty()
 
     def del_automated_record_id(self):
         del self.__automated_record_id
+        self.mark_dirty()
 
     def del_change_date(self):
         del self.__change_date
+        self.mark_dirty()
 
     def del_notes(self):
         del self.__notes
+        self.mark_dirty()
 
     def del_sources(self):
         del self.__sources
+        self.mark_dirty()
 
     def del_multimedia_links(self):
         del self.__multimedia_links
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__reference = relevant_lines[0].pointer
-        index = 0
-        while index < len(relevant_lines):
-            line = relevant_lines[index]
-            if line.tag == gedcom.tags.GEDCOM_TAG_RESTRICTION and (line.level == 1):
-                self.__restriction_notice = line.value
-            elif line.tag in gedcom.tags.FAMILY_EVENT_STRUCTURE_TAGS and (line.level == 1):
-                family_event = FamilyEventStructure()
-                parsed_lines = family_event.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__family_event_structures.append(family_event)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_HUSBAND and (line.level == 1):
-                self.__husband_reference = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_WIFE and (line.level == 1):
-                self.__wife_reference = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_CHILD and (line.level == 1):
-                self.__children_references.append(line.value)
-            elif line.tag == gedcom.tags.GEDCOM_TAG_CHILDREN_COUNT and (line.level == 1):
-                self.__number_children = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_SUBMITTER and (line.level == 1):
-                self.__submitter_records.append(line.value)
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REFERENCE and (line.level == 1):
-                if gedcom_lines[index+1].get_tag() == gedcom.tags.GEDCOM_TAG_TYPE:
-                    self.__user_reference_numbers.append((gedcom_lines[index].get_value(), gedcom_lines[index+1].get_value()))
-                else:
-                    self.__user_reference_numbers.append((gedcom_lines[index].get_value(), ""))
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER and (line.level == 1):
-                self.__automated_record_id = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_DATE_CHANGE and (line.level == 1):
-                change_date = ChangeDate()
-                parsed_lines = change_date.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__change_date = change_date
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_NOTE and (line.level == 1):
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__notes.append(note)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_SOURCE and (line.level == 1):
-                source = SourceCitation()
-                parsed_lines = source.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__sources.append(source)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_OBJECT and (line.level == 1):
-                multimedia = MultimediaLink()
-                parsed_lines = multimedia.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__multimedia_links.append(multimedia)
-                    index += parsed_lines
-                    continue
-            elif line.tag in (gedcom.tags.IGNORED_FAMILY_RECORD_TAGS) or line.is_user_defined_tag():
-                # current implementation ignores the structures identified by tags in IGNORED_FAMILY_RECORD_TAGS and the user defined tags
-                record = Record()
-                parsed_lines = record.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    index += len(parsed_lines)
-                    continue
-            index += 1
-        return len(relevant_lines)
-    
-    def get_gedcom_repr(self, level):
-        gedcom_repr = "%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_FAMILY)
+    def get_raw_structures(self):
+        return self.__raw_structures
+
+    def set_raw_structures(self, value):
+        self.__raw_structures = value
+        self.mark_dirty()
+
+    def del_raw_structures(self):
+        del self.__raw_structures
+        self.mark_dirty()
+
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__reference = gedcom_lines[start].pointer
+        self.parse_lines(Family.PARSE_TABLE, gedcom_lines, start, relevant_end)
+        return relevant_end - start
+
+    def emit_gedcom_lines(self, lines, level):
+        lines.append("%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_FAMILY))
         if self.__restriction_notice:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_RESTRICTION, self.__restriction_notice)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_RESTRICTION, self.__restriction_notice))
         for family_event_structure in self.__family_event_structures:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, family_event_structure.get_gedcom_repr(level+1))
+            family_event_structure.emit_gedcom_lines(lines, level+1)
         if self.__husband_reference:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_HUSBAND, self.__husband_reference)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_HUSBAND, self.__husband_reference))
         if self.__wife_reference:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_WIFE, self.__wife_reference)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_WIFE, self.__wife_reference))
         for child_reference in self.__children_references:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_CHILD, child_reference)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_CHILD, child_reference))
         if self.__number_children:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_CHILDREN_COUNT, self.__number_children)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_CHILDREN_COUNT, self.__number_children))
         for submitter_record_reference in self.__submitter_records:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_SUBMITTER, submitter_record_reference)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_SUBMITTER, submitter_record_reference))
         for user_reference_number in self.__user_reference_numbers:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REFERENCE, user_reference_number[0])
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REFERENCE, user_reference_number[0]))
             if user_reference_number[1]:
-                gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_TYPE, user_reference_number[1])
+                lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_TYPE, user_reference_number[1]))
         if self.__automated_record_id:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id))
         if self.__change_date:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, self.__change_date.get_gedcom_repr(level+1))
+            self.__change_date.emit_gedcom_lines(lines, level+1)
         for note_structure in self.__notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note_structure.get_gedcom_repr(level+1))
+            note_structure.emit_gedcom_lines(lines, level+1)
         for source_citation in self.__sources:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, source_citation.get_gedcom_repr(level+1))
+            source_citation.emit_gedcom_lines(lines, level+1)
         for multimedia_link in self.__multimedia_links:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, multimedia_link.get_gedcom_repr(level+1))
-        return gedcom_repr
+            multimedia_link.emit_gedcom_lines(lines, level+1)
+        for raw_structure in self.__raw_structures:
+            raw_structure.emit_gedcom_lines(lines, level+raw_structure.level)
 
     reference = property(get_reference, set_reference, del_reference, "reference's docstring")
     restriction_notice = property(get_restriction_notice, set_restriction_notice, del_restriction_notice, "restriction_notice's docstring")
@@ -715,8 +1035,26 @@ class Family(Record):
     change_date = property(get_change_date, set_change_date, del_change_date, "change_date's docstring")
     notes = property(get_notes, set_notes, del_notes, "notes's docstring")
     sources = property(get_sources, set_sources, del_sources, "sources's docstring")
+    raw_structures = property(get_raw_structures, set_raw_structures, del_raw_structures, "structures kept unparsed, as RawStructure objects")
     multimedia_links = property(get_multimedia_links, set_multimedia_links, del_multimedia_links, "multimedia_links's docstring")
 
+    # current implementation keeps unparsed the structures identified by tags in IGNORED_FAMILY_RECORD_TAGS and the user defined tags
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_RESTRICTION, 1, value_handler("restriction_notice")),
+                                    (gedcom.tags.FAMILY_EVENT_STRUCTURE_TAGS, 1, substructure_handler(lambda: FamilyEventStructure(), "family_event_structures")),
+                                    (gedcom.tags.GEDCOM_TAG_HUSBAND, 1, value_handler("husband_reference")),
+                                    (gedcom.tags.GEDCOM_TAG_WIFE, 1, value_handler("wife_reference")),
+                                    (gedcom.tags.GEDCOM_TAG_CHILD, 1, appended_value_handler("children_references")),
+                                    (gedcom.tags.GEDCOM_TAG_CHILDREN_COUNT, 1, value_handler("number_children")),
+                                    (gedcom.tags.GEDCOM_TAG_SUBMITTER, 1, appended_value_handler("submitter_records")),
+                                    (gedcom.tags.GEDCOM_TAG_REFERENCE, 1, user_reference_number_handler),
+                                    (gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, 1, value_handler("automated_record_id")),
+                                    (gedcom.tags.GEDCOM_TAG_DATE_CHANGE, 1, substructure_handler(lambda: ChangeDate(), "change_date", append=False)),
+                                    (gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "notes")),
+                                    (gedcom.tags.GEDCOM_TAG_SOURCE, 1, substructure_handler(lambda: SourceCitation(), "sources")),
+                                    (gedcom.tags.GEDCOM_TAG_OBJECT, 1, substructure_handler(lambda: MultimediaLink(), "multimedia_links")),
+                                    (gedcom.tags.IGNORED_FAMILY_RECORD_TAGS, None, raw_structure_handler),
+                                    (USER_DEFINED_TAGS, None, raw_structure_handler))
+
 
 class Individual(Record):
     def __init__(self, first_name = "", last_name = "", sex = "", date_of_birth = "", date_of_death = ""):
@@ -740,6 +1078,7 @@ class Individual(Record):
         self.__notes = []
         self.__sources = []
         self.__multimedia_links = []
+        self.__raw_structures = []
         super().__init__()
         if first_name or last_name:
             name_structure = PersonalNameStructure()
@@ -777,15 +1116,18 @@ class Individual(Record):
             for child_link in self.__child_to_family_links:
                 if child_link.family_reference == source_family_reference:
                     child_link.family_reference = target_family_reference
+        self.mark_dirty()
     
     def remove_family_as_partner(self, family_ref):
         self.__spouse_to_family_links = [stfl for stfl in self.__spouse_to_family_links if stfl.family_reference != family_ref]
+        self.mark_dirty()
     
     def add_family_reference_as_partner(self, fam_ref):
         if fam_ref not in [fam.family_reference for fam in self.__spouse_to_family_links]:
             stfl = SpouseToFamilyLink()
             stfl.family_reference = fam_ref
             self.__spouse_to_family_links.append(stfl)
+            self.mark_dirty()
 
     def has_family(self):
         return len(self.__spouse_to_family_links) > 0
@@ -866,269 +1208,225 @@ class Individual(Record):
 
     def set_reference(self, value):
         self.__reference = value
+        self.mark_dirty()
 
     def set_restriction_notice(self, value):
         self.__restriction_notice = value
+        self.mark_dirty()
 
     def set_personal_name_structures(self, value):
         self.__personal_name_structures = value
+        self.mark_dirty()
 
     def set_sex(self, value):
         self.__sex = value
+        self.mark_dirty()
 
     def set_event_structures(self, value):
         self.__event_structures = value
+        self.mark_dirty()
 
     def set_attribute_structures(self, value):
         self.__attribute_structures = value
+        self.mark_dirty()
 
     def set_child_to_family_links(self, value):
         self.__child_to_family_links = value
+        self.mark_dirty()
 
     def set_spouse_to_family_links(self, value):
         self.__spouse_to_family_links = value
+        self.mark_dirty()
 
     def set_submitter_records(self, value):
         self.__submitter_records = value
+        self.mark_dirty()
 
     def set_aliases(self, value):
         self.__aliases = value
+        self.mark_dirty()
 
     def set_interest_more_research_ancestors(self, value):
         self.__interest_more_research_ancestors = value
+        self.mark_dirty()
 
     def set_interest_more_research_descendants(self, value):
         self.__interest_more_research_descendants = value
+        self.mark_dirty()
 
     def set_permanent_record_file_number(self, value):
         self.__permanent_record_file_number = value
+        self.mark_dirty()
 
     def set_ancestral_file_number(self, value):
         self.__ancestral_file_number = value
+        self.mark_dirty()
 
     def set_user_reference_numbers(self, value):
         self.__user_reference_numbers = value
+        self.mark_dirty()
 
     def set_automated_record_id(self, value):
         self.__automated_record_id = value
+        self.mark_dirty()
 
     def set_change_date(self, value):
         self.__change_date = value
+        self.mark_dirty()
 
     def set_notes(self, value):
         self.__notes = value
+        self.mark_dirty()
 
     def set_sources(self, value):
         self.__sources = value
+        self.mark_dirty()
 
     def set_multimedia_links(self, value):
         self.__multimedia_links = value
+        self.mark_dirty()
 
     def del_reference(self):
         del self.__reference
+        self.mark_dirty()
 
     def del_restriction_notice(self):
         del self.__restriction_notice
+        self.mark_dirty()
 
     def del_personal_name_structures(self):
         del self.__personal_name_structures
+        self.mark_dirty()
 
     def del_sex(self):
         del self.__sex
+        self.mark_dirty()
 
     def del_event_structures(self):
         del self.__event_structures
+        self.mark_dirty()
 
     def del_attribute_structures(self):
         del self.__attribute_structures
+        self.mark_dirty()
 
     def del_child_to_family_links(self):
         del self.__child_to_family_links
+        self.mark_dirty()
 
     def del_spouse_to_family_links(self):
         del self.__spouse_to_family_links
+        self.mark_dirty()
 
     def del_submitter_records(self):
         del self.__submitter_records
+        self.mark_dirty()
 
     def del_aliases(self):
         del self.__aliases
+        self.mark_dirty()
 
     def del_interest_more_research_ancestors(self):
         del self.__interest_more_research_ancestors
+        self.mark_dirty()
 
     def del_interest_more_research_descendants(self):
         del self.__interest_more_research_descendants
+        self.mark_dirty()
 
     def del_permanent_record_file_number(self):
         del self.__permanent_record_file_number
+        self.mark_dirty()
 
     def del_ancestral_file_number(self):
         del self.__ancestral_file_number
+        self.mark_dirty()
 
     def del_user_reference_numbers(self):
         del self.__user_reference_numbers
+        self.mark_dirty()
 
     def del_automated_record_id(self):
         del self.__automated_record_id
+        self.mark_dirty()
 
     def del_change_date(self):
         del self.__change_date
+        self.mark_dirty()
 
     def del_notes(self):
         del self.__notes
+        self.mark_dirty()
 
     def del_sources(self):
         del self.__sources
+        self.mark_dirty()
 
     def del_multimedia_links(self):
         del self.__multimedia_links
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__reference = relevant_lines[0].pointer
-        index = 0
-        while index < len(relevant_lines):
-            line = relevant_lines[index]
-            if line.tag == gedcom.tags.GEDCOM_TAG_RESTRICTION and (line.level == 1):
-                self.__restriction_notice = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_NAME and (line.level == 1):
-                personal_name = PersonalNameStructure()
-                parsed_lines = personal_name.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__personal_name_structures.append(personal_name)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_SEX and (line.level == 1):
-                self.__sex = line.value
-            elif line.tag in gedcom.tags.INDIVIDUAL_EVENT_STRUCTURE_TAGS and (line.level == 1):
-                individual_event_structure = IndividualEventStructure()
-                parsed_lines = individual_event_structure.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__event_structures.append(individual_event_structure)
-                    index += parsed_lines
-                    continue
-            elif line.tag in gedcom.tags.INDIVIDUAL_ATTRIBUTE_STRUCTURE_TAGS and (line.level == 1):           
-                individual_attribute_structure = IndividualAttributeStructure()
-                parsed_lines = individual_attribute_structure.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__attribute_structures.append(individual_attribute_structure)
-                    index += parsed_lines
-                    continue
-            elif line.tag in gedcom.tags.GEDCOM_TAG_FAMILY_CHILD and (line.level == 1):               
-                child_to_family_link = ChildToFamilyLink()
-                parsed_lines = child_to_family_link.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__child_to_family_links.append(child_to_family_link)
-                    index += parsed_lines
-                    continue
-            elif line.tag in gedcom.tags.GEDCOM_TAG_FAMILY_SPOUSE and (line.level == 1):
-                spouse_to_family_link = SpouseToFamilyLink()
-                parsed_lines = spouse_to_family_link.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__spouse_to_family_links.append(spouse_to_family_link)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_SUBMITTER and (line.level == 1):
-                self.__submitter_records.append(line.value)
-            elif line.tag == gedcom.tags.GEDCOM_TAG_ALIAS and (line.level == 1):
-                self.__aliases.append(line.value)
-            elif line.tag == gedcom.tags.GEDCOM_TAG_ANCES_INTEREST and (line.level == 1):
-                self.__interest_more_research_ancestors.append(line.value)
-            elif line.tag == gedcom.tags.GEDCOM_TAG_DESCENDANT_INT and (line.level == 1):
-                self.__interest_more_research_descendants.append(line.value)
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REC_FILE_NUMBER and (line.level == 1):
-                self.__permanent_record_file_number = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_ANCESTRAL_FILE_NUMBER and (line.level == 1):
-                self.__ancestral_file_number = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REFERENCE and (line.level == 1):
-                if gedcom_lines[index+1].get_tag() == gedcom.tags.GEDCOM_TAG_TYPE:
-                    self.__user_reference_numbers.append((gedcom_lines[index].get_value(), gedcom_lines[index+1].get_value()))
-                else:
-                    self.__user_reference_numbers.append((gedcom_lines[index].get_value(), ""))
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER and (line.level == 1):
-                self.__automated_record_id = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_DATE_CHANGE and (line.level == 1):
-                change_date = ChangeDate()
-                parsed_lines = change_date.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__change_date = change_date
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_NOTE and (line.level == 1):
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__notes.append(note)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_SOURCE and (line.level == 1):
-                source = SourceCitation()
-                parsed_lines = source.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__sources.append(source)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_OBJECT and (line.level == 1):
-                multimedia = MultimediaLink()
-                parsed_lines = multimedia.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__multimedia_links.append(multimedia)
-                    index += parsed_lines
-                    continue
-            elif line.tag in (gedcom.tags.IGNORED_INDIVIDUAL_RECORD_TAGS) or line.is_user_defined_tag():
-                # current implementation ignores the structures identified by tags in IGNORED_INDIVIDUAL_RECORD_TAGS and the user defined tags
-                record = Record()
-                parsed_lines = record.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    index += len(parsed_lines)
-                    continue
-            index += 1
-        return len(relevant_lines)
-    
-    def get_gedcom_repr(self, level=0):
-        gedcom_repr = "%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_INDIVIDUAL)
+    def get_raw_structures(self):
+        return self.__raw_structures
+
+    def set_raw_structures(self, value):
+        self.__raw_structures = value
+        self.mark_dirty()
+
+    def del_raw_structures(self):
+        del self.__raw_structures
+        self.mark_dirty()
+
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__reference = gedcom_lines[start].pointer
+        self.parse_lines(Individual.PARSE_TABLE, gedcom_lines, start, relevant_end)
+        return relevant_end - start
+
+    def emit_gedcom_lines(self, lines, level=0):
+        lines.append("%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_INDIVIDUAL))
         if self.__restriction_notice:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_RESTRICTION, self.__restriction_notice)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_RESTRICTION, self.__restriction_notice))
         for personal_name in self.__personal_name_structures:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, personal_name.get_gedcom_repr(level+1))
+            personal_name.emit_gedcom_lines(lines, level+1)
         if self.__sex:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_SEX, self.__sex)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_SEX, self.__sex))
         for individual_event in self.__event_structures:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, individual_event.get_gedcom_repr(level+1))
+            individual_event.emit_gedcom_lines(lines, level+1)
         for individual_attribute in self.__attribute_structures:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, individual_attribute.get_gedcom_repr(level+1))
+            individual_attribute.emit_gedcom_lines(lines, level+1)
         for child_to_family_link in self.__child_to_family_links:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, child_to_family_link.get_gedcom_repr(level+1))
+            child_to_family_link.emit_gedcom_lines(lines, level+1)
         for spouse_to_family_link in self.__spouse_to_family_links:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, spouse_to_family_link.get_gedcom_repr(level+1))
+            spouse_to_family_link.emit_gedcom_lines(lines, level+1)
         for submitter_records in self.__submitter_records:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_SUBMITTER, submitter_records)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_SUBMITTER, submitter_records))
         for alias in self.__aliases:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_ALIAS, alias)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_ALIAS, alias))
         for int_ances in self.__interest_more_research_ancestors:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_ANCES_INTEREST, int_ances)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_ANCES_INTEREST, int_ances))
         for int_desc in self.__interest_more_research_descendants:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_DESCENDANT_INT, int_desc)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_DESCENDANT_INT, int_desc))
         if self.__permanent_record_file_number:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REC_FILE_NUMBER, self.__permanent_record_file_number)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REC_FILE_NUMBER, self.__permanent_record_file_number))
         if self.__ancestral_file_number:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_ANCESTRAL_FILE_NUMBER, self.__ancestral_file_number)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_ANCESTRAL_FILE_NUMBER, self.__ancestral_file_number))
         for user_reference_number in self.__user_reference_numbers:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REFERENCE, user_reference_number[0])
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REFERENCE, user_reference_number[0]))
             if user_reference_number[1]:
-                gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_TYPE, user_reference_number[1])
+                lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_TYPE, user_reference_number[1]))
         if self.__automated_record_id:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id))
         if self.__change_date:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, self.__change_date.get_gedcom_repr(level+1))
+            self.__change_date.emit_gedcom_lines(lines, level+1)
         for note_structure in self.__notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note_structure.get_gedcom_repr(level+1))
+            note_structure.emit_gedcom_lines(lines, level+1)
         for source_citation in self.__sources:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, source_citation.get_gedcom_repr(level+1))
+            source_citation.emit_gedcom_lines(lines, level+1)
         for multimedia_link in self.__multimedia_links:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, multimedia_link.get_gedcom_repr(level+1))    
-        return gedcom_repr
+            multimedia_link.emit_gedcom_lines(lines, level+1)
+        for raw_structure in self.__raw_structures:
+            raw_structure.emit_gedcom_lines(lines, level+raw_structure.level)
 
     reference = property(get_reference, set_reference, del_reference, "reference's docstring")
     restriction_notice = property(get_restriction_notice, set_restriction_notice, del_restriction_notice, "restriction_notice's docstring")
@@ -1149,8 +1447,32 @@ class Individual(Record):
     change_date = property(get_change_date, set_change_date, del_change_date, "change_date's docstring")
     notes = property(get_notes, set_notes, del_notes, "notes's docstring")
     sources = property(get_sources, set_sources, del_sources, "sources's docstring")
+    raw_structures = property(get_raw_structures, set_raw_structures, del_raw_structures, "structures kept unparsed, as RawStructure objects")
     multimedia_links = property(get_multimedia_links, set_multimedia_links, del_multimedia_links, "multimedia_links's docstring")
 
+    # current implementation keeps unparsed the structures identified by tags in IGNORED_INDIVIDUAL_RECORD_TAGS and the user defined tags
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_RESTRICTION, 1, value_handler("restriction_notice")),
+                                    (gedcom.tags.GEDCOM_TAG_NAME, 1, substructure_handler(lambda: PersonalNameStructure(), "personal_name_structures")),
+                                    (gedcom.tags.GEDCOM_TAG_SEX, 1, value_handler("sex")),
+                                    (gedcom.tags.INDIVIDUAL_EVENT_STRUCTURE_TAGS, 1, substructure_handler(lambda: IndividualEventStructure(), "event_structures")),
+                                    (gedcom.tags.INDIVIDUAL_ATTRIBUTE_STRUCTURE_TAGS, 1, substructure_handler(lambda: IndividualAttributeStructure(), "attribute_structures")),
+                                    (gedcom.tags.GEDCOM_TAG_FAMILY_CHILD, 1, substructure_handler(lambda: ChildToFamilyLink(), "child_to_family_links")),
+                                    (gedcom.tags.GEDCOM_TAG_FAMILY_SPOUSE, 1, substructure_handler(lambda: SpouseToFamilyLink(), "spouse_to_family_links")),
+                                    (gedcom.tags.GEDCOM_TAG_SUBMITTER, 1, appended_value_handler("submitter_records")),
+                                    (gedcom.tags.GEDCOM_TAG_ALIAS, 1, appended_value_handler("aliases")),
+                                    (gedcom.tags.GEDCOM_TAG_ANCES_INTEREST, 1, appended_value_handler("interest_more_research_ancestors")),
+                                    (gedcom.tags.GEDCOM_TAG_DESCENDANT_INT, 1, appended_value_handler("interest_more_research_descendants")),
+                                    (gedcom.tags.GEDCOM_TAG_REC_FILE_NUMBER, 1, value_handler("permanent_record_file_number")),
+                                    (gedcom.tags.GEDCOM_TAG_ANCESTRAL_FILE_NUMBER, 1, value_handler("ancestral_file_number")),
+                                    (gedcom.tags.GEDCOM_TAG_REFERENCE, 1, user_reference_number_handler),
+                                    (gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, 1, value_handler("automated_record_id")),
+                                    (gedcom.tags.GEDCOM_TAG_DATE_CHANGE, 1, substructure_handler(lambda: ChangeDate(), "change_date", append=False)),
+                                    (gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "notes")),
+                                    (gedcom.tags.GEDCOM_TAG_SOURCE, 1, substructure_handler(lambda: SourceCitation(), "sources")),
+                                    (gedcom.tags.GEDCOM_TAG_OBJECT, 1, substructure_handler(lambda: MultimediaLink(), "multimedia_links")),
+                                    (gedcom.tags.IGNORED_INDIVIDUAL_RECORD_TAGS, None, raw_structure_handler),
+                                    (USER_DEFINED_TAGS, None, raw_structure_handler))
+
 
 class Multimedia(Record):
     def __init__(self):
@@ -1164,6 +1486,7 @@ class Multimedia(Record):
         self.__change_date = None
         self.__notes = []
         self.__sources = []
+        self.__raw_structures = []
         super().__init__()
 
     def get_reference(self):
@@ -1198,141 +1521,125 @@ class Multimedia(Record):
 
     def set_reference(self, value):
         self.__reference = value
+        self.mark_dirty()
 
     def set_file(self, value):
         self.__file = value
+        self.mark_dirty()
 
     def set_file_format(self, value):
         self.__file_format = value
+        self.mark_dirty()
 
     def set_file_format_type(self, value):
         self.__file_format_type = value
+        self.mark_dirty()
 
     def set_file_title(self, value):
         self.__file_title = value
+        self.mark_dirty()
 
     def set_user_reference_numbers(self, value):
         self.__user_reference_numbers = value
+        self.mark_dirty()
 
     def set_automated_record_id(self, value):
         self.__automated_record_id = value
+        self.mark_dirty()
 
     def set_change_date(self, value):
         self.__change_date = value
+        self.mark_dirty()
 
     def set_notes(self, value):
         self.__notes = value
+        self.mark_dirty()
 
     def set_sources(self, value):
         self.__sources = value
+        self.mark_dirty()
 
     def del_reference(self):
         del self.__reference
+        self.mark_dirty()
 
     def del_file(self):
         del self.__file
+        self.mark_dirty()
 
     def del_file_format(self):
         del self.__file_format
+        self.mark_dirty()
 
     def del_file_format_type(self):
         del self.__file_format_type
+        self.mark_dirty()
 
     def del_file_title(self):
         del self.__file_title
+        self.mark_dirty()
 
     def del_user_reference_numbers(self):
         del self.__user_reference_numbers
+        self.mark_dirty()
 
     def del_automated_record_id(self):
         del self.__automated_record_id
+        self.mark_dirty()
 
     def del_change_date(self):
         del self.__change_date
+        self.mark_dirty()
 
     def del_notes(self):
         del self.__notes
+        self.mark_dirty()
 
     def del_sources(self):
         del self.__sources
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__reference = relevant_lines[0].pointer
-        index = 0
-        starting_level = relevant_lines[0].level
-        while index < len(relevant_lines):
-            line = gedcom_lines[index]
-            if line.tag == gedcom.tags.GEDCOM_TAG_FILE:
-                self.__file = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_FORMAT and line.level==starting_level+2:
-                self.__file_format = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_TYPE and line.level==starting_level+3:
-                self.__file_format_type = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_TITLE and line.level==starting_level+2:
-                self.__file_title = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REFERENCE:
-                if gedcom_lines[index+1].tag == gedcom.tags.GEDCOM_TAG_TYPE:
-                    self.__user_reference_numbers.append((gedcom_lines[index].value, gedcom_lines[index+1].value))
-                    index += 1
-                else:
-                    self.__user_reference_numbers.append((gedcom_lines[index].value, ""))
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER:
-                self.__automated_record_id = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_NOTE and line.level == starting_level+1:
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__notes.append(note)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_SOURCE and line.level == starting_level+1:
-                source = SourceCitation()
-                parsed_lines = source.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__sources.append(source)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_DATE_CHANGE:
-                change_date = ChangeDate()
-                parsed_lines = change_date.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__change_date = change_date
-                    index += parsed_lines
-                    continue
-            elif  line.is_user_defined_tag():
-                # current implementation ignores the user defined tags
-                record = Record()
-                parsed_lines = record.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    index += len(parsed_lines)
-                    continue
-            index += 1
-        return len(relevant_lines)
-    
-    def get_gedcom_repr(self, level=0):
-        gedcom_repr = "%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_OBJECT)
+    def get_raw_structures(self):
+        return self.__raw_structures
+
+    def set_raw_structures(self, value):
+        self.__raw_structures = value
+        self.mark_dirty()
+
+    def del_raw_structures(self):
+        del self.__raw_structures
+        self.mark_dirty()
+
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__reference = gedcom_lines[start].pointer
+        self.parse_lines(Multimedia.PARSE_TABLE, gedcom_lines, start, relevant_end)
+        return relevant_end - start
+
+    def emit_gedcom_lines(self, lines, level=0):
+        lines.append("%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_OBJECT))
         if self.__file:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_FILE, self.__file)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_FILE, self.__file))
         if self.__file_format:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_FORMAT, self.__file_format)
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_FORMAT, self.__file_format))
         if self.__file_format_type:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+3, gedcom.tags.GEDCOM_TAG_TYPE, self.__file_format_type)
+            lines.append("%s %s %s" % (level+3, gedcom.tags.GEDCOM_TAG_TYPE, self.__file_format_type))
         if self.__file_title:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_TITLE, self.__file_title)
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_TITLE, self.__file_title))
         for user_reference_number in self.__user_reference_numbers:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REFERENCE, user_reference_number[0])
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REFERENCE, user_reference_number[0]))
             if user_reference_number[1]:
-                gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_TYPE, user_reference_number[1])
+                lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_TYPE, user_reference_number[1]))
         if self.__automated_record_id:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id))
         if self.__change_date:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, self.__change_date.get_gedcom_repr(level+1))
+            self.__change_date.emit_gedcom_lines(lines, level+1)
         for note_structure in self.__notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note_structure.get_gedcom_repr(level+1))
+            note_structure.emit_gedcom_lines(lines, level+1)
         for source_citation in self.__sources:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, source_citation.get_gedcom_repr(level+1))
-        return gedcom_repr
+            source_citation.emit_gedcom_lines(lines, level+1)
+        for raw_structure in self.__raw_structures:
+            raw_structure.emit_gedcom_lines(lines, level+raw_structure.level)
     reference = property(get_reference, set_reference, del_reference, "reference's docstring")
     file = property(get_file, set_file, del_file, "file's docstring")
     file_format = property(get_file_format, set_file_format, del_file_format, "file_format's docstring")
@@ -1342,8 +1649,21 @@ class Multimedia(Record):
     automated_record_id = property(get_automated_record_id, set_automated_record_id, del_automated_record_id, "automated_record_id's docstring")
     change_date = property(get_change_date, set_change_date, del_change_date, "change_date's docstring")
     notes = property(get_notes, set_notes, del_notes, "notes's docstring")
+    raw_structures = property(get_raw_structures, set_raw_structures, del_raw_structures, "structures kept unparsed, as RawStructure objects")
     sources = property(get_sources, set_sources, del_sources, "sources's docstring")
 
+    # current implementation keeps unparsed the user defined tags
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_FILE, None, value_handler("file")),
+                                    (gedcom.tags.GEDCOM_TAG_FORMAT, 2, value_handler("file_format")),
+                                    (gedcom.tags.GEDCOM_TAG_TYPE, 3, value_handler("file_format_type")),
+                                    (gedcom.tags.GEDCOM_TAG_TITLE, 2, value_handler("file_title")),
+                                    (gedcom.tags.GEDCOM_TAG_REFERENCE, None, user_reference_number_handler),
+                                    (gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, None, value_handler("automated_record_id")),
+                                    (gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "notes")),
+                                    (gedcom.tags.GEDCOM_TAG_SOURCE, 1, substructure_handler(lambda: SourceCitation(), "sources")),
+                                    (gedcom.tags.GEDCOM_TAG_DATE_CHANGE, None, substructure_handler(lambda: ChangeDate(), "change_date", append=False)),
+                                    (USER_DEFINED_TAGS, None, raw_structure_handler))
+
 
 class Note(Record):
     def __init__(self):
@@ -1353,6 +1673,7 @@ class Note(Record):
         self.__automated_record_id = ""
         self.__change_date = None
         self.__sources = []
+        self.__raw_structures = []
         super().__init__()
 
     def get_reference(self):
@@ -1375,113 +1696,102 @@ class Note(Record):
 
     def set_reference(self, value):
         self.__reference = value
+        self.mark_dirty()
 
     def set_text(self, value):
         self.__text = value
+        self.mark_dirty()
 
     def set_user_reference_numbers(self, value):
         self.__user_reference_numbers = value
+        self.mark_dirty()
 
     def set_automated_record_id(self, value):
         self.__automated_record_id = value
+        self.mark_dirty()
 
     def set_change_date(self, value):
         self.__change_date = value
+        self.mark_dirty()
 
     def set_sources(self, value):
         self.__sources = value
+        self.mark_dirty()
 
     def del_reference(self):
         del self.__reference
+        self.mark_dirty()
 
     def del_text(self):
         del self.__text
+        self.mark_dirty()
 
     def del_user_reference_numbers(self):
         del self.__user_reference_numbers
+        self.mark_dirty()
 
     def del_automated_record_id(self):
         del self.__automated_record_id
+        self.mark_dirty()
 
     def del_change_date(self):
         del self.__change_date
+        self.mark_dirty()
 
     def del_sources(self):
         del self.__sources
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__reference = relevant_lines[0].pointer
-        index = 0
-        starting_level = relevant_lines[0].level      
-        while index < len(relevant_lines):
-            line = gedcom_lines[index]
-            if line.tag == gedcom.tags.GEDCOM_TAG_NOTE and line.level == starting_level:
-                self.__text = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_CONCATENATION and line.level == starting_level+1:
-                self.__text += line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_CONTINUED and line.level == starting_level+1:
-                self.__text = self.__text + "\n" + line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REFERENCE:
-                if gedcom_lines[index+1].tag == gedcom.tags.GEDCOM_TAG_TYPE:
-                    self.__user_reference_numbers.append((gedcom_lines[index].value, gedcom_lines[index+1].value))
-                    index += 1
-                else:
-                    self.__user_reference_numbers.append((gedcom_lines[index].value, ""))
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER:
-                self.__automated_record_id = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_NOTE and line.level == starting_level+1:
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__notes.append(note)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_SOURCE and line.level == starting_level+1:
-                source = SourceCitation()
-                parsed_lines = source.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__sources.append(source)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_DATE_CHANGE:
-                change_date = ChangeDate()
-                parsed_lines = change_date.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__change_date = change_date
-                    index += parsed_lines
-                    continue
-            elif  line.is_user_defined_tag():
-                # current implementation ignores the user defined tags
-                record = Record()
-                parsed_lines = record.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    index += len(parsed_lines)
-                    continue
-            index += 1
-        return len(relevant_lines)
-    
-    def get_gedcom_repr(self, level=0):
+    def get_raw_structures(self):
+        return self.__raw_structures
+
+    def set_raw_structures(self, value):
+        self.__raw_structures = value
+        self.mark_dirty()
+
+    def del_raw_structures(self):
+        del self.__raw_structures
+        self.mark_dirty()
+
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__reference = gedcom_lines[start].pointer
+        self.parse_lines(Note.PARSE_TABLE, gedcom_lines, start, relevant_end)
+        return relevant_end - start
+
+    def emit_gedcom_lines(self, lines, level=0):
         gedcom_repr = gf.split_text_for_gedcom(self.__text, gedcom.tags.GEDCOM_TAG_NOTE, level, gedcom.tags.MAX_TEXT_LENGTH)
-        gedcom_repr = gedcom_repr[0:gedcom_repr.find(' ')] + " " + self.__reference + " " + gedcom_repr[gedcom_repr.find(' ')+1:]
+        lines.append(gedcom_repr[0:gedcom_repr.find(' ')] + " " + self.__reference + " " + gedcom_repr[gedcom_repr.find(' ')+1:])
         for user_reference_number in self.__user_reference_numbers:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REFERENCE, user_reference_number[0])
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REFERENCE, user_reference_number[0]))
             if user_reference_number[1]:
-                gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_TYPE, user_reference_number[1])
+                lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_TYPE, user_reference_number[1]))
         if self.__automated_record_id:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id))
         if self.__change_date:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, self.__change_date.get_gedcom_repr(level+1))
+            self.__change_date.emit_gedcom_lines(lines, level+1)
         for source_citation in self.__sources:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, source_citation.get_gedcom_repr(level+1))
-        return gedcom_repr
+            source_citation.emit_gedcom_lines(lines, level+1)
+        for raw_structure in self.__raw_structures:
+            raw_structure.emit_gedcom_lines(lines, level+raw_structure.level)
     reference = property(get_reference, set_reference, del_reference, "reference's docstring")
     text = property(get_text, set_text, del_text, "text's docstring")
     user_reference_numbers = property(get_user_reference_numbers, set_user_reference_numbers, del_user_reference_numbers, "user_reference_numbers's docstring")
     automated_record_id = property(get_automated_record_id, set_automated_record_id, del_automated_record_id, "automated_record_id's docstring")
     change_date = property(get_change_date, set_change_date, del_change_date, "change_date's docstring")
+    raw_structures = property(get_raw_structures, set_raw_structures, del_raw_structures, "structures kept unparsed, as RawStructure objects")
     sources = property(get_sources, set_sources, del_sources, "sources's docstring")
 
+    # current implementation keeps unparsed the user defined tags
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_NOTE, 0, continued_value_handler("text")),
+                                    (gedcom.tags.GEDCOM_TAG_CONCATENATION, 1, concatenated_value_handler("text")),
+                                    (gedcom.tags.GEDCOM_TAG_CONTINUED, 1, concatenated_value_handler("text", "\n")),
+                                    (gedcom.tags.GEDCOM_TAG_REFERENCE, None, user_reference_number_handler),
+                                    (gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, None, value_handler("automated_record_id")),
+                                    (gedcom.tags.GEDCOM_TAG_SOURCE, 1, substructure_handler(lambda: SourceCitation(), "sources")),
+                                    (gedcom.tags.GEDCOM_TAG_DATE_CHANGE, None, substructure_handler(lambda: ChangeDate(), "change_date", append=False)),
+                                    (USER_DEFINED_TAGS, None, raw_structure_handler))
+
 
 class Repository(Record):
     def __init__(self):
@@ -1492,6 +1802,7 @@ class Repository(Record):
         self.__user_reference_numbers = []
         self.__automated_record_id = ""
         self.__change_date = None
+        self.__raw_structures = []
         super().__init__()
 
     def get_reference(self):
@@ -1517,112 +1828,94 @@ class Repository(Record):
 
     def set_reference(self, value):
         self.__reference = value
+        self.mark_dirty()
 
     def set_repository_name(self, value):
         self.__repository_name = value
+        self.mark_dirty()
 
     def set_address(self, value):
         self.__address = value
+        self.mark_dirty()
 
     def set_notes(self, value):
         self.__notes = value
+        self.mark_dirty()
 
     def set_user_reference_numbers(self, value):
         self.__user_reference_numbers = value
+        self.mark_dirty()
 
     def set_automated_record_id(self, value):
         self.__automated_record_id = value
+        self.mark_dirty()
 
     def set_change_date(self, value):
         self.__change_date = value
+        self.mark_dirty()
 
     def del_reference(self):
         del self.__reference
+        self.mark_dirty()
 
     def del_repository_name(self):
         del self.__repository_name
+        self.mark_dirty()
 
     def del_address(self):
         del self.__address
+        self.mark_dirty()
 
     def del_notes(self):
         del self.__notes
+        self.mark_dirty()
 
     def del_user_reference_numbers(self):
         del self.__user_reference_numbers
+        self.mark_dirty()
 
     def del_automated_record_id(self):
         del self.__automated_record_id
+        self.mark_dirty()
 
     def del_change_date(self):
         del self.__change_date
+        self.mark_dirty()
     
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__reference = relevant_lines[0].pointer
-        index = 0
-        starting_level = relevant_lines[0].level      
-        while index < len(relevant_lines):
-            line = gedcom_lines[index]
-            if line.tag == gedcom.tags.GEDCOM_TAG_NAME and line.level == starting_level+1:
-                self.__repository_name = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_ADDRESS and line.level == starting_level+1:
-                address = AddressStructure()
-                parsed_lines = address.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__address = address
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_NOTE and line.level == starting_level+1:
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__notes.append(note)
-                    index += parsed_lines
-                    continue    
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REFERENCE:
-                if gedcom_lines[index+1].tag == gedcom.tags.GEDCOM_TAG_TYPE:
-                    self.__user_reference_numbers.append((gedcom_lines[index].value, gedcom_lines[index+1].value))
-                    index += 1
-                else:
-                    self.__user_reference_numbers.append((gedcom_lines[index].value, ""))
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER:
-                self.__automated_record_id = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER and line.level == starting_level+1:
-                self.__automated_record_id = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_DATE_CHANGE:
-                change_date = ChangeDate()
-                parsed_lines = change_date.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__change_date = change_date
-                    index += parsed_lines
-                    continue
-            elif  line.is_user_defined_tag():
-                # current implementation ignores the user defined tags
-                record = Record()
-                parsed_lines = record.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    index += len(parsed_lines)
-                    continue
-            index += 1
-        return len(relevant_lines)
-    
-    def get_gedcom_repr(self, level=0):
-        gedcom_repr = "%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_REPOSITORY)
-        gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_NAME, self.__repository_name)
+    def get_raw_structures(self):
+        return self.__raw_structures
+
+    def set_raw_structures(self, value):
+        self.__raw_structures = value
+        self.mark_dirty()
+
+    def del_raw_structures(self):
+        del self.__raw_structures
+        self.mark_dirty()
+
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__reference = gedcom_lines[start].pointer
+        self.parse_lines(Repository.PARSE_TABLE, gedcom_lines, start, relevant_end)
+        return relevant_end - start
+
+    def emit_gedcom_lines(self, lines, level=0):
+        lines.append("%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_REPOSITORY))
+        lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_NAME, self.__repository_name))
         if self.__address:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, self.__address.get_gedcom_repr(level+1))
+            self.__address.emit_gedcom_lines(lines, level+1)
         for note_structure in self.__notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note_structure.get_gedcom_repr(level+1))
+            note_structure.emit_gedcom_lines(lines, level+1)
         for user_reference_number in self.__user_reference_numbers:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REFERENCE, user_reference_number[0])
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REFERENCE, user_reference_number[0]))
             if user_reference_number[1]:
-                gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_TYPE, user_reference_number[1])
+                lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_TYPE, user_reference_number[1]))
         if self.__automated_record_id:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id))
         if self.__change_date:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, self.__change_date.get_gedcom_repr(level+1))
-        return gedcom_repr
+            self.__change_date.emit_gedcom_lines(lines, level+1)
+        for raw_structure in self.__raw_structures:
+            raw_structure.emit_gedcom_lines(lines, level+raw_structure.level)
     reference = property(get_reference, set_reference, del_reference, "reference's docstring")
     repository_name = property(get_repository_name, set_repository_name, del_repository_name, "repository_name's docstring")
     address = property(get_address, set_address, del_address, "address's docstring")
@@ -1630,6 +1923,16 @@ class Repository(Record):
     user_reference_numbers = property(get_user_reference_numbers, set_user_reference_numbers, del_user_reference_numbers, "user_reference_numbers's docstring")
     automated_record_id = property(get_automated_record_id, set_automated_record_id, del_automated_record_id, "automated_record_id's docstring")
     change_date = property(get_change_date, set_change_date, del_change_date, "change_date's docstring")
+    raw_structures = property(get_raw_structures, set_raw_structures, del_raw_structures, "structures kept unparsed, as RawStructure objects")
+
+    # current implementation keeps unparsed the user defined tags
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_NAME, 1, value_handler("repository_name")),
+                                    (gedcom.tags.GEDCOM_TAG_ADDRESS, 1, substructure_handler(lambda: AddressStructure(), "address", append=False)),
+                                    (gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "notes")),
+                                    (gedcom.tags.GEDCOM_TAG_REFERENCE, None, user_reference_number_handler),
+                                    (gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, None, value_handler("automated_record_id")),
+                                    (gedcom.tags.GEDCOM_TAG_DATE_CHANGE, None, substructure_handler(lambda: ChangeDate(), "change_date", append=False)),
+                                    (USER_DEFINED_TAGS, None, raw_structure_handler))
 
 
 class SourceEvent(Record):
@@ -1650,47 +1953,47 @@ class SourceEvent(Record):
 
     def set_event_recorded(self, value):
         self.__event_recorded = value
+        self.mark_dirty()
 
     def set_event_date(self, value):
         self.__event_date = value
+        self.mark_dirty()
 
     def set_event_place(self, value):
         self.__event_place = value
+        self.mark_dirty()
 
     def del_event_recorded(self):
         del self.__event_recorded
+        self.mark_dirty()
 
     def del_event_date(self):
         del self.__event_date
+        self.mark_dirty()
 
     def del_event_place(self):
         del self.__event_place
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        index = 0
-        while index < len(relevant_lines):
-            line = gedcom_lines[index]
-            if line.tag == gedcom.tags.GEDCOM_TAG_EVENT:
-                self.__event_recorded = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_DATE:
-                self.__event_date = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_PLACE:
-                self.__event_place = line.value
-            index += 1
-        return len(relevant_lines)
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.parse_lines(SourceEvent.PARSE_TABLE, gedcom_lines, start, relevant_end)
+        return relevant_end - start
 
-    def get_gedcom_repr(self, level):
-        gedcom_repr = "%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_EVENT, self.__event_recorded)
+    def emit_gedcom_lines(self, lines, level):
+        lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_EVENT, self.__event_recorded))
         if self.__event_date:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_DATE, self.__event_date)     
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_DATE, self.__event_date))
         if self.__event_place:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_PLACE, self.__event_place)
-        return gedcom_repr 
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_PLACE, self.__event_place))
     event_recorded = property(get_event_recorded, set_event_recorded, del_event_recorded, "event_recorded's docstring")
     event_date = property(get_event_date, set_event_date, del_event_date, "event_date's docstring")
     event_place = property(get_event_place, set_event_place, del_event_place, "event_place's docstring")
 
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_EVENT, None, value_handler("event_recorded")),
+                                    (gedcom.tags.GEDCOM_TAG_DATE, None, value_handler("event_date")),
+                                    (gedcom.tags.GEDCOM_TAG_PLACE, None, value_handler("event_place")))
+
 
 class Source(Record):
     def __init__(self):
@@ -1710,6 +2013,7 @@ class Source(Record):
         self.__change_date = None
         self.__notes = []
         self.__multimedia_links = []
+        self.__raw_structures = []
         super().__init__()
 
     def get_reference(self):
@@ -1762,245 +2066,188 @@ class Source(Record):
 
     def set_reference(self, value):
         self.__reference = value
+        self.mark_dirty()
 
     def set_data_tag(self, value):
         self.__data_tag = value
+        self.mark_dirty()
 
     def set_data_events(self, value):
         self.__data_events = value
+        self.mark_dirty()
 
     def set_data_responsible_agency(self, value):
         self.__data_responsible_agency = value
+        self.mark_dirty()
 
     def set_data_notes(self, value):
         self.__data_notes = value
+        self.mark_dirty()
 
     def set_source_originator(self, value):
         self.__source_originator = value
+        self.mark_dirty()
 
     def set_source_title(self, value):
         self.__source_title = value
+        self.mark_dirty()
 
     def set_source_filled_by(self, value):
         self.__source_filled_by = value
+        self.mark_dirty()
 
     def set_source_publication_facts(self, value):
         self.__source_publication_facts = value
+        self.mark_dirty()
 
     def set_text_from_source(self, value):
         self.__text_from_source = value
+        self.mark_dirty()
 
     def set_source_repository_citations(self, value):
         self.__source_repository_citations = value
+        self.mark_dirty()
 
     def set_user_reference_numbers(self, value):
         self.__user_reference_numbers = value
+        self.mark_dirty()
 
     def set_automated_record_id(self, value):
         self.__automated_record_id = value
+        self.mark_dirty()
 
     def set_change_date(self, value):
         self.__change_date = value
+        self.mark_dirty()
 
     def set_notes(self, value):
         self.__notes = value
+        self.mark_dirty()
 
     def set_multimedia_links(self, value):
         self.__multimedia_links = value
+        self.mark_dirty()
 
     def del_reference(self):
         del self.__reference
+        self.mark_dirty()
 
     def del_data_tag(self):
         del self.__data_tag
+        self.mark_dirty()
 
     def del_data_events(self):
         del self.__data_events
+        self.mark_dirty()
 
     def del_data_responsible_agency(self):
         del self.__data_responsible_agency
+        self.mark_dirty()
 
     def del_data_notes(self):
         del self.__data_notes
+        self.mark_dirty()
 
     def del_source_originator(self):
         del self.__source_originator
+        self.mark_dirty()
 
     def del_source_title(self):
         del self.__source_title
+        self.mark_dirty()
 
     def del_source_filled_by(self):
         del self.__source_filled_by
+        self.mark_dirty()
 
     def del_source_publication_facts(self):
         del self.__source_publication_facts
+        self.mark_dirty()
 
     def del_text_from_source(self):
         del self.__text_from_source
+        self.mark_dirty()
 
     def del_source_repository_citations(self):
         del self.__source_repository_citations
+        self.mark_dirty()
 
     def del_user_reference_numbers(self):
         del self.__user_reference_numbers
+        self.mark_dirty()
 
     def del_automated_record_id(self):
         del self.__automated_record_id
+        self.mark_dirty()
 
     def del_change_date(self):
         del self.__change_date
+        self.mark_dirty()
 
     def del_notes(self):
         del self.__notes
+        self.mark_dirty()
 
     def del_multimedia_links(self):
         del self.__multimedia_links
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__reference = relevant_lines[0].pointer
-        index = 0
-        starting_level = relevant_lines[0].level      
-        while index < len(relevant_lines):
-            line = gedcom_lines[index]
-            tag = line.tag
-            level = line.level
-            if tag == gedcom.tags.GEDCOM_TAG_DATA and level == starting_level+1:
-                scope = gedcom.tags.GEDCOM_TAG_DATA
-                self.__data_tag = "Y"
-            elif tag == gedcom.tags.GEDCOM_TAG_EVENT and scope == gedcom.tags.GEDCOM_TAG_DATA:
-                source_event = SourceEvent()
-                parsed_lines = source_event.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__data_events.append(source_event)
-                    index += parsed_lines
-                    continue
-            elif tag == gedcom.tags.GEDCOM_TAG_AGENCY and scope == gedcom.tags.GEDCOM_TAG_DATA and level == starting_level+2:
-                self.__data_responsible_agency = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_NOTE and scope == gedcom.tags.GEDCOM_TAG_DATA and level == starting_level+2:
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__data_notes.append(note)
-                    index += parsed_lines
-                    continue
-            elif tag == gedcom.tags.GEDCOM_TAG_AUTHOR and level == starting_level+1:
-                scope = gedcom.tags.GEDCOM_TAG_AUTHOR
-                self.__source_originator = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CONCATENATION and scope == gedcom.tags.GEDCOM_TAG_AUTHOR and level == starting_level+2:
-                self.__source_originator += line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CONTINUED and scope == gedcom.tags.GEDCOM_TAG_AUTHOR and level == starting_level+2:
-                self.__source_originator = self.__source_originator + "\n" + line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_TITLE and level == starting_level+1:
-                scope = gedcom.tags.GEDCOM_TAG_TITLE
-                self.__source_title = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CONCATENATION and scope == gedcom.tags.GEDCOM_TAG_TITLE and level == starting_level+2:
-                self.__source_title += line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CONTINUED and scope == gedcom.tags.GEDCOM_TAG_TITLE and level == starting_level+2:
-                self.__source_title = self.__source_title + "\n" + line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_PUBLICATION and level == starting_level+1:
-                scope = gedcom.tags.GEDCOM_TAG_PUBLICATION
-                self.__source_publication_facts = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CONCATENATION and scope == gedcom.tags.GEDCOM_TAG_PUBLICATION and level == starting_level+2:
-                self.__source_publication_facts += line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CONTINUED and scope == gedcom.tags.GEDCOM_TAG_PUBLICATION and level == starting_level+2:
-                self.__source_publication_facts = self.__source_publication_facts + "\n" + line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_NAME_ABBREVIATION and level == starting_level+1:
-                self.__source_filled_by = line.value
-                scope = ""
-            elif tag == gedcom.tags.GEDCOM_TAG_TEXT and level == starting_level+1:
-                scope = gedcom.tags.GEDCOM_TAG_TEXT
-                self.__text_from_source = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CONCATENATION and scope == gedcom.tags.GEDCOM_TAG_TEXT and level == starting_level+2:
-                self.__text_from_source += line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_CONTINUED and scope == gedcom.tags.GEDCOM_TAG_TEXT and level == starting_level+2:
-                self.__text_from_source = self.__text_from_source + "\n" + line.value
-            elif line.get_tag() == gedcom.tags.GEDCOM_TAG_SOURCE and line.value == starting_level+1:
-                scope = ""
-                source = SourceCitation()
-                parsed_lines = source.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__sources.append(source)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REFERENCE:
-                if gedcom_lines[index+1].tag == gedcom.tags.GEDCOM_TAG_TYPE:
-                    self.__user_reference_numbers.append((gedcom_lines[index].value, gedcom_lines[index+1].value))
-                    index += 1
-                else:
-                    self.__user_reference_numbers.append((gedcom_lines[index].value, ""))
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER:
-                scope = ""
-                self.__automated_record_id = line.value    
-            elif line.get_tag() == gedcom.tags.GEDCOM_TAG_NOTE and line.get_level() == starting_level+1:
-                scope = ""
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__notes.append(note)
-                    index += parsed_lines
-                    continue
-            elif tag == gedcom.tags.GEDCOM_TAG_DATE_CHANGE:
-                scope = ""
-                change_date = ChangeDate()
-                parsed_lines = change_date.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__change_date = change_date
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_OBJECT and line.level == starting_level+1:
-                scope = ""
-                multimedia = MultimediaLink()
-                parsed_lines = multimedia.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__multimedia_links.append(multimedia)
-                    index += parsed_lines
-                    continue 
-            elif  line.is_user_defined_tag():
-                # current implementation ignores the user defined tags
-                record = Record()
-                parsed_lines = record.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    index += len(parsed_lines)
-                    continue
-            index += 1
-        return len(relevant_lines)
+    def get_raw_structures(self):
+        return self.__raw_structures
+
+    def set_raw_structures(self, value):
+        self.__raw_structures = value
+        self.mark_dirty()
+
+    def del_raw_structures(self):
+        del self.__raw_structures
+        self.mark_dirty()
+
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__reference = gedcom_lines[start].pointer
+        self.parse_scoped_lines(Source.PARSE_TABLE, Source.SCOPED_PARSE_TABLES, gedcom_lines, start, relevant_end)
+        return relevant_end - start
+
+    def __parse_data(self, gedcom_lines, index, end):
+        self.__data_tag = "Y"
     
-    def get_gedcom_repr(self, level=0):
-        gedcom_repr = "%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_SOURCE)
+    def emit_gedcom_lines(self, lines, level=0):
+        lines.append("%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_SOURCE))
         if self.__data_tag:
-            gedcom_repr = "%s\n%s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_DATA)
+            lines.append("%s %s" % (level+1, gedcom.tags.GEDCOM_TAG_DATA))
         for source_event in self.__data_events:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, source_event.get_gedcom_repr(level+2))
+            source_event.emit_gedcom_lines(lines, level+2)
         if self.__data_responsible_agency:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_AGENCY, self.__data_responsible_agency)
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_AGENCY, self.__data_responsible_agency))
         for note in self.__data_notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note.get_gedcom_repr(level+2))
+            note.emit_gedcom_lines(lines, level+2)
         if self.__source_originator:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, gf.split_text_for_gedcom(self.__source_originator, gedcom.tags.GEDCOM_TAG_AUTHOR, level+1, gedcom.tags.MAX_TEXT_LENGTH))
+            lines.append(gf.split_text_for_gedcom(self.__source_originator, gedcom.tags.GEDCOM_TAG_AUTHOR, level+1, gedcom.tags.MAX_TEXT_LENGTH))
         if self.__source_title:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, gf.split_text_for_gedcom(self.__source_title, gedcom.tags.GEDCOM_TAG_TITLE, level+1, gedcom.tags.MAX_TEXT_LENGTH))
+            lines.append(gf.split_text_for_gedcom(self.__source_title, gedcom.tags.GEDCOM_TAG_TITLE, level+1, gedcom.tags.MAX_TEXT_LENGTH))
         if self.__source_filled_by:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_NAME_ABBREVIATION, self.__source_filled_by)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_NAME_ABBREVIATION, self.__source_filled_by))
         if self.__source_publication_facts:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, gf.split_text_for_gedcom(self.__source_publication_facts, gedcom.tags.GEDCOM_TAG_PUBLICATION, level+1, gedcom.tags.MAX_TEXT_LENGTH))
+            lines.append(gf.split_text_for_gedcom(self.__source_publication_facts, gedcom.tags.GEDCOM_TAG_PUBLICATION, level+1, gedcom.tags.MAX_TEXT_LENGTH))
         if self.__text_from_source:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, gf.split_text_for_gedcom(self.__text_from_source, gedcom.tags.GEDCOM_TAG_TEXT, level+1, gedcom.tags.MAX_TEXT_LENGTH))
+            lines.append(gf.split_text_for_gedcom(self.__text_from_source, gedcom.tags.GEDCOM_TAG_TEXT, level+1, gedcom.tags.MAX_TEXT_LENGTH))
         for source in self.__source_repository_citations:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, source.get_gedcom_repr(level+1))
+            source.emit_gedcom_lines(lines, level+1)
         for user_reference_number in self.__user_reference_numbers:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REFERENCE, user_reference_number[0])
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REFERENCE, user_reference_number[0]))
             if user_reference_number[1]:
-                gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_TYPE, user_reference_number[1])
+                lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_TYPE, user_reference_number[1]))
         if self.__automated_record_id:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id))
         if self.__change_date:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, self.__change_date.get_gedcom_repr(level+1))
+            self.__change_date.emit_gedcom_lines(lines, level+1)
         for note_structure in self.__notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note_structure.get_gedcom_repr(level+1))
+            note_structure.emit_gedcom_lines(lines, level+1)
         for multimedia_link in self.__multimedia_links:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, multimedia_link.get_gedcom_repr(level+1))
-        return gedcom_repr
+            multimedia_link.emit_gedcom_lines(lines, level+1)
+        for raw_structure in self.__raw_structures:
+            raw_structure.emit_gedcom_lines(lines, level+raw_structure.level)
     reference = property(get_reference, set_reference, del_reference, "reference's docstring")
     data_tag = property(get_data_tag, set_data_tag, del_data_tag, "data_tag's docstring")
     data_events = property(get_data_events, set_data_events, del_data_events, "data_events's docstring")
@@ -2016,8 +2263,41 @@ class Source(Record):
     automated_record_id = property(get_automated_record_id, set_automated_record_id, del_automated_record_id, "automated_record_id's docstring")
     change_date = property(get_change_date, set_change_date, del_change_date, "change_date's docstring")
     notes = property(get_notes, set_notes, del_notes, "notes's docstring")
+    raw_structures = property(get_raw_structures, set_raw_structures, del_raw_structures, "structures kept unparsed, as RawStructure objects")
     multimedia_links = property(get_multimedia_links, set_multimedia_links, del_multimedia_links, "multimedia_links's docstring")
 
+    # each line in PARSE_TABLE opens the scope of its tag; SOUR and REPO lines are not parsed by current implementation
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_DATA, 1, __parse_data),
+                                    (gedcom.tags.GEDCOM_TAG_AUTHOR, 1, continued_value_handler("source_originator")),
+                                    (gedcom.tags.GEDCOM_TAG_TITLE, 1, continued_value_handler("source_title")),
+                                    (gedcom.tags.GEDCOM_TAG_PUBLICATION, 1, continued_value_handler("source_publication_facts")),
+                                    (gedcom.tags.GEDCOM_TAG_NAME_ABBREVIATION, 1, value_handler("source_filled_by")),
+                                    (gedcom.tags.GEDCOM_TAG_TEXT, 1, continued_value_handler("text_from_source")),
+                                    (gedcom.tags.GEDCOM_TAG_REFERENCE, None, user_reference_number_handler),
+                                    (gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, None, value_handler("automated_record_id")),
+                                    (gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "notes")),
+                                    (gedcom.tags.GEDCOM_TAG_DATE_CHANGE, None, substructure_handler(lambda: ChangeDate(), "change_date", append=False)),
+                                    (gedcom.tags.GEDCOM_TAG_OBJECT, 1, substructure_handler(lambda: MultimediaLink(), "multimedia_links")),
+                                    (USER_DEFINED_TAGS, None, raw_structure_handler))
+
+    # lines parsed only in the scope of a DATA, AUTH, TITL, PUBL or TEXT line
+    SCOPED_PARSE_TABLES = {gedcom.tags.GEDCOM_TAG_DATA: 
+                               build_parse_table((gedcom.tags.GEDCOM_TAG_EVENT, None, substructure_handler(lambda: SourceEvent(), "data_events")),
+                                                 (gedcom.tags.GEDCOM_TAG_AGENCY, 2, value_handler("data_responsible_agency")),
+                                                 (gedcom.tags.GEDCOM_TAG_NOTE, 2, substructure_handler(lambda: NoteStructure(), "data_notes"))),
+                           gedcom.tags.GEDCOM_TAG_AUTHOR: 
+                               build_parse_table((gedcom.tags.GEDCOM_TAG_CONCATENATION, 2, concatenated_value_handler("source_originator")),
+                                                 (gedcom.tags.GEDCOM_TAG_CONTINUED, 2, concatenated_value_handler("source_originator", "\n"))),
+                           gedcom.tags.GEDCOM_TAG_TITLE: 
+                               build_parse_table((gedcom.tags.GEDCOM_TAG_CONCATENATION, 2, concatenated_value_handler("source_title")),
+                                                 (gedcom.tags.GEDCOM_TAG_CONTINUED, 2, concatenated_value_handler("source_title", "\n"))),
+                           gedcom.tags.GEDCOM_TAG_PUBLICATION: 
+                               build_parse_table((gedcom.tags.GEDCOM_TAG_CONCATENATION, 2, concatenated_value_handler("source_publication_facts")),
+                                                 (gedcom.tags.GEDCOM_TAG_CONTINUED, 2, concatenated_value_handler("source_publication_facts", "\n"))),
+                           gedcom.tags.GEDCOM_TAG_TEXT: 
+                               build_parse_table((gedcom.tags.GEDCOM_TAG_CONCATENATION, 2, concatenated_value_handler("text_from_source")),
+                                                 (gedcom.tags.GEDCOM_TAG_CONTINUED, 2, concatenated_value_handler("text_from_source", "\n")))}
+
 
 class Submission(Record):
     def __init__(self):
@@ -2065,130 +2345,110 @@ class Submission(Record):
 
     def set_reference(self, value):
         self.__reference = value
+        self.mark_dirty()
 
     def set_submitter_reference(self, value):
         self.__submitter_reference = value
+        self.mark_dirty()
 
     def set_family_file(self, value):
         self.__family_file = value
+        self.mark_dirty()
 
     def set_temple_code(self, value):
         self.__temple_code = value
+        self.mark_dirty()
 
     def set_ancestors_generations(self, value):
         self.__ancestors_generations = value
+        self.mark_dirty()
 
     def set_descendands_generations(self, value):
         self.__descendands_generations = value
+        self.mark_dirty()
 
     def set_ordinance_process_flag(self, value):
         self.__ordinance_process_flag = value
+        self.mark_dirty()
 
     def set_automaed_record_id(self, value):
         self.__automaed_record_id = value
+        self.mark_dirty()
 
     def set_notes(self, value):
         self.__notes = value
+        self.mark_dirty()
 
     def set_change_date(self, value):
         self.__change_date = value
+        self.mark_dirty()
 
     def del_reference(self):
         del self.__reference
+        self.mark_dirty()
 
     def del_submitter_reference(self):
         del self.__submitter_reference
+        self.mark_dirty()
 
     def del_family_file(self):
         del self.__family_file
+        self.mark_dirty()
 
     def del_temple_code(self):
         del self.__temple_code
+        self.mark_dirty()
 
     def del_ancestors_generations(self):
         del self.__ancestors_generations
+        self.mark_dirty()
 
     def del_descendands_generations(self):
         del self.__descendands_generations
+        self.mark_dirty()
 
     def del_ordinance_process_flag(self):
         del self.__ordinance_process_flag
+        self.mark_dirty()
 
     def del_automaed_record_id(self):
         del self.__automaed_record_id
+        self.mark_dirty()
 
     def del_notes(self):
         del self.__notes
+        self.mark_dirty()
 
     def del_change_date(self):
         del self.__change_date
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__reference = relevant_lines[0].pointer
-        index = 0
-        starting_level = relevant_lines[0].level
-        while index < len(relevant_lines):
-            line = gedcom_lines[index]
-            if line.tag == gedcom.tags.GEDCOM_TAG_SUBMITTER:
-                self.__submitter_reference = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_FAMILY_FILE:
-                self.__family_file = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_LSD_TEMPLE:
-                self.__temple_code = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_ANCESTORS:
-                self.__ancestors_generations = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_DESCENDANTS:
-                self.__descendands_generations = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_ORDINANCE:
-                self.__ordinance_process_flag = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER:
-                self.__automaed_record_id = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_NOTE and line.level == starting_level+1:
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__notes.append(note)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_DATE_CHANGE and line.level == starting_level+1:
-                change_date = ChangeDate()
-                parsed_lines = change_date.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__change_date = change_date
-                    index += parsed_lines
-                    continue
-            elif  line.is_user_defined_tag():
-                # current implementation ignores the user defined tags
-                record = Record()
-                parsed_lines = record.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    index += len(parsed_lines)
-                    continue
-            index += 1
-        return len(relevant_lines)
-    
-    def get_gedcom_repr(self, level=0):
-        gedcom_repr = "%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_SUBMISSION)
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__reference = gedcom_lines[start].pointer
+        self.parse_lines(Submission.PARSE_TABLE, gedcom_lines, start, relevant_end)
+        return relevant_end - start
+
+    def emit_gedcom_lines(self, lines, level=0):
+        lines.append("%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_SUBMISSION))
         if self.__submitter_reference:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_SUBMITTER, self.__submitter_reference)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_SUBMITTER, self.__submitter_reference))
         if self.__family_file:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_FAMILY_FILE, self.__family_file)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_FAMILY_FILE, self.__family_file))
         if self.__temple_code:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_LSD_TEMPLE, self.__temple_code)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_LSD_TEMPLE, self.__temple_code))
         if self.__ancestors_generations:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_ANCESTORS, self.__ancestors_generations)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_ANCESTORS, self.__ancestors_generations))
         if self.__descendands_generations:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_DESCENDANTS, self.__descendands_generations)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_DESCENDANTS, self.__descendands_generations))
         if self.__ordinance_process_flag:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_ORDINANCE, self.__ordinance_process_flag)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_ORDINANCE, self.__ordinance_process_flag))
         if self.__automaed_record_id:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automaed_record_id)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automaed_record_id))
         for note in self.__notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note.get_gedcom_repr(level+1))
+            note.emit_gedcom_lines(lines, level+1)
         if self.__change_date:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, self.__change_date.get_gedcom_repr(level+1))
-        return gedcom_repr.strip()
+            self.__change_date.emit_gedcom_lines(lines, level+1)
     reference = property(get_reference, set_reference, del_reference, "reference's docstring")
     submitter_reference = property(get_submitter_reference, set_submitter_reference, del_submitter_reference, "submitter_reference's docstring")
     family_file = property(get_family_file, set_family_file, del_family_file, "family_file's docstring")
@@ -2200,6 +2460,18 @@ class Submission(Record):
     notes = property(get_notes, set_notes, del_notes, "notes's docstring")
     change_date = property(get_change_date, set_change_date, del_change_date, "change_date's docstring")
 
+    # current implementation ignores the user defined tags
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_SUBMITTER, None, value_handler("submitter_reference")),
+                                    (gedcom.tags.GEDCOM_TAG_FAMILY_FILE, None, value_handler("family_file")),
+                                    (gedcom.tags.GEDCOM_TAG_LSD_TEMPLE, None, value_handler("temple_code")),
+                                    (gedcom.tags.GEDCOM_TAG_ANCESTORS, None, value_handler("ancestors_generations")),
+                                    (gedcom.tags.GEDCOM_TAG_DESCENDANTS, None, value_handler("descendands_generations")),
+                                    (gedcom.tags.GEDCOM_TAG_ORDINANCE, None, value_handler("ordinance_process_flag")),
+                                    (gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, None, value_handler("automaed_record_id")),
+                                    (gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "notes")),
+                                    (gedcom.tags.GEDCOM_TAG_DATE_CHANGE, 1, substructure_handler(lambda: ChangeDate(), "change_date", append=False)),
+                                    (USER_DEFINED_TAGS, None, ignored_structure_handler))
+
 
 class Submitter(Record):
     def __init__(self):
@@ -2243,129 +2515,99 @@ class Submitter(Record):
 
     def set_reference(self, value):
         self.__reference = value
+        self.mark_dirty()
 
     def set_submitter_name(self, value):
         self.__submitter_name = value
+        self.mark_dirty()
 
     def set_address(self, value):
         self.__address = value
+        self.mark_dirty()
 
     def set_multimedia_links(self, value):
         self.__multimedia_links = value
+        self.mark_dirty()
 
     def set_language_preferences(self, value):
         self.__language_preferences = value
+        self.mark_dirty()
 
     def set_submitter_registered_rfn(self, value):
         self.__submitter_registered_rfn = value
+        self.mark_dirty()
 
     def set_automated_record_id(self, value):
         self.__automated_record_id = value
+        self.mark_dirty()
 
     def set_notes(self, value):
         self.__notes = value
+        self.mark_dirty()
 
     def set_change_date(self, value):
         self.__change_date = value
+        self.mark_dirty()
 
     def del_reference(self):
         del self.__reference
+        self.mark_dirty()
 
     def del_submitter_name(self):
         del self.__submitter_name
+        self.mark_dirty()
 
     def del_address(self):
         del self.__address
+        self.mark_dirty()
 
     def del_multimedia_links(self):
         del self.__multimedia_links
+        self.mark_dirty()
 
     def del_language_preferences(self):
         del self.__language_preferences
+        self.mark_dirty()
 
     def del_submitter_registered_rfn(self):
         del self.__submitter_registered_rfn
+        self.mark_dirty()
 
     def del_automated_record_id(self):
         del self.__automated_record_id
+        self.mark_dirty()
 
     def del_notes(self):
         del self.__notes
+        self.mark_dirty()
 
     def del_change_date(self):
         del self.__change_date
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__reference = relevant_lines[0].pointer
-        index = 0
-        starting_level = relevant_lines[0].level
-        while index < len(relevant_lines):
-            line = gedcom_lines[index]
-            if line.tag == gedcom.tags.GEDCOM_TAG_NAME and line.level == starting_level+1:
-                self.__submitter_name = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_ADDRESS and line.level == starting_level+1:
-                address = AddressStructure()
-                parsed_lines = address.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__address = address
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_OBJECT and line.level == starting_level+1:
-                multimedia = MultimediaLink()
-                parsed_lines = multimedia.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__multimedia_links.append(multimedia)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_LANGUAGE and line.level == starting_level+1:
-                self.__language_preferences.append(line.value)
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REC_FILE_NUMBER and line.level == starting_level+1:
-                self.__submitter_registered_rfn = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER and line.level == starting_level+1:
-                self.__automated_record_id = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_NOTE and line.level == starting_level+1:
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__notes.append(note)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_DATE_CHANGE:
-                change_date = ChangeDate()
-                parsed_lines = change_date.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__change_date = change_date
-                    index += parsed_lines
-                    continue
-            elif  line.is_user_defined_tag():
-                # current implementation ignores the user defined tags
-                record = Record()
-                parsed_lines = record.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    index += len(parsed_lines)
-                    continue
-            index += 1
-        return len(relevant_lines)
-    
-    def get_gedcom_repr(self, level=0):
-        gedcom_repr = "%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_SUBMITTER)
-        gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_NAME, self.__submitter_name)
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__reference = gedcom_lines[start].pointer
+        self.parse_lines(Submitter.PARSE_TABLE, gedcom_lines, start, relevant_end)
+        return relevant_end - start
+
+    def emit_gedcom_lines(self, lines, level=0):
+        lines.append("%s %s %s" % (level, self.__reference, gedcom.tags.GEDCOM_TAG_SUBMITTER))
+        lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_NAME, self.__submitter_name))
         if self.__address:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, self.__address.get_gedcom_repr(level+1))
+            self.__address.emit_gedcom_lines(lines, level+1)
         for multimedia_link in self.__multimedia_links:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, multimedia_link.get_gedcom_repr(level+1))
+            multimedia_link.emit_gedcom_lines(lines, level+1)
         for language in self.__language_preferences:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_LANGUAGE, language)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_LANGUAGE, language))
         if self.__submitter_registered_rfn:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REC_FILE_NUMBER, self.__submitter_registered_rfn)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REC_FILE_NUMBER, self.__submitter_registered_rfn))
         if self.__automated_record_id:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, self.__automated_record_id))
         for note_structure in self.__notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note_structure.get_gedcom_repr(level+1))
+            note_structure.emit_gedcom_lines(lines, level+1)
         if self.__change_date:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, self.__change_date.get_gedcom_repr(level+1))
-        return gedcom_repr
+            self.__change_date.emit_gedcom_lines(lines, level+1)
     reference = property(get_reference, set_reference, del_reference, "reference's docstring")
     submitter_name = property(get_submitter_name, set_submitter_name, del_submitter_name, "submitter_name's docstring")
     address = property(get_address, set_address, del_address, "address's docstring")
@@ -2376,6 +2618,17 @@ class Submitter(Record):
     notes = property(get_notes, set_notes, del_notes, "notes's docstring")
     change_date = property(get_change_date, set_change_date, del_change_date, "change_date's docstring")
 
+    # current implementation ignores the user defined tags
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_NAME, 1, value_handler("submitter_name")),
+                                    (gedcom.tags.GEDCOM_TAG_ADDRESS, 1, substructure_handler(lambda: AddressStructure(), "address", append=False)),
+                                    (gedcom.tags.GEDCOM_TAG_OBJECT, 1, substructure_handler(lambda: MultimediaLink(), "multimedia_links")),
+                                    (gedcom.tags.GEDCOM_TAG_LANGUAGE, 1, appended_value_handler("language_preferences")),
+                                    (gedcom.tags.GEDCOM_TAG_REC_FILE_NUMBER, 1, value_handler("submitter_registered_rfn")),
+                                    (gedcom.tags.GEDCOM_TAG_REC_ID_NUMBER, 1, value_handler("automated_record_id")),
+                                    (gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "notes")),
+                                    (gedcom.tags.GEDCOM_TAG_DATE_CHANGE, None, substructure_handler(lambda: ChangeDate(), "change_date", append=False)),
+                                    (USER_DEFINED_TAGS, None, ignored_structure_handler))
+
 
 # Substructures
 class AddressStructure(Record):
@@ -2432,137 +2685,135 @@ class AddressStructure(Record):
 
     def set_address_line(self, value):
         self.__address_line = value
+        self.mark_dirty()
 
     def set_address_line_1(self, value):
         self.__address_line1 = value
+        self.mark_dirty()
 
     def set_address_line_2(self, value):
         self.__address_line2 = value
+        self.mark_dirty()
 
     def set_address_line_3(self, value):
         self.__address_line3 = value
+        self.mark_dirty()
 
     def set_address_city(self, value):
         self.__address_city = value
+        self.mark_dirty()
 
     def set_address_state(self, value):
         self.__address_state = value
+        self.mark_dirty()
 
     def set_address_postal_code(self, value):
         self.__address_postal_code = value
+        self.mark_dirty()
 
     def set_address_country(self, value):
         self.__address_country = value
+        self.mark_dirty()
 
     def set_phone_number(self, value):
         self.__phone_number = value
+        self.mark_dirty()
 
     def set_address_email(self, value):
         self.__address_email = value
+        self.mark_dirty()
 
     def set_address_fax(self, value):
         self.__address_fax = value
+        self.mark_dirty()
 
     def set_address_web_page(self, value):
         self.__address_web_page = value
+        self.mark_dirty()
 
     def del_address_line(self):
         del self.__address_line
+        self.mark_dirty()
 
     def del_address_line_1(self):
         del self.__address_line1
+        self.mark_dirty()
 
     def del_address_line_2(self):
         del self.__address_line2
+        self.mark_dirty()
 
     def del_address_line_3(self):
         del self.__address_line3
+        self.mark_dirty()
 
     def del_address_city(self):
         del self.__address_city
+        self.mark_dirty()
 
     def del_address_state(self):
         del self.__address_state
+        self.mark_dirty()
 
     def del_address_postal_code(self):
         del self.__address_postal_code
+        self.mark_dirty()
 
     def del_address_country(self):
         del self.__address_country
+        self.mark_dirty()
 
     def del_phone_number(self):
         del self.__phone_number
+        self.mark_dirty()
 
     def del_address_email(self):
         del self.__address_email
+        self.mark_dirty()
 
     def del_address_fax(self):
         del self.__address_fax
+        self.mark_dirty()
 
     def del_address_web_page(self):
         del self.__address_web_page
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
         valid_top_level_tags = [gedcom.tags.GEDCOM_TAG_ADDRESS, gedcom.tags.GEDCOM_TAG_PHONE, gedcom.tags.GEDCOM_TAG_EMAIL, gedcom.tags.GEDCOM_TAG_FAX, gedcom.tags.GEDCOM_TAG_WEB]
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines, valid_top_level_tags)
-        index = 0
-        while index < len(relevant_lines):
-            line = gedcom_lines[index]
-            if line.tag == gedcom.tags.GEDCOM_TAG_ADDRESS:
-                if len(self.__address_line) == 0:
-                    self.__address_line = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_CONTINUED:
-                self.__address_line = self.__address_line + "\n" + line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_ADDRESS_LINE1:
-                self.__address_line1 = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_ADDRESS_LINE2:
-                self.__address_line2 = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_ADDRESS_LINE3:
-                self.__address_line3 = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_CITY:
-                self.__address_city = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_STATE:
-                self.__address_state = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_POSTAL_CODE:
-                self.__address_postal_code = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_COUNTRY:
-                self.__address_country = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_PHONE:
-                self.__phone_number.append(line.value)
-            elif line.tag == gedcom.tags.GEDCOM_TAG_EMAIL:
-                self.__address_email.append(line.value)
-            elif line.tag == gedcom.tags.GEDCOM_TAG_FAX:
-                self.__address_fax.append(line.value)
-            elif line.tag == gedcom.tags.GEDCOM_TAG_WEB:
-                self.__address_web_page.append(line.value)
-            index += 1
-        return len(relevant_lines)
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end, valid_top_level_tags)
+        self.parse_lines(AddressStructure.PARSE_TABLE, gedcom_lines, start, relevant_end)
+        return relevant_end - start
 
-    def get_gedcom_repr(self, level):
-        gedcom_repr = gf.split_text_for_gedcom(self.__address_line, gedcom.tags.GEDCOM_TAG_ADDRESS, level, gedcom.tags.MAX_TEXT_LENGTH)
+    def __parse_address(self, gedcom_lines, index, end):
+        if len(self.__address_line) == 0:
+            self.__address_line, text_end = gf.join_continued_text(gedcom_lines, index, end)
+            return text_end - index
+
+    def emit_gedcom_lines(self, lines, level):
+        lines.append(gf.split_text_for_gedcom(self.__address_line, gedcom.tags.GEDCOM_TAG_ADDRESS, level, gedcom.tags.MAX_TEXT_LENGTH))
         if self.__address_line1:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr,level+1, gedcom.tags.GEDCOM_TAG_ADDRESS_LINE1, self.__address_line1)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_ADDRESS_LINE1, self.__address_line1))
         if self.__address_line2:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr,level+1, gedcom.tags.GEDCOM_TAG_ADDRESS_LINE2, self.__address_line2)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_ADDRESS_LINE2, self.__address_line2))
         if self.__address_line3:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr,level+1, gedcom.tags.GEDCOM_TAG_ADDRESS_LINE3, self.__address_line3)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_ADDRESS_LINE3, self.__address_line3))
         if self.__address_city:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr,level+1, gedcom.tags.GEDCOM_TAG_CITY, self.__address_city)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_CITY, self.__address_city))
         if self.__address_state:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr,level+1, gedcom.tags.GEDCOM_TAG_STATE, self.__address_state)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_STATE, self.__address_state))
         if self.__address_postal_code:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr,level+1, gedcom.tags.GEDCOM_TAG_POSTAL_CODE, self.__address_postal_code)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_POSTAL_CODE, self.__address_postal_code))
         if self.__address_country:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr,level+1, gedcom.tags.GEDCOM_TAG_COUNTRY, self.__address_country)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_COUNTRY, self.__address_country))
         for line in self.__phone_number:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr,level, gedcom.tags.GEDCOM_TAG_PHONE, line)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_PHONE, line))
         for line in self.__address_email:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr,level, gedcom.tags.GEDCOM_TAG_EMAIL, line)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_EMAIL, line))
         for line in self.__address_fax:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr,level, gedcom.tags.GEDCOM_TAG_FAX, line)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_FAX, line))
         for line in self.__address_web_page:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr,level, gedcom.tags.GEDCOM_TAG_WEB, line)
-        return gedcom_repr.strip()
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_WEB, line))
     address_line = property(get_address_line, set_address_line, del_address_line, "address_line's docstring")
     address_line1 = property(get_address_line_1, set_address_line_1, del_address_line_1, "address_line1's docstring")
     address_line2 = property(get_address_line_2, set_address_line_2, del_address_line_2, "address_line2's docstring")
@@ -2576,6 +2827,20 @@ class AddressStructure(Record):
     address_fax = property(get_address_fax, set_address_fax, del_address_fax, "address_fax's docstring")
     address_web_page = property(get_address_web_page, set_address_web_page, del_address_web_page, "address_web_page's docstring")
 
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_ADDRESS, None, __parse_address),
+                                    (gedcom.tags.GEDCOM_TAG_CONTINUED, None, concatenated_value_handler("address_line", "\n")),
+                                    (gedcom.tags.GEDCOM_TAG_ADDRESS_LINE1, None, value_handler("address_line1")),
+                                    (gedcom.tags.GEDCOM_TAG_ADDRESS_LINE2, None, value_handler("address_line2")),
+                                    (gedcom.tags.GEDCOM_TAG_ADDRESS_LINE3, None, value_handler("address_line3")),
+                                    (gedcom.tags.GEDCOM_TAG_CITY, None, value_handler("address_city")),
+                                    (gedcom.tags.GEDCOM_TAG_STATE, None, value_handler("address_state")),
+                                    (gedcom.tags.GEDCOM_TAG_POSTAL_CODE, None, value_handler("address_postal_code")),
+                                    (gedcom.tags.GEDCOM_TAG_COUNTRY, None, value_handler("address_country")),
+                                    (gedcom.tags.GEDCOM_TAG_PHONE, None, appended_value_handler("phone_number")),
+                                    (gedcom.tags.GEDCOM_TAG_EMAIL, None, appended_value_handler("address_email")),
+                                    (gedcom.tags.GEDCOM_TAG_FAX, None, appended_value_handler("address_fax")),
+                                    (gedcom.tags.GEDCOM_TAG_WEB, None, appended_value_handler("address_web_page")))
+
 
 class ChangeDate(Record):
     def __init__(self):
@@ -2595,54 +2860,48 @@ class ChangeDate(Record):
 
     def set_date(self, value):
         self.__date = value
+        self.mark_dirty()
 
     def set_time(self, value):
         self.__time = value
+        self.mark_dirty()
 
     def set_notes(self, value):
         self.__notes = value
+        self.mark_dirty()
 
     def del_date(self):
         del self.__date
+        self.mark_dirty()
 
     def del_time(self):
         del self.__time
+        self.mark_dirty()
 
     def del_notes(self):
         del self.__notes
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__date = relevant_lines[1].value
-        index = 2
-        starting_level = relevant_lines[0].level
-        while index < len(relevant_lines):
-            line = relevant_lines[index]
-            if line.tag == gedcom.tags.GEDCOM_TAG_TIME and line.level == starting_level+2:
-                self.__time = relevant_lines[index].value
-                index += 1
-                continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_NOTE and line.level == starting_level+1:
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__notes.append(note)
-                    index += parsed_lines
-                    continue
-        return len(relevant_lines)
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__date = gedcom_lines[start+1].value
+        self.parse_lines(ChangeDate.PARSE_TABLE, gedcom_lines, start + 2, relevant_end, gedcom_lines[start].level)
+        return relevant_end - start
 
-    def get_gedcom_repr(self, level):
-        gedcom_repr = "%s %s" % (level, gedcom.tags.GEDCOM_TAG_DATE_CHANGE)
-        gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_DATE, self.__date)
+    def emit_gedcom_lines(self, lines, level):
+        lines.append("%s %s" % (level, gedcom.tags.GEDCOM_TAG_DATE_CHANGE))
+        lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_DATE, self.__date))
         if self.__time:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_TIME, self.__time)
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_TIME, self.__time))
         for note_structure in self.__notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note_structure.get_gedcom_repr(level+1))
-        return gedcom_repr
+            note_structure.emit_gedcom_lines(lines, level+1)
     date = property(get_date, set_date, del_date, "date's docstring")
     time = property(get_time, set_time, del_time, "time's docstring")
     notes = property(get_notes, set_notes, del_notes, "notes's docstring")
 
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_TIME, 2, value_handler("time")),
+                                    (gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "notes")))
+
 
 class ChildToFamilyLink(Record):
     def __init__(self):
@@ -2666,63 +2925,59 @@ class ChildToFamilyLink(Record):
 
     def set_family_reference(self, value):
         self.__family_reference = value
+        self.mark_dirty()
 
     def set_pedigree(self, value):
         self.__pedigree = value
+        self.mark_dirty()
 
     def set_status(self, value):
         self.__status = value
+        self.mark_dirty()
 
     def set_notes(self, value):
         self.__notes = value
+        self.mark_dirty()
 
     def del_family_reference(self):
         del self.__family_reference
+        self.mark_dirty()
 
     def del_pedigree(self):
         del self.__pedigree
+        self.mark_dirty()
 
     def del_status(self):
         del self.__status
+        self.mark_dirty()
 
     def del_notes(self):
         del self.__notes
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__family_reference = relevant_lines[0].value
-        index = 0
-        starting_level = relevant_lines[0].level
-        while index < len(relevant_lines):
-            line = relevant_lines[index]
-            if line.tag == gedcom.tags.GEDCOM_TAG_PEDIGREE and line.level == starting_level+1:
-                self.__pedigree = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_STATUS and line.level == starting_level+1:
-                self.__status = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_NOTE and line.level == starting_level+1:
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__notes.append(note)
-                    index += parsed_lines
-                    continue
-            index += 1
-        return len(relevant_lines)
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__family_reference = gedcom_lines[start].value
+        self.parse_lines(ChildToFamilyLink.PARSE_TABLE, gedcom_lines, start, relevant_end)
+        return relevant_end - start
 
-    def get_gedcom_repr(self, level):
-        gedcom_repr = "%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_FAMILY_CHILD, self.__family_reference)
+    def emit_gedcom_lines(self, lines, level):
+        lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_FAMILY_CHILD, self.__family_reference))
         if self.__pedigree:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_PEDIGREE, self.__pedigree)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_PEDIGREE, self.__pedigree))
         if self.__status:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_STATUS, self.__status)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_STATUS, self.__status))
         for note_structure in self.__notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note_structure.get_gedcom_repr(level+1))
-        return gedcom_repr
+            note_structure.emit_gedcom_lines(lines, level+1)
     family_reference = property(get_family_reference, set_family_reference, del_family_reference, "family_reference's docstring")
     pedigree = property(get_pedigree, set_pedigree, del_pedigree, "pedigree's docstring")
     status = property(get_status, set_status, del_status, "status's docstring")
     notes = property(get_notes, set_notes, del_notes, "notes's docstring")
 
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_PEDIGREE, 1, value_handler("pedigree")),
+                                    (gedcom.tags.GEDCOM_TAG_STATUS, 1, value_handler("status")),
+                                    (gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "notes")))
+
 
 class EventDetail(Record):
     def __init__(self):
@@ -2794,204 +3049,160 @@ class EventDetail(Record):
 
     def set_type(self, value):
         self._type = value
+        self.mark_dirty()
 
     def set_date(self, value):
         self._date = value
+        self.mark_dirty()
 
     def set_place_name(self, value):
         self._place_name = value
+        self.mark_dirty()
 
     def set_place_hierarchy(self, value):
         self._place_hierarchy = value
+        self.mark_dirty()
 
     def set_place_latitude(self, value):
         self._place_latitude = value
+        self.mark_dirty()
 
     def set_place_longitude(self, value):
         self._place_longitude = value
+        self.mark_dirty()
 
     def set_place_notes(self, value):
         self._place_notes = value
+        self.mark_dirty()
 
     def set_address(self, value):
         self._address = value
+        self.mark_dirty()
 
     def set_responsible_agency(self, value):
         self._responsible_agency = value
+        self.mark_dirty()
 
     def set_religious_affiliation(self, value):
         self._religious_affiliation = value
+        self.mark_dirty()
 
     def set_cause(self, value):
         self._cause = value
+        self.mark_dirty()
 
     def set_restriction_notice(self, value):
         self._restriction_notice = value
+        self.mark_dirty()
 
     def set_notes(self, value):
         self._notes = value
+        self.mark_dirty()
 
     def set_sources(self, value):
         self._sources = value
+        self.mark_dirty()
 
     def set_multimedia_links(self, value):
         self._multimedia_links = value
+        self.mark_dirty()
 
     def del_type(self):
         del self._type
+        self.mark_dirty()
 
     def del_date(self):
         del self._date
+        self.mark_dirty()
 
     def del_place_name(self):
         del self._place_name
+        self.mark_dirty()
 
     def del_place_hierarchy(self):
         del self._place_hierarchy
+        self.mark_dirty()
 
     def del_place_latitude(self):
         del self._place_latitude
+        self.mark_dirty()
 
     def del_place_longitude(self):
         del self._place_longitude
+        self.mark_dirty()
 
     def del_place_notes(self):
         del self._place_notes
+        self.mark_dirty()
 
     def del_address(self):
         del self._address
+        self.mark_dirty()
 
     def del_responsible_agency(self):
         del self._responsible_agency
+        self.mark_dirty()
 
     def del_religious_affiliation(self):
         del self._religious_affiliation
+        self.mark_dirty()
 
     def del_cause(self):
         del self._cause
+        self.mark_dirty()
 
     def del_restriction_notice(self):
         del self._restriction_notice
+        self.mark_dirty()
 
     def del_notes(self):
         del self._notes
+        self.mark_dirty()
 
     def del_sources(self):
         del self._sources
+        self.mark_dirty()
 
     def del_multimedia_links(self):
         del self._multimedia_links
+        self.mark_dirty()
     
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines, gedcom.tags.EVENT_DETAIL_TAGS)
-        index = 0
-        if len(relevant_lines):
-            starting_level = relevant_lines[0].level
-        scope = ""
-        while index < len(relevant_lines):
-            line = gedcom_lines[index]
-            if line.tag == gedcom.tags.GEDCOM_TAG_TYPE and line.level == starting_level:
-                self._type = line.value
-                scope = line.tag
-            elif line.tag == gedcom.tags.GEDCOM_TAG_DATE:
-                self._date = line.value
-                scope = line.tag
-            elif line.tag == gedcom.tags.GEDCOM_TAG_PLACE:
-                self._place_name = line.value
-                scope = line.tag
-            elif line.tag == gedcom.tags.GEDCOM_TAG_FORMAT and scope == gedcom.tags.GEDCOM_TAG_PLACE and line.level == starting_level+1:
-                self._place_hierarchy = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_LATITUDE and scope == gedcom.tags.GEDCOM_TAG_PLACE and line.level == starting_level+2:
-                self._place_latitude = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_LONGITUDE and scope == gedcom.tags.GEDCOM_TAG_PLACE and line.level == starting_level+2:
-                self._place_longitude = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_NOTE and scope == gedcom.tags.GEDCOM_TAG_PLACE and line.level == starting_level+1:
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self._place_notes.append(note)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_ADDRESS:
-                scope = line.tag
-                address = AddressStructure()
-                parsed_lines = address.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self._address = address
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_AGENCY:
-                scope = line.tag
-                self._responsible_agency = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_RELIGION:
-                scope = line.tag
-                self._religious_affiliation = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_CAUSE:
-                scope = line.tag
-                self._cause = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_RESTRICTION:
-                scope = line.tag
-                self._restriction_notice = line.value
-            elif line.tag == gedcom.tags.GEDCOM_TAG_NOTE and line.level == starting_level:
-                scope = line.tag
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self._notes.append(note)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_SOURCE and line.level == starting_level:
-                scope = line.tag
-                source = SourceCitation()
-                parsed_lines = source.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self._sources.append(source)
-                    index += parsed_lines
-                    continue
-            elif line.tag == gedcom.tags.GEDCOM_TAG_OBJECT and line.level == starting_level:
-                scope = line.tag
-                multimedia = MultimediaLink()
-                parsed_lines = multimedia.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self._multimedia_links.append(multimedia)
-                    index += parsed_lines
-                    continue
-            index += 1
-        return len(relevant_lines)
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end, gedcom.tags.EVENT_DETAIL_TAGS)
+        self.parse_scoped_lines(EventDetail.PARSE_TABLE, EventDetail.SCOPED_PARSE_TABLES, gedcom_lines, start, relevant_end)
+        return relevant_end - start
 
-    def get_gedcom_repr(self, level):
-        gedcom_repr = ""
+    def emit_gedcom_lines(self, lines, level):
         if self._type:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level, gedcom.tags.GEDCOM_TAG_TYPE, self._type)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_TYPE, self._type))
         if self._date:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level, gedcom.tags.GEDCOM_TAG_DATE, self._date)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_DATE, self._date))
         if self._place_name:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level, gedcom.tags.GEDCOM_TAG_PLACE, self._place_name)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_PLACE, self._place_name))
         if self._place_hierarchy:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_FORMAT, self._place_hierarchy)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_FORMAT, self._place_hierarchy))
         if self._place_latitude:
-            gedcom_repr = "%s\n%s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_MAP)
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_LATITUDE, self._place_latitude)
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_LONGITUDE, self._place_longitude)
+            lines.append("%s %s" % (level+1, gedcom.tags.GEDCOM_TAG_MAP))
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_LATITUDE, self._place_latitude))
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_LONGITUDE, self._place_longitude))
         for note in self._place_notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note.get_gedcom_repr(level+1))
+            note.emit_gedcom_lines(lines, level+1)
         if self._address:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, self._address.get_gedcom_repr(level))
+            self._address.emit_gedcom_lines(lines, level)
         if self._responsible_agency:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level, gedcom.tags.GEDCOM_TAG_AGENCY, self._responsible_agency)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_AGENCY, self._responsible_agency))
         if self._religious_affiliation:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level, gedcom.tags.GEDCOM_TAG_RELIGION, self._religious_affiliation)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_RELIGION, self._religious_affiliation))
         if self._cause:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level, gedcom.tags.GEDCOM_TAG_CAUSE, self._cause)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_CAUSE, self._cause))
         if self._restriction_notice:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level, gedcom.tags.GEDCOM_TAG_RESTRICTION, self._restriction_notice)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_RESTRICTION, self._restriction_notice))
         for note_structure in self._notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note_structure.get_gedcom_repr(level))
+            note_structure.emit_gedcom_lines(lines, level)
         for source_citation in self._sources:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, source_citation.get_gedcom_repr(level))
+            source_citation.emit_gedcom_lines(lines, level)
         for multimedia_link in self._multimedia_links:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, multimedia_link.get_gedcom_repr(level))
-        return gedcom_repr.strip()
+            multimedia_link.emit_gedcom_lines(lines, level)
     type = property(get_type, set_type, del_type, "type's docstring")
     date = property(get_date, set_date, del_date, "date's docstring")
     place_name = property(get_place_name, set_place_name, del_place_name, "place_name's docstring")
@@ -3008,6 +3219,26 @@ class EventDetail(Record):
     sources = property(get_sources, set_sources, del_sources, "sources's docstring")
     multimedia_links = property(get_multimedia_links, set_multimedia_links, del_multimedia_links, "multimedia_links's docstring")
 
+    # each line in PARSE_TABLE opens the scope of its tag
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_TYPE, 0, value_handler("type")),
+                                    (gedcom.tags.GEDCOM_TAG_DATE, None, value_handler("date")),
+                                    (gedcom.tags.GEDCOM_TAG_PLACE, None, value_handler("place_name")),
+                                    (gedcom.tags.GEDCOM_TAG_ADDRESS, None, substructure_handler(lambda: AddressStructure(), "address", append=False)),
+                                    (gedcom.tags.GEDCOM_TAG_AGENCY, None, value_handler("responsible_agency")),
+                                    (gedcom.tags.GEDCOM_TAG_RELIGION, None, value_handler("religious_affiliation")),
+                                    (gedcom.tags.GEDCOM_TAG_CAUSE, None, value_handler("cause")),
+                                    (gedcom.tags.GEDCOM_TAG_RESTRICTION, None, value_handler("restriction_notice")),
+                                    (gedcom.tags.GEDCOM_TAG_NOTE, 0, substructure_handler(lambda: NoteStructure(), "notes")),
+                                    (gedcom.tags.GEDCOM_TAG_SOURCE, 0, substructure_handler(lambda: SourceCitation(), "sources")),
+                                    (gedcom.tags.GEDCOM_TAG_OBJECT, 0, substructure_handler(lambda: MultimediaLink(), "multimedia_links")))
+
+    # lines parsed only in the scope of a PLAC line
+    PLACE_PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_FORMAT, 1, value_handler("place_hierarchy")),
+                                          (gedcom.tags.GEDCOM_TAG_LATITUDE, 2, value_handler("place_latitude")),
+                                          (gedcom.tags.GEDCOM_TAG_LONGITUDE, 2, value_handler("place_longitude")),
+                                          (gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "place_notes")))
+    SCOPED_PARSE_TABLES = {gedcom.tags.GEDCOM_TAG_PLACE: PLACE_PARSE_TABLE}
+
 
 class FamilyEventDetail(EventDetail):
     def __init__(self):
@@ -3023,23 +3254,27 @@ class FamilyEventDetail(EventDetail):
 
     def set_husband_age_at_event(self, value):
         self.__husband_age_at_event = value
+        self.mark_dirty()
 
     def set_wife_age_at_event(self, value):
         self.__wife_age_at_event = value
+        self.mark_dirty()
 
     def del_husband_age_at_event(self):
         del self.__husband_age_at_event
+        self.mark_dirty()
 
     def del_wife_age_at_event(self):
         del self.__wife_age_at_event
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
         valid_top_level_tags = gedcom.tags.EVENT_DETAIL_TAGS + [gedcom.tags.GEDCOM_TAG_HUSBAND, gedcom.tags.GEDCOM_TAG_WIFE]
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines, valid_top_level_tags)
-        index = 0
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end, valid_top_level_tags)
+        index = start
         scope = ""
-        while index < len(relevant_lines):
-            line = relevant_lines[index]
+        while index < relevant_end:
+            line = gedcom_lines[index]
             if line.tag == gedcom.tags.GEDCOM_TAG_HUSBAND:
                 scope = gedcom.tags.GEDCOM_TAG_HUSBAND
             elif line.tag == gedcom.tags.GEDCOM_TAG_WIFE:
@@ -3050,21 +3285,20 @@ class FamilyEventDetail(EventDetail):
                 elif scope == gedcom.tags.GEDCOM_TAG_WIFE:
                     self.__wife_age_at_event = line.value
             elif line.tag in gedcom.tags.EVENT_DETAIL_TAGS:
-                parsed_lines = super().parse_gedcom(gedcom_lines[index:])
+                parsed_lines = super().parse_gedcom(gedcom_lines, index, end)
                 index += parsed_lines
                 continue
             index += 1
-        return len(relevant_lines)
+        return relevant_end - start
     
-    def get_gedcom_repr(self, level):
-        gedcom_repr = ""
+    def emit_gedcom_lines(self, lines, level):
         if self.__husband_age_at_event:
-            gedcom_repr = "%s\n%s %s" % (gedcom_repr, level, gedcom.tags.GEDCOM_TAG_HUSBAND)
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_AGE, self.__husband_age_at_event)
+            lines.append("%s %s" % (level, gedcom.tags.GEDCOM_TAG_HUSBAND))
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_AGE, self.__husband_age_at_event))
         if self.__wife_age_at_event:
-            gedcom_repr = "%s\n%s %s" % (gedcom_repr, level, gedcom.tags.GEDCOM_TAG_WIFE)
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_AGE, self.__wife_age_at_event)
-        return ("%s\n%s" % (gedcom_repr, super().get_gedcom_repr(level))).strip()
+            lines.append("%s %s" % (level, gedcom.tags.GEDCOM_TAG_WIFE))
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_AGE, self.__wife_age_at_event))
+        super().emit_gedcom_lines(lines, level)
     husband_age_at_event = property(get_husband_age_at_event, set_husband_age_at_event, del_husband_age_at_event, "husband_age_at_event's docstring")
     wife_age_at_event = property(get_wife_age_at_event, set_wife_age_at_event, del_wife_age_at_event, "wife_age_at_event's docstring")
 
@@ -3087,54 +3321,60 @@ class FamilyEventStructure(FamilyEventDetail):
 
     def set_tag(self, value):
         self.__tag = value
+        self.mark_dirty()
 
     def set_married_yes(self, value):
         self.__married_yes = value
+        self.mark_dirty()
 
     def set_event_descriptor(self, value):
         self.__event_descriptor = value
+        self.mark_dirty()
 
     def del_tag(self):
         del self.__tag
+        self.mark_dirty()
 
     def del_married_yes(self):
         del self.__married_yes
+        self.mark_dirty()
 
     def del_event_descriptor(self):
         del self.__event_descriptor
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__tag = relevant_lines[0].tag
-        index = 0
-        while index < len(relevant_lines):
-            line = relevant_lines[index]
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__tag = gedcom_lines[start].tag
+        index = start
+        while index < relevant_end:
+            line = gedcom_lines[index]
             if self.__tag == gedcom.tags.GEDCOM_TAG_MARRIAGE:
-                self.__married_yes = relevant_lines[0].value
-                if len(relevant_lines) > index+1 and (relevant_lines[index+1].level == line.level+1):
-                    parsed_lines = super().parse_gedcom(relevant_lines[index:])
+                self.__married_yes = gedcom_lines[start].value
+                if relevant_end > index+1 and (gedcom_lines[index+1].level == line.level+1):
+                    parsed_lines = super().parse_gedcom(gedcom_lines, index, relevant_end)
                     index += parsed_lines
                     continue
             elif self.__tag == gedcom.tags.GEDCOM_TAG_EVENT:
                 self.__event_descriptor = line.value
-                if len(relevant_lines) >= index+1 and (relevant_lines[index+1].level == line.level+1):
-                    parsed_lines = super().parse_gedcom(relevant_lines[index:])
+                if relevant_end >= index+1 and (gedcom_lines[index+1].level == line.level+1):
+                    parsed_lines = super().parse_gedcom(gedcom_lines, index, relevant_end)
                     index += parsed_lines
                     continue
             else:
-                parsed_lines = super().parse_gedcom(relevant_lines[index:])
+                parsed_lines = super().parse_gedcom(gedcom_lines, index, relevant_end)
                 index += parsed_lines
                 continue
             index += 1
-        return len(relevant_lines)
+        return relevant_end - start
 
-    def get_gedcom_repr(self, level):
-        gedcom_repr = "%s %s" % (level, self.__tag)
+    def emit_gedcom_lines(self, lines, level):
+        lines.append("%s %s" % (level, self.__tag))
         if self.__married_yes:
-            gedcom_repr = "%s %s" % (gedcom_repr, self.__married_yes)
+            lines[-1] = "%s %s" % (lines[-1], self.__married_yes)
         elif self.__event_descriptor:
-            gedcom_repr = "%s %s" % (gedcom_repr, self.__event_descriptor)
-        return ("%s\n%s" % (gedcom_repr, super().get_gedcom_repr(level+1))).strip()
+            lines[-1] = "%s %s" % (lines[-1], self.__event_descriptor)
+        super().emit_gedcom_lines(lines, level+1)
     tag = property(get_tag, set_tag, del_tag, "tag's docstring")
     married_yes = property(get_married_yes, set_married_yes, del_married_yes, "married_yes's docstring")
     event_descriptor = property(get_event_descriptor, set_event_descriptor, del_event_descriptor, "event_descriptor's docstring")
@@ -3150,22 +3390,25 @@ class IndividualEventDetail(EventDetail):
 
     def set_age_at_event(self, value):
         self.__age_at_event = value
+        self.mark_dirty()
 
     def del_age_at_event(self):
         del self.__age_at_event
-
-    def parse_gedcom(self, gedcom_lines):
-        parsed_lines = super().parse_gedcom(gedcom_lines)
-        if len(gedcom_lines) > parsed_lines and gedcom_lines[parsed_lines].tag == gedcom.tags.GEDCOM_TAG_AGE:
-            self._age_at_event = gedcom_lines[parsed_lines].value
+        self.mark_dirty()
+
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        parsed_lines = super().parse_gedcom(gedcom_lines, start, end)
+        if end is None:
+            end = len(gedcom_lines)
+        if end > start+parsed_lines and gedcom_lines[start+parsed_lines].tag == gedcom.tags.GEDCOM_TAG_AGE:
+            self._age_at_event = gedcom_lines[start+parsed_lines].value
             parsed_lines += 1
         return parsed_lines
     
-    def get_gedcom_repr(self, level):
-        gedcom_repr = super().get_gedcom_repr(level)
+    def emit_gedcom_lines(self, lines, level):
+        super().emit_gedcom_lines(lines, level)
         if self._age_at_event:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level, gedcom.tags.GEDCOM_TAG_AGE, self._age_at_event)
-        return gedcom_repr
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_AGE, self._age_at_event))
     age_at_event = property(get_age_at_event, set_age_at_event, del_age_at_event, "age_at_event's docstring")
 
 
@@ -3187,63 +3430,58 @@ class IndividualAttributeStructure(IndividualEventDetail):
 
     def set_tag(self, value):
         self.__tag = value
+        self.mark_dirty()
 
     def set_content(self, value):
         self.__content = value
+        self.mark_dirty()
 
     def set_physical_description(self, value):
         self.__physical_description = value
+        self.mark_dirty()
 
     def del_tag(self):
         del self.__tag
+        self.mark_dirty()
 
     def del_content(self):
         del self.__content
+        self.mark_dirty()
 
     def del_physical_description(self):
         del self.__physical_description
-
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__tag = relevant_lines[0].tag
-        starting_level = gedcom_lines[0].level
-        index = 0
-        while index < len(relevant_lines):
-            line = relevant_lines[index]
+        self.mark_dirty()
+
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__tag = gedcom_lines[start].tag
+        starting_level = gedcom_lines[start].level
+        index = start
+        while index < relevant_end:
+            line = gedcom_lines[index]
             if line.tag == gedcom.tags.GEDCOM_TAG_PHYSICAL_DESCRIPTION:
                 self.__tag = line.tag
-                self.__physical_description = line.value
-                if len(relevant_lines) > index+1 and relevant_lines[index+1].level == starting_level + 1:
-                    for line in relevant_lines[index+1:]:
-                        if line.tag == gedcom.tags.GEDCOM_TAG_CONTINUED:
-                            self.__physical_description = self.__physical_description + '\n' + line.value
-                            index += 1
-                        elif line.tag == gedcom.tags.GEDCOM_TAG_CONCATENATION:
-                            self.__physical_description = self.__physical_description + line.value
-                            index += 1
-                        else:
-                            break
-                parsed_lines = super().parse_gedcom(relevant_lines[index+1:])
+                self.__physical_description, text_end = gf.join_continued_text(gedcom_lines, index, relevant_end)
+                index = text_end - 1
+                parsed_lines = super().parse_gedcom(gedcom_lines, index+1, relevant_end)
                 index += parsed_lines
             elif line.tag in (gedcom.tags.INDIVIDUAL_ATTRIBUTE_STRUCTURE_TAGS):
                 self.__tag = line.tag
                 self.__content = line.value
-                parsed_lines = super().parse_gedcom(relevant_lines[1:])
+                parsed_lines = super().parse_gedcom(gedcom_lines, start+1, relevant_end)
                 index += parsed_lines
             else:
                 return
             index += 1
-        return len(relevant_lines)
+        return relevant_end - start
 
-    def get_gedcom_repr(self, level):
-        gedcom_repr = "%s %s" % (level, self.__tag)
+    def emit_gedcom_lines(self, lines, level):
+        lines.append("%s %s" % (level, self.__tag))
         if self.__content:
-            gedcom_repr = "%s %s" % (gedcom_repr, self.__content)
+            lines[-1] = "%s %s" % (lines[-1], self.__content)
         if self.__physical_description:
-            gedcom_repr = gf.split_text_for_gedcom(self.__physical_description, gedcom.tags.GEDCOM_TAG_PHYSICAL_DESCRIPTION, level, gedcom.tags.MAX_TEXT_LENGTH) 
-        if super().get_gedcom_repr(level + 1):
-            gedcom_repr = "%s\n%s" % (gedcom_repr, super().get_gedcom_repr(level + 1))
-        return gedcom_repr
+            lines[-1] = gf.split_text_for_gedcom(self.__physical_description, gedcom.tags.GEDCOM_TAG_PHYSICAL_DESCRIPTION, level, gedcom.tags.MAX_TEXT_LENGTH) 
+        super().emit_gedcom_lines(lines, level + 1)
     tag = property(get_tag, set_tag, del_tag, "tag's docstring")
     content = property(get_content, set_content, del_content, "content's docstring")
     physical_description = property(get_physical_description, set_physical_description, del_physical_description, "physical_description's docstring")
@@ -3279,93 +3517,103 @@ class IndividualEventStructure(IndividualEventDetail):
 
     def set_tag(self, value):
         self.__tag = value
+        self.mark_dirty()
 
     def set_birth_christening_yes(self, value):
         self.__birth_christening_yes = value
+        self.mark_dirty()
 
     def set_birth_christening_family_reference(self, value):
         self.__birth_christening_family_reference = value
+        self.mark_dirty()
 
     def set_death_yes(self, value):
         self.__death_yes = value
+        self.mark_dirty()
 
     def set_adopting_family_reference(self, value):
         self.__adopting_family_reference = value
+        self.mark_dirty()
 
     def set_adopting_parent(self, value):
         self.__adopting_parent = value
+        self.mark_dirty()
 
     def del_tag(self):
         del self.__tag
+        self.mark_dirty()
 
     def del_birth_christening_yes(self):
         del self.__birth_christening_yes
+        self.mark_dirty()
 
     def del_birth_christening_family_reference(self):
         del self.__birth_christening_family_reference
+        self.mark_dirty()
 
     def del_death_yes(self):
         del self.__death_yes
+        self.mark_dirty()
 
     def del_adopting_family_reference(self):
         del self.__adopting_family_reference
+        self.mark_dirty()
 
     def del_adopting_parent(self):
         del self.__adopting_parent
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__tag = relevant_lines[0].tag
-        index = 0
-        while index < len(relevant_lines):
-            line = relevant_lines[index]
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__tag = gedcom_lines[start].tag
+        index = start
+        while index < relevant_end:
+            line = gedcom_lines[index]
             if self.__tag in (gedcom.tags.GEDCOM_TAG_BIRTH, gedcom.tags.GEDCOM_TAG_CHRISTENING):
-                self.__birth_christening_yes = relevant_lines[0].value
-                if len(relevant_lines) > index+1 and (relevant_lines[index+1].level == line.level+1):
-                    parsed_lines = super().parse_gedcom(relevant_lines[1:])
+                self.__birth_christening_yes = gedcom_lines[start].value
+                if relevant_end > index+1 and (gedcom_lines[index+1].level == line.level+1):
+                    parsed_lines = super().parse_gedcom(gedcom_lines, start+1, relevant_end)
                     index += parsed_lines
-                    if len(relevant_lines) >= index+2 and relevant_lines[index+1].tag == gedcom.tags.GEDCOM_TAG_FAMILY_CHILD:
-                        self.__birth_christening_family_reference = relevant_lines[index+1].value
+                    if relevant_end >= index+2 and gedcom_lines[index+1].tag == gedcom.tags.GEDCOM_TAG_FAMILY_CHILD:
+                        self.__birth_christening_family_reference = gedcom_lines[index+1].value
                         index += 1
             elif self.__tag == gedcom.tags.GEDCOM_TAG_DEATH:
-                self.__death_yes = relevant_lines[0].value
-                if len(relevant_lines) > index+1 and (relevant_lines[index+1].level == line.level+1):
-                    parsed_lines = super().parse_gedcom(relevant_lines[1:])
+                self.__death_yes = gedcom_lines[start].value
+                if relevant_end > index+1 and (gedcom_lines[index+1].level == line.level+1):
+                    parsed_lines = super().parse_gedcom(gedcom_lines, start+1, relevant_end)
                     index += parsed_lines
             elif self.__tag == gedcom.tags.GEDCOM_TAG_ADOPTION:
-                if len(relevant_lines) > index+1 and (relevant_lines[index+1].level == line.level+1):
-                    parsed_lines = super().parse_gedcom(relevant_lines[1:])
+                if relevant_end > index+1 and (gedcom_lines[index+1].level == line.level+1):
+                    parsed_lines = super().parse_gedcom(gedcom_lines, start+1, relevant_end)
                     index += parsed_lines
-                    if len(relevant_lines) >= index+2 and relevant_lines[index+1].tag == gedcom.tags.GEDCOM_TAG_FAMILY_CHILD:
-                        self.__adopting_family_reference = relevant_lines[index+1].value
+                    if relevant_end >= index+2 and gedcom_lines[index+1].tag == gedcom.tags.GEDCOM_TAG_FAMILY_CHILD:
+                        self.__adopting_family_reference = gedcom_lines[index+1].value
                         index += 1
-                        if len(relevant_lines) > index+1 and relevant_lines[index+1].tag == gedcom.tags.GEDCOM_TAG_ADOPTION:
-                            self.__adopting_parent = relevant_lines[index+1].value
+                        if relevant_end > index+1 and gedcom_lines[index+1].tag == gedcom.tags.GEDCOM_TAG_ADOPTION:
+                            self.__adopting_parent = gedcom_lines[index+1].value
                             index += 1
             elif self.__tag in (gedcom.tags.INDIVIDUAL_EVENT_STRUCTURE_TAGS):
-                if len(relevant_lines) >= index+1 and (relevant_lines[index+1].level == line.level+1):
-                    parsed_lines = super().parse_gedcom(relevant_lines[1:])
+                if relevant_end >= index+1 and (gedcom_lines[index+1].level == line.level+1):
+                    parsed_lines = super().parse_gedcom(gedcom_lines, start+1, relevant_end)
                     index += parsed_lines
             else:
                 return
             index += 1
-        return len(relevant_lines)
+        return relevant_end - start
 
-    def get_gedcom_repr(self, level):
-        gedcom_repr = "%s %s" % (level, self.__tag)
+    def emit_gedcom_lines(self, lines, level):
+        lines.append("%s %s" % (level, self.__tag))
         if self.__birth_christening_yes:
-            gedcom_repr = "%s %s" % (gedcom_repr, self.__birth_christening_yes)
+            lines[-1] = "%s %s" % (lines[-1], self.__birth_christening_yes)
         elif self.__death_yes:
-            gedcom_repr = "%s %s" % (gedcom_repr, self.__death_yes)
-        if super().get_gedcom_repr(level + 1):
-            gedcom_repr = "%s\n%s" % (gedcom_repr, super().get_gedcom_repr(level + 1))
+            lines[-1] = "%s %s" % (lines[-1], self.__death_yes)
+        super().emit_gedcom_lines(lines, level + 1)
         if self.__birth_christening_family_reference:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, (level + 1), gedcom.tags.GEDCOM_TAG_FAMILY_CHILD,self.__birth_christening_family_reference)
+            lines.append("%s %s %s" % ((level + 1), gedcom.tags.GEDCOM_TAG_FAMILY_CHILD,self.__birth_christening_family_reference))
         elif self.__adopting_family_reference:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, (level + 1), gedcom.tags.GEDCOM_TAG_FAMILY_CHILD,self.__adopting_family_reference)
+            lines.append("%s %s %s" % ((level + 1), gedcom.tags.GEDCOM_TAG_FAMILY_CHILD,self.__adopting_family_reference))
             if self.__adopting_parent:
-                gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, (level + 2), gedcom.tags.GEDCOM_TAG_ADOPTION, self.__adopting_parent)
-        return gedcom_repr
+                lines.append("%s %s %s" % ((level + 2), gedcom.tags.GEDCOM_TAG_ADOPTION, self.__adopting_parent))
 
     tag = property(get_tag, set_tag, del_tag, "tag's docstring")
     birth_christening_yes = property(get_birth_christening_yes, set_birth_christening_yes, del_birth_christening_yes, "birth_christening_yes's docstring")
@@ -3401,70 +3649,76 @@ class MultimediaLink(Record):
 
     def set_reference(self, value):
         self.__reference = value
+        self.mark_dirty()
 
     def set_multimedia_file(self, value):
         self.__multimedia_file = value
+        self.mark_dirty()
 
     def set_multimedia_format(self, value):
         self.__multimedia_format = value
+        self.mark_dirty()
 
     def set_multimedia_type(self, value):
         self.__multimedia_type = value
+        self.mark_dirty()
 
     def set_multimedia_title(self, value):
         self.__multimedia_title = value
+        self.mark_dirty()
 
     def del_reference(self):
         del self.__reference
+        self.mark_dirty()
 
     def del_multimedia_file(self):
         del self.__multimedia_file
+        self.mark_dirty()
 
     def del_multimedia_format(self):
         del self.__multimedia_format
+        self.mark_dirty()
 
     def del_multimedia_type(self):
         del self.__multimedia_type
+        self.mark_dirty()
 
     def del_multimedia_title(self):
         del self.__multimedia_title
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        if "@" in relevant_lines[0].value:
-                self.__reference = relevant_lines[0].value
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        if "@" in gedcom_lines[start].value:
+                self.__reference = gedcom_lines[start].value
         else:
-            for line in relevant_lines:
-                tag = line.tag
-                if tag == gedcom.tags.GEDCOM_TAG_FILE:
-                    self.__multimedia_file = line.value
-                elif tag == gedcom.tags.GEDCOM_TAG_FORMAT:
-                    self.__multimedia_format = line.value
-                elif tag == gedcom.tags.GEDCOM_TAG_MEDIA:
-                    self.__multimedia_type = line.value
-                elif tag == gedcom.tags.GEDCOM_TAG_TITLE:
-                    self.__multimedia_title = line.value
-        return len(relevant_lines)
-
-    def get_gedcom_repr(self, level):
+            self.parse_lines(MultimediaLink.PARSE_TABLE, gedcom_lines, start, relevant_end)
+        return relevant_end - start
+
+    def emit_gedcom_lines(self, lines, level):
         if self.__reference:
-            return "%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_OBJECT, self.__reference)
-        gedcom_repr = "%s %s" % (level, gedcom.tags.GEDCOM_TAG_OBJECT)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_OBJECT, self.__reference))
+            return
+        lines.append("%s %s" % (level, gedcom.tags.GEDCOM_TAG_OBJECT))
         if self.__multimedia_format:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_FORMAT, self.__multimedia_format)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_FORMAT, self.__multimedia_format))
         if self.__multimedia_file:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_FILE, self.__multimedia_file)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_FILE, self.__multimedia_file))
         if self.__multimedia_type:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_MEDIA, self.__multimedia_type)
+            lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_MEDIA, self.__multimedia_type))
         if self.__multimedia_title:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_TITLE, self.__multimedia_title)
-        return gedcom_repr
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_TITLE, self.__multimedia_title))
     reference = property(get_reference, set_reference, del_reference, "reference's docstring")
     multimedia_file = property(get_multimedia_file, set_multimedia_file, del_multimedia_file, "multimedia_file's docstring")
     multimedia_format = property(get_multimedia_format, set_multimedia_format, del_multimedia_format, "multimedia_format's docstring")
     multimedia_type = property(get_multimedia_type, set_multimedia_type, del_multimedia_type, "multimedia_type's docstring")
     multimedia_title = property(get_multimedia_title, set_multimedia_title, del_multimedia_title, "multimedia_title's docstring")
 
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_FILE, None, value_handler("multimedia_file")),
+                                    (gedcom.tags.GEDCOM_TAG_FORMAT, None, value_handler("multimedia_format")),
+                                    (gedcom.tags.GEDCOM_TAG_MEDIA, None, value_handler("multimedia_type")),
+                                    (gedcom.tags.GEDCOM_TAG_TITLE, None, value_handler("multimedia_title")))
+
 
 class NoteStructure(Record):
     def __init__(self):
@@ -3480,33 +3734,34 @@ class NoteStructure(Record):
 
     def set_reference(self, value):
         self.__reference = value
+        self.mark_dirty()
 
     def set_text(self, value):
         self.__text = value
+        self.mark_dirty()
 
     def del_reference(self):
         del self.__reference
+        self.mark_dirty()
 
     def del_text(self):
         del self.__text
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        if "@" in relevant_lines[0].get_value():
-            self.__reference = relevant_lines[0].get_value()
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        if "@" in gedcom_lines[start].get_value():
+            self.__reference = gedcom_lines[start].get_value()
         else:
-            for line in relevant_lines:
-                if line.tag == gedcom.tags.GEDCOM_TAG_CONTINUED:
-                    self.__text += "\n" + line.value
-                else:
-                    self.__text += line.value
-        return len(relevant_lines)
-
-    def get_gedcom_repr(self, level):
+            text, text_end = gf.join_continued_text(gedcom_lines, start, relevant_end)
+            self.__text += text
+        return relevant_end - start
+
+    def emit_gedcom_lines(self, lines, level):
         if self.__reference:
-            return "%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_NOTE, self.__reference)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_NOTE, self.__reference))
         else:
-            return gf.split_text_for_gedcom(self.__text, gedcom.tags.GEDCOM_TAG_NOTE, level, gedcom.tags.MAX_TEXT_LENGTH)
+            lines.append(gf.split_text_for_gedcom(self.__text, gedcom.tags.GEDCOM_TAG_NOTE, level, gedcom.tags.MAX_TEXT_LENGTH))
     reference = property(get_reference, set_reference, del_reference, "reference's docstring")
     text = property(get_text, set_text, del_text, "text's docstring")
 
@@ -3569,164 +3824,141 @@ class PersonalNameStructure(Record):
 
     def set_name(self, value):
         self.__name = value
+        self.mark_dirty()
 
     def set_name_type(self, value):
         self.__name_type = value
+        self.mark_dirty()
 
     def set_variation(self, value):
         self.__variation = value
+        self.mark_dirty()
 
     def set_name_piece_prefix(self, value):
         self.__name_piece_prefix = value
+        self.mark_dirty()
 
     def set_name_piece_given(self, value):
         self.__name_piece_given = value
+        self.mark_dirty()
 
     def set_name_piece_nick(self, value):
         self.__name_piece_nick = value
+        self.mark_dirty()
 
     def set_name_piece_surname_prefix(self, value):
         self.__name_piece_surname_prefix = value
+        self.mark_dirty()
 
     def set_name_piece_surname(self, value):
         self.__name_piece_surname = value
+        self.mark_dirty()
 
     def set_name_piece_suffix(self, value):
         self.__name_piece_suffix = value
+        self.mark_dirty()
 
     def set_notes(self, value):
         self.__notes = value
+        self.mark_dirty()
 
     def set_sources(self, value):
         self.__sources = value
+        self.mark_dirty()
 
     def set_phonetic_variations(self, value):
         self.__phonetic_variations = value
+        self.mark_dirty()
 
     def set_romanized_variations(self, value):
         self.__romanized_variations = value
+        self.mark_dirty()
 
     def del_name(self):
         del self.__name
+        self.mark_dirty()
 
     def del_name_type(self):
         del self.__name_type
+        self.mark_dirty()
 
     def del_variation(self):
         del self.__variation
+        self.mark_dirty()
 
     def del_name_piece_prefix(self):
         del self.__name_piece_prefix
+        self.mark_dirty()
 
     def del_name_piece_given(self):
         del self.__name_piece_given
+        self.mark_dirty()
 
     def del_name_piece_nick(self):
         del self.__name_piece_nick
+        self.mark_dirty()
 
     def del_name_piece_surname_prefix(self):
         del self.__name_piece_surname_prefix
+        self.mark_dirty()
 
     def del_name_piece_surname(self):
         del self.__name_piece_surname
+        self.mark_dirty()
 
     def del_name_piece_suffix(self):
         del self.__name_piece_suffix
+        self.mark_dirty()
 
     def del_notes(self):
         del self.__notes
+        self.mark_dirty()
 
     def del_sources(self):
         del self.__sources
+        self.mark_dirty()
 
     def del_phonetic_variations(self):
         del self.__phonetic_variations
+        self.mark_dirty()
 
     def del_romanized_variations(self):
         del self.__romanized_variations
+        self.mark_dirty()
     
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        starting_level = relevant_lines[0].level
-        self.__name = relevant_lines[0].value
-        index = 0
-        while index < len(relevant_lines):
-            line = gedcom_lines[index]
-            tag = line.tag
-            level = line.level
-            if tag == gedcom.tags.GEDCOM_TAG_TYPE and level == starting_level + 1:
-                self.__name_type = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_NAME_PREFIX and level == starting_level + 1:
-                self.__name_piece_prefix = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_GIVEN_NAME and level == starting_level + 1:
-                self.__name_piece_given = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_NICKNAME and level == starting_level + 1:
-                self.__name_piece_nick = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_SURN_PREFIX and level == starting_level + 1:
-                self.__name_piece_surname_prefix = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_SURNAME and level == starting_level + 1:
-                self.__name_piece_surname = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_NAME_SUFFIX and level == starting_level + 1:
-                self.__name_piece_suffix = line.value
-            elif tag == gedcom.tags.GEDCOM_TAG_NOTE and level == starting_level + 1:
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__notes.append(note)
-                    index += parsed_lines
-                    continue
-            elif tag == gedcom.tags.GEDCOM_TAG_SOURCE and level == starting_level + 1:
-                source = SourceCitation()
-                parsed_lines = source.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__sources.append(source)
-                    index += parsed_lines
-                    continue
-            elif tag == gedcom.tags.GEDCOM_TAG_PHONETIC and level == starting_level + 1:
-                phonetic_variation = PersonalNameStructure(gedcom.tags.GEDCOM_TAG_PHONETIC)
-                parsed_lines = phonetic_variation.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__phonetic_variations.append(phonetic_variation)
-                    index += parsed_lines
-                    continue
-            elif tag == gedcom.tags.GEDCOM_TAG_ROMANIZED and level == starting_level + 1:
-                romanized_variation = PersonalNameStructure(gedcom.tags.GEDCOM_TAG_ROMANIZED)
-                parsed_lines = romanized_variation.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__romanized_variations.append(romanized_variation)
-                    index += parsed_lines
-                    continue
-            index += 1
-        return len(relevant_lines)
-            
-    def get_gedcom_repr(self, level):
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__name = gedcom_lines[start].value
+        self.parse_lines(PersonalNameStructure.PARSE_TABLE, gedcom_lines, start, relevant_end)
+        return relevant_end - start
+
+    def emit_gedcom_lines(self, lines, level):
         if self.__variation:
-            gedcom_repr = "%s %s %s" % (level, self.__variation, self.__name)
+            lines.append("%s %s %s" % (level, self.__variation, self.__name))
         else:
-            gedcom_repr = "%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_NAME, self.__name)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_NAME, self.__name))
         if self.__name_type:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_TYPE, self.__name_type)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_TYPE, self.__name_type))
         if self.__name_piece_prefix:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_NAME_PREFIX, self.__name_piece_prefix)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_NAME_PREFIX, self.__name_piece_prefix))
         if self.__name_piece_given:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_GIVEN_NAME, self.__name_piece_given)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_GIVEN_NAME, self.__name_piece_given))
         if self.__name_piece_nick:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_NICKNAME, self.__name_piece_nick)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_NICKNAME, self.__name_piece_nick))
         if self.__name_piece_surname_prefix:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_SURN_PREFIX, self.__name_piece_surname_prefix)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_SURN_PREFIX, self.__name_piece_surname_prefix))
         if self.__name_piece_surname:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_SURNAME, self.__name_piece_surname)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_SURNAME, self.__name_piece_surname))
         if self.__name_piece_suffix:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_NAME_SUFFIX, self.__name_piece_suffix)
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_NAME_SUFFIX, self.__name_piece_suffix))
         for phonetic_variation in self.__phonetic_variations:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, phonetic_variation.get_gedcom_repr(level+1))
+            phonetic_variation.emit_gedcom_lines(lines, level+1)
         for romanized_variation in self.__romanized_variations:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, romanized_variation.get_gedcom_repr(level+1))
+            romanized_variation.emit_gedcom_lines(lines, level+1)
         for note in self.__notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note.get_gedcom_repr(level+1))        
+            note.emit_gedcom_lines(lines, level+1)
         for source in self.__sources:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, source.get_gedcom_repr(level+1))
-        return gedcom_repr.strip()
+            source.emit_gedcom_lines(lines, level+1)
     name = property(get_name, set_name, del_name, "name's docstring")
     name_type = property(get_name_type, set_name_type, del_name_type, "name_type's docstring")
     variation = property(get_variation, set_variation, del_variation, "variation's docstring")
@@ -3741,6 +3973,18 @@ class PersonalNameStructure(Record):
     phonetic_variations = property(get_phonetic_variations, set_phonetic_variations, del_phonetic_variations, "phonetic_variations's docstring")
     romanized_variations = property(get_romanized_variations, set_romanized_variations, del_romanized_variations, "romanized_variations's docstring")
 
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_TYPE, 1, value_handler("name_type")),
+                                    (gedcom.tags.GEDCOM_TAG_NAME_PREFIX, 1, value_handler("name_piece_prefix")),
+                                    (gedcom.tags.GEDCOM_TAG_GIVEN_NAME, 1, value_handler("name_piece_given")),
+                                    (gedcom.tags.GEDCOM_TAG_NICKNAME, 1, value_handler("name_piece_nick")),
+                                    (gedcom.tags.GEDCOM_TAG_SURN_PREFIX, 1, value_handler("name_piece_surname_prefix")),
+                                    (gedcom.tags.GEDCOM_TAG_SURNAME, 1, value_handler("name_piece_surname")),
+                                    (gedcom.tags.GEDCOM_TAG_NAME_SUFFIX, 1, value_handler("name_piece_suffix")),
+                                    (gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "notes")),
+                                    (gedcom.tags.GEDCOM_TAG_SOURCE, 1, substructure_handler(lambda: SourceCitation(), "sources")),
+                                    (gedcom.tags.GEDCOM_TAG_PHONETIC, 1, substructure_handler(lambda: PersonalNameStructure(gedcom.tags.GEDCOM_TAG_PHONETIC), "phonetic_variations")),
+                                    (gedcom.tags.GEDCOM_TAG_ROMANIZED, 1, substructure_handler(lambda: PersonalNameStructure(gedcom.tags.GEDCOM_TAG_ROMANIZED), "romanized_variations")))
+
 
 class SourceCitation(Record):
     def __init__(self):
@@ -3803,176 +4047,157 @@ class SourceCitation(Record):
 
     def set_pointer_source_record(self, value):
         self.__pointer_source_record = value
+        self.mark_dirty()
 
     def set_reference(self, value):
         self.__reference = value
+        self.mark_dirty()
 
     def set_page(self, value):
         self.__page = value
+        self.mark_dirty()
 
     def set_event(self, value):
         self.__event = value
+        self.mark_dirty()
 
     def set_event_role(self, value):
         self.__event_role = value
+        self.mark_dirty()
 
     def set_data(self, value):
         self.__data = value
+        self.mark_dirty()
 
     def set_data_date(self, value):
         self.__data_date = value
+        self.mark_dirty()
 
     def set_data_text(self, value):
         self.__data_text = value
+        self.mark_dirty()
 
     def set_description(self, value):
         self.__description = value
+        self.mark_dirty()
 
     def set_text(self, value):
         self.__text = value
+        self.mark_dirty()
 
     def set_multimedia_link(self, value):
         self.__multimedia_link = value
+        self.mark_dirty()
 
     def set_notes(self, value):
         self.__notes = value
+        self.mark_dirty()
 
     def set_certainty_assessment(self, value):
         self.__certainty_assessment = value
+        self.mark_dirty()
 
     def del_pointer_source_record(self):
         del self.__pointer_source_record
+        self.mark_dirty()
 
     def del_reference(self):
         del self.__reference
+        self.mark_dirty()
 
     def del_page(self):
         del self.__page
+        self.mark_dirty()
 
     def del_event(self):
         del self.__event
+        self.mark_dirty()
 
     def del_event_role(self):
         del self.__event_role
+        self.mark_dirty()
 
     def del_data(self):
         del self.__data
+        self.mark_dirty()
 
     def del_data_date(self):
         del self.__data_date
+        self.mark_dirty()
 
     def del_data_text(self):
         del self.__data_text
+        self.mark_dirty()
 
     def del_description(self):
         del self.__description
+        self.mark_dirty()
 
     def del_text(self):
         del self.__text
+        self.mark_dirty()
 
     def del_multimedia_link(self):
         del self.__multimedia_link
+        self.mark_dirty()
 
     def del_notes(self):
         del self.__notes
+        self.mark_dirty()
 
     def del_certainty_assessment(self):
         del self.__certainty_assessment
+        self.mark_dirty()
     
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        if "@" in relevant_lines[0].value:
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        if "@" in gedcom_lines[start].value:
             # pointer to source record
-            self.__reference = relevant_lines[0].value
+            self.__reference = gedcom_lines[start].value
             self.__pointer_source_record = True
+            parse_table = SourceCitation.POINTER_PARSE_TABLE
         else:
             # system not using source records
-            self.__description = relevant_lines[0].value
-        starting_level = relevant_lines[0].level
-        index = 0
-        while (index < len(relevant_lines)):
-            line = relevant_lines[index]
-            tag = line.tag
-            level = line.level
-            scope = line.tag
-            if tag == gedcom.tags.GEDCOM_TAG_OBJECT and (level == starting_level + 1):
-                multimedialink = MultimediaLink()
-                parsed_lines = multimedialink.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__multimedia_link.append(multimedialink)
-                    index += parsed_lines
-                    continue
-            elif tag == gedcom.tags.GEDCOM_TAG_NOTE and (level == starting_level + 1):
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__notes.append(note)
-                    index += parsed_lines
-                    continue
-            elif tag == gedcom.tags.GEDCOM_TAG_QUALITY_OF_DATA:
-                self.__certainty_assessment = line.value
-            else:
-                if self.__pointer_source_record:
-                    if tag == gedcom.tags.GEDCOM_TAG_PAGE and (level == starting_level + 1):
-                        self.__page = line.value
-                    elif tag == gedcom.tags.GEDCOM_TAG_EVENT and (level == starting_level + 1):
-                        self.__event = line.value
-                    elif tag == gedcom.tags.GEDCOM_TAG_ROLE and (level == starting_level + 2):
-                        self.__event_role = line.value
-                    elif tag == gedcom.tags.GEDCOM_TAG_DATA and (level == starting_level + 1):
-                        self.__data = True
-                    elif tag == gedcom.tags.GEDCOM_TAG_DATE and (level == starting_level + 2):
-                        self.__data_date = line.value
-                    elif tag == gedcom.tags.GEDCOM_TAG_TEXT and (level == starting_level + 2):
-                        self.__text = line.value
-                    elif tag == gedcom.tags.GEDCOM_TAG_CONCATENATION and (level == starting_level + 3):
-                        self.__text = self.__text + line.value
-                    elif tag == gedcom.tags.GEDCOM_TAG_CONTINUED and (level == starting_level + 3):
-                        self.__text = self.__text + "\n" + line.value
-                    elif tag != gedcom.tags.GEDCOM_TAG_SOURCE:
-                        return
-                else:
-                    if tag == gedcom.tags.GEDCOM_TAG_SOURCE:
-                        self.__description = line.value
-                    elif tag == gedcom.tags.GEDCOM_TAG_CONCATENATION and (level == starting_level + 1) and (scope == gedcom.tags.GEDCOM_TAG_SOURCE):
-                        self.__description = self.__description + line.value
-                    elif tag == gedcom.tags.GEDCOM_TAG_CONTINUED and (level == starting_level + 1) and (scope == gedcom.tags.GEDCOM_TAG_SOURCE):
-                        self.__description = self.__description + "\n" + line.value
-                    elif tag == gedcom.tags.GEDCOM_TAG_TEXT and (level == starting_level + 1):
-                        self.__text = line.value
-                    elif tag == gedcom.tags.GEDCOM_TAG_CONCATENATION and (level == starting_level + 2):
-                        self.__text = self.__text + line.value
-                    elif tag == gedcom.tags.GEDCOM_TAG_CONTINUED and (level == starting_level + 2):
-                        self.__text = self.__text + "\n" + line.value
-            index += 1
-        return len(relevant_lines)
+            self.__description = gedcom_lines[start].value
+            parse_table = SourceCitation.DESCRIPTION_PARSE_TABLE
+        starting_level = gedcom_lines[start].level
+        index = start
+        while (index < relevant_end):
+            line = gedcom_lines[index]
+            handler = parse_table.get((line.tag_id, line.level - starting_level))
+            if handler is None and self.__pointer_source_record and line.tag != gedcom.tags.GEDCOM_TAG_SOURCE:
+                return
+            index += (handler(self, gedcom_lines, index, relevant_end) if handler else None) or 1
+        return relevant_end - start
 
-    def get_gedcom_repr(self, level):
+    def __parse_data(self, gedcom_lines, index, end):
+        self.__data = True
+
+    def emit_gedcom_lines(self, lines, level):
         if self.__pointer_source_record or self.__reference:
-            gedcom_repr = "%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_SOURCE, self.__reference)
+            lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_SOURCE, self.__reference))
             if self.__page:
-                gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_PAGE, self.__page)
+                lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_PAGE, self.__page))
             if self.__event:
-                gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_EVENT, self.__event)
+                lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_EVENT, self.__event))
             if self.__event_role:
-                gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_ROLE, self.__event_role)
+                lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_ROLE, self.__event_role))
             if self.__data:
-                gedcom_repr = "%s\n%s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_DATA)
+                lines.append("%s %s" % (level+1, gedcom.tags.GEDCOM_TAG_DATA))
             if self.__data_date:
-                gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+2, gedcom.tags.GEDCOM_TAG_DATE, self.__data_date)
+                lines.append("%s %s %s" % (level+2, gedcom.tags.GEDCOM_TAG_DATE, self.__data_date))
             if self.__text:
-                gedcom_repr = "%s\n%s" % (gedcom_repr, gf.split_text_for_gedcom(self.__text, gedcom.tags.GEDCOM_TAG_TEXT, level+2, gedcom.tags.MAX_TEXT_LENGTH))
+                lines.append(gf.split_text_for_gedcom(self.__text, gedcom.tags.GEDCOM_TAG_TEXT, level+2, gedcom.tags.MAX_TEXT_LENGTH))
         else:                                
-            gedcom_repr = gf.split_text_for_gedcom(self.__description, gedcom.tags.GEDCOM_TAG_SOURCE, level, gedcom.tags.MAX_TEXT_LENGTH)
+            lines.append(gf.split_text_for_gedcom(self.__description, gedcom.tags.GEDCOM_TAG_SOURCE, level, gedcom.tags.MAX_TEXT_LENGTH))
             if self.__text:
-                gedcom_repr = gedcom_repr + '\n' + gf.split_text_for_gedcom(self.__text, gedcom.tags.GEDCOM_TAG_TEXT, level+1, gedcom.tags.MAX_TEXT_LENGTH)
+                lines.append(gf.split_text_for_gedcom(self.__text, gedcom.tags.GEDCOM_TAG_TEXT, level+1, gedcom.tags.MAX_TEXT_LENGTH))
         for multimedia in self.__multimedia_link:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, multimedia.get_gedcom_repr(level+1))
+            multimedia.emit_gedcom_lines(lines, level+1)
         for note in self.__notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note.get_gedcom_repr(level+1))
+            note.emit_gedcom_lines(lines, level+1)
         if self.__certainty_assessment:
-            gedcom_repr = "%s\n%s %s %s" % (gedcom_repr, level+1, gedcom.tags.GEDCOM_TAG_QUALITY_OF_DATA, self.__certainty_assessment)
-        return gedcom_repr
+            lines.append("%s %s %s" % (level+1, gedcom.tags.GEDCOM_TAG_QUALITY_OF_DATA, self.__certainty_assessment))
     pointer_source_record = property(get_pointer_source_record, set_pointer_source_record, del_pointer_source_record, "pointer_source_record's docstring")
     reference = property(get_reference, set_reference, del_reference, "reference's docstring")
     page = property(get_page, set_page, del_page, "page's docstring")
@@ -3987,6 +4212,27 @@ class SourceCitation(Record):
     notes = property(get_notes, set_notes, del_notes, "notes's docstring")
     certainty_assessment = property(get_certainty_assessment, set_certainty_assessment, del_certainty_assessment, "certainty_assessment's docstring")
 
+    # lines not in POINTER_PARSE_TABLE, except SOUR lines, abort the parsing of a citation of a source record
+    POINTER_PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_OBJECT, 1, substructure_handler(lambda: MultimediaLink(), "multimedia_link")),
+                                            (gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "notes")),
+                                            (gedcom.tags.GEDCOM_TAG_QUALITY_OF_DATA, None, value_handler("certainty_assessment")),
+                                            (gedcom.tags.GEDCOM_TAG_PAGE, 1, value_handler("page")),
+                                            (gedcom.tags.GEDCOM_TAG_EVENT, 1, value_handler("event")),
+                                            (gedcom.tags.GEDCOM_TAG_ROLE, 2, value_handler("event_role")),
+                                            (gedcom.tags.GEDCOM_TAG_DATA, 1, __parse_data),
+                                            (gedcom.tags.GEDCOM_TAG_DATE, 2, value_handler("data_date")),
+                                            (gedcom.tags.GEDCOM_TAG_TEXT, 2, continued_value_handler("text")),
+                                            (gedcom.tags.GEDCOM_TAG_CONCATENATION, 3, concatenated_value_handler("text")),
+                                            (gedcom.tags.GEDCOM_TAG_CONTINUED, 3, concatenated_value_handler("text", "\n")))
+
+    DESCRIPTION_PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_OBJECT, 1, substructure_handler(lambda: MultimediaLink(), "multimedia_link")),
+                                                (gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "notes")),
+                                                (gedcom.tags.GEDCOM_TAG_QUALITY_OF_DATA, None, value_handler("certainty_assessment")),
+                                                (gedcom.tags.GEDCOM_TAG_SOURCE, None, value_handler("description")),
+                                                (gedcom.tags.GEDCOM_TAG_TEXT, 1, continued_value_handler("text")),
+                                                (gedcom.tags.GEDCOM_TAG_CONCATENATION, 2, concatenated_value_handler("text")),
+                                                (gedcom.tags.GEDCOM_TAG_CONTINUED, 2, concatenated_value_handler("text", "\n")))
+
 
 class SpouseToFamilyLink(Record):
     def __init__(self):
@@ -4002,37 +4248,31 @@ class SpouseToFamilyLink(Record):
 
     def set_family_reference(self, value):
         self.__family_reference = value
+        self.mark_dirty()
 
     def set_notes(self, value):
         self.__notes = value
+        self.mark_dirty()
 
     def del_family_reference(self):
         del self.__family_reference
+        self.mark_dirty()
 
     def del_notes(self):
         del self.__notes
+        self.mark_dirty()
 
-    def parse_gedcom(self, gedcom_lines):
-        relevant_lines = gf.get_gedcom_relevant_lines(gedcom_lines)
-        self.__family_reference = relevant_lines[0].value
-        index = 0
-        starting_level = relevant_lines[0].level
-        while index < len(relevant_lines):
-            line = relevant_lines[index]
-            if line.tag == gedcom.tags.GEDCOM_TAG_NOTE and line.level == starting_level+1:
-                note = NoteStructure()
-                parsed_lines = note.parse_gedcom(relevant_lines[index:])
-                if parsed_lines:
-                    self.__notes.append(note)
-                    index += parsed_lines
-                    continue
-            index += 1
-        return len(relevant_lines)
+    def parse_gedcom(self, gedcom_lines, start=0, end=None):
+        relevant_end = gf.get_gedcom_relevant_end(gedcom_lines, start, end)
+        self.__family_reference = gedcom_lines[start].value
+        self.parse_lines(SpouseToFamilyLink.PARSE_TABLE, gedcom_lines, start, relevant_end)
+        return relevant_end - start
 
-    def get_gedcom_repr(self, level):
-        gedcom_repr = "%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_FAMILY_SPOUSE, self.__family_reference)
+    def emit_gedcom_lines(self, lines, level):
+        lines.append("%s %s %s" % (level, gedcom.tags.GEDCOM_TAG_FAMILY_SPOUSE, self.__family_reference))
         for note in self.__notes:
-            gedcom_repr = "%s\n%s" % (gedcom_repr, note.get_gedcom_repr(level+1))
-        return gedcom_repr
+            note.emit_gedcom_lines(lines, level+1)
     family_reference = property(get_family_reference, set_family_reference, del_family_reference, "family_reference's docstring")
     notes = property(get_notes, set_notes, del_notes, "notes's docstring")
+
+    PARSE_TABLE = build_parse_table((gedcom.tags.GEDCOM_TAG_NOTE, 1, substructure_handler(lambda: NoteStructure(), "notes")))
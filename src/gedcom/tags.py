@@ -1,3 +1,6 @@
+import types
+
+
 #
 # GEDCOM 5.5.1 standard tags
 #
@@ -561,6 +564,8 @@ INDIVIDUAL_NAME_UNKNOWN = "<Unknown>"
 
 MAX_TEXT_LENGTH = 200
 
+MAX_LEVEL = 99
+
 PERSONAL_NAME_PIECES_TAGS = [GEDCOM_TAG_NAME_PREFIX,
                              GEDCOM_TAG_GIVEN_NAME,
                              GEDCOM_TAG_NICKNAME,
@@ -640,4 +645,18 @@ IGNORED_INDIVIDUAL_RECORD_TAGS = [GEDCOM_TAG_ASSOCIATES,
                                   GEDCOM_TAG_LSD_ENDOWMENT,
                                   GEDCOM_TAG_LSD_SEALING_CHILD]
 
-IGNORED_FAMILY_RECORD_TAGS = [GEDCOM_TAG_LSD_SEALING_SPOUSE]
\ No newline at end of file
+IGNORED_FAMILY_RECORD_TAGS = [GEDCOM_TAG_LSD_SEALING_SPOUSE]
+
+# Tags interned to small integer ids, generated from the GEDCOM_TAG_ constants of this module:
+# TAG_NAMES maps an id to its tag, TAG_IDS a tag to its id; both are read-only, so that they can be shared by concurrent imports
+TAG_NAMES = tuple(sorted({value for name, value in list(globals().items()) if name.startswith("GEDCOM_TAG_")}))
+TAG_IDS = types.MappingProxyType({tag: tag_id for tag_id, tag in enumerate(TAG_NAMES)})
+# Id of all the tags not defined in this module (e.g. user defined tags), whose name is kept by their users (e.g. gedcom_file.GedcomLine)
+UNKNOWN_TAG_ID = len(TAG_NAMES)
+
+
+def get_tag_id(tag):
+    '''
+    Return the id of a tag, UNKNOWN_TAG_ID for the tags not defined in this module (e.g. user defined tags)
+    '''
+    return TAG_IDS.get(tag, UNKNOWN_TAG_ID)
\ No newline at end of file
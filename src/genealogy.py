@@ -3,12 +3,24 @@ from _version import __version__
 import gedcom.structures as gd
 import gedcom.gedcom_file as gf
 from gedcom import structures
+import gedcom.reader as gr
+import gedcom.streams as gs
 import re
+import os
 import gc
+import itertools
+import multiprocessing
+import concurrent.futures
 import gedcom.tags
 from enum import Enum
 
 
+# Chunks of the GEDCOM file assigned to each worker process by a parallel import, to balance their load
+IMPORT_CHUNKS_PER_WORKER = 4
+# Shards of the records serialized by each worker process of a parallel export
+EXPORT_SHARDS_PER_WORKER = 4
+
+
 class Relationship(Enum):
     PARENT = "0"
     CHILD = "1"
@@ -25,6 +37,43 @@ class RecordType(Enum):
     REPOSITORIES = "REPOSITORIES"  
 
 
+# Record types of the GEDCOM records, by level 0 tag
+RECORD_TYPES = {gedcom.tags.GEDCOM_TAG_INDIVIDUAL: RecordType.INDIVIDUALS,
+                gedcom.tags.GEDCOM_TAG_FAMILY: RecordType.FAMILIES,
+                gedcom.tags.GEDCOM_TAG_NOTE: RecordType.NOTES,
+                gedcom.tags.GEDCOM_TAG_SOURCE: RecordType.SOURCES,
+                gedcom.tags.GEDCOM_TAG_OBJECT: RecordType.OBJECTS,
+                gedcom.tags.GEDCOM_TAG_REPOSITORY: RecordType.REPOSITORIES}
+
+
+def get_gedcom_reprs(records):
+    '''
+    Return the GEDCOM representations at level 0 of a list of records, in the same order
+    Used by the worker processes of a parallel export, which receive a shard of the records of a genealogy
+    '''
+    return [record.get_gedcom_repr(0) for record in records]
+
+
+# Records of a parallel export, inherited by the worker processes forked by the exporting process (see share_records)
+shared_records = None
+
+
+def share_records(records):
+    '''
+    Initializer of the worker processes of a parallel export, keeping the records to be serialized by get_shared_gedcom_reprs
+    If the worker processes are forked, records are inherited from the exporting process without being pickled
+    '''
+    global shared_records
+    shared_records = records
+
+
+def get_shared_gedcom_reprs(start, end):
+    '''
+    Return the GEDCOM representations at level 0 of the records shared with share_records, from start to end (exclusive)
+    '''
+    return get_gedcom_reprs(shared_records[start:end])
+
+
 class Genealogy(object):
     '''
     The Genealogy object contains all the data of a given genealogy
@@ -45,13 +94,42 @@ class Genealogy(object):
         Dictionary of multimedia objects, whose keys are the multimedia' references
     __repositories: dict of gedcom.structures.Repository
         Dictionary of repositories, whose keys are the repositories' references
+    __import_validation: str
+        Validation mode of the lines used by the last import of a GEDCOM file, None if no file has been imported
+    __record_hashes: dict of bytes
+        Content hashes of the records imported from GEDCOM files with track_changes, whose keys are the records' references 
+        (see reload_changed); None if no file has been imported with track_changes
+    __lazy_family_links: dict of list
+        (tag, reference) pairs of the HUSB, WIFE and CHIL lines of the families imported with lazy and track_changes, 
+        whose keys are the families' references, to find the individuals of the families edited before being parsed
+    __raw_records: list of gedcom.structures.RawStructure
+        Header, submission, submitter and user-defined records kept unparsed by imports with passthrough, in file order
+    __cache_gedcom: bool
+        If True, get_gedcom and export_gedcom keep the GEDCOM representation of each record and serialize again only the dirty ones
+    __source_path: str
+        Path of the GEDCOM file imported with verbatim, whose unchanged records are copied by export_gedcom, None if there is none
+    __source_stat: tuple of int
+        Size and modification time of the file in __source_path when it was imported, to detect later changes of the file
+    __source_records: dict of gedcom.structures.Record
+        Records imported from the file in __source_path, whose keys are the records' references
     '''
 
-    def __init__(self, input_path = None):
+    def __init__(self, input_path = None, workers = 1, lazy = False, types = None, individual_tags = None, 
+                 buffer_size = gs.GEDCOM_STREAM_BLOCK_SIZE, validation = gf.STRICT_VALIDATION, passthrough = False, verbatim = False, 
+                 track_changes = False):
         '''
         Instantiates a Genealogy class, optionally starting from a GedcomFile object
         :param gedcom_file: GedcomFile object created starting from a GEDCOM file
         :type gedcom_file: gedcom.GedcomFile
+        :param workers: number of processes parsing the GEDCOM file in input_path (see import_gedcom_file)
+        :param lazy: if True, records of the GEDCOM file in input_path are parsed on first access (see import_gedcom_file)
+        :param types: record classes imported from the GEDCOM file in input_path (see import_gedcom_file)
+        :param individual_tags: level 1 tags of the substructures imported in individual records (see import_gedcom_file)
+        :param buffer_size: size of the blocks read from a stream in input_path (see import_gedcom_file)
+        :param validation: validation mode of the lines of the GEDCOM file in input_path (see import_gedcom_file)
+        :param passthrough: if True, unparsed records and structures of the GEDCOM file in input_path are kept (see import_gedcom_file)
+        :param verbatim: if True, unchanged records of the GEDCOM file in input_path are exported as they are (see import_gedcom_file)
+        :param track_changes: if True, records of the GEDCOM file in input_path are hashed for reload_changed (see import_gedcom_file)
         '''
         self.__G = nx.DiGraph()
         self.__individuals = {}
@@ -66,8 +144,17 @@ class Genealogy(object):
                               RecordType.SOURCES: 0, 
                               RecordType.OBJECTS: 0, 
                               RecordType.REPOSITORIES: 0}
+        self.__import_validation = None
+        self.__record_hashes = None
+        self.__lazy_family_links = {}
+        self.__raw_records = []
+        self.__cache_gedcom = False
+        self.__source_path = None
+        self.__source_stat = None
+        self.__source_records = {}
         if input_path:
-            self.import_gedcom_file(input_path)
+            self.import_gedcom_file(input_path, workers, lazy, types, individual_tags, buffer_size, validation, passthrough, verbatim, 
+                                    track_changes)
 
 
     def get_individuals_list(self):
@@ -84,56 +171,273 @@ class Genealogy(object):
         return self.__families.values()
 
 
-    def import_gedcom_file(self, input_path):
+    def import_gedcom_file(self, input_path, workers = 1, lazy = False, types = None, individual_tags = None, 
+                           buffer_size = gs.GEDCOM_STREAM_BLOCK_SIZE, validation = gf.STRICT_VALIDATION, passthrough = False, 
+                           verbatim = False, track_changes = False):
         '''
         It parses a GEDCOM file in input_path and populate header and records 
         GEDCOM version accepted is 5.5.1
-        :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+        If workers is greater than 1, the file is split into chunks on level 0 record boundaries, which are parsed
+        by a pool of processes; records are merged in file order, so the result is the same of the sequential import
+        If lazy is True, records are gedcom.reader.LazyRecord placeholders, parsed on first access to their attributes;
+        the relationships graph is built from FAMC, FAMS, HUSB and WIFE lines only, without parsing any record;
+        the file must not be changed until all its records are parsed, otherwise they fail to parse (see gedcom.reader.LazyRecordSource)
+        Records not in types, and substructures of individuals not in individual_tags, are skipped on the raw bytes of the file,
+        without being decoded nor tokenized; the relationships graph is built only if both individuals and families are imported
+        Compressed files (gzip, Zstandard, GEDZIP archives) are parsed while they are decompressed on a background thread,
+        without writing the decompressed content to disk (see gedcom.streams.open_gedcom_stream); workers and lazy are ignored for them
+        Instead of a file path, input_path can be the content of a GEDCOM file as bytes or a binary or text stream (e.g. sys.stdin,
+        the body of an HTTP request): streams are parsed as their blocks are read, without being spooled to disk, and are not read
+        any more once the import returns (see gedcom.streams.open_gedcom_input); workers and lazy are ignored for them
+        If passthrough is True, header, submission, submitter and user-defined records are kept as raw lines without being parsed 
+        (see raw_records), as well as the user-defined structures of the records and the structures ignored by current implementation
+        (e.g. IGNORED_INDIVIDUAL_RECORD_TAGS), which are attached to their records (see gedcom.structures.raw_structure_handler):
+        get_gedcom writes them back unchanged, so that a round trip keeps them
+        If verbatim is True, the span of each record in the file is kept, and export_gedcom copies the bytes of the records 
+        which have not been marked dirty since, by their setters or by the ones of their substructures (see 
+        gedcom.structures.Record.get_cached_gedcom_repr for the changes to be marked explicitly), from the file, instead of serializing them; 
+        the spans of a previous import with verbatim are discarded. Verbatim is ignored for compressed files, streams and imports 
+        with individual_tags, and it requires the file not to be changed until the export: otherwise all the records are serialized
+        If track_changes is True, the records of the file are hashed with a raw scan of its bytes (see gedcom.reader.hash_records), 
+        so that reload_changed can later reparse only the edited ones; it is ignored for compressed files and streams
+        :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged", "C:\\users\\public\\mytree.ged.gz"), 
+                           bytes or stream
+        :param workers: number of processes parsing the file; ignored if lazy is True
+        :param lazy: if True, records are parsed on first access
+        :param types: record classes to be imported (e.g. (gedcom.structures.Individual, gedcom.structures.Family)); if None all of them are imported
+        :param individual_tags: level 1 tags of the substructures to be imported in individual records 
+                                (e.g. ["NAME", "BIRT", "DEAT", "FAMC", "FAMS"]); if None all of them are imported
+        :param buffer_size: size of the blocks read from a binary stream or decompressed from a compressed file at a time;
+                            ignored for text streams, which are read through their own buffer
+        :param validation: gedcom.gedcom_file.STRICT_VALIDATION to skip the lines not satisfying is_valid_gedcom_line, 
+                           gedcom.gedcom_file.LENIENT_VALIDATION to accept also lines without terminator,
+                           gedcom.gedcom_file.TRUSTED_INPUT to split the lines on spaces without any check, for files produced
+                           and already validated by a trusted pipeline; the mode used is reported by import_validation
+        :param passthrough: if True, records and structures not parsed by current implementation are kept unparsed
+        :param verbatim: if True, unchanged records are exported copying their bytes from the file
+        :param track_changes: if True, the records are hashed to be reloaded by reload_changed
+        '''
+        # HEADER record is mandatory and must be the first one; however in this implementation the content is not parsed
+        # Content of SUBMISSION and SUBMITTER records, and of user-defined tags, is discarded unless passthrough is True
+        tags = gr.get_record_tags(types)
+        projection = {gedcom.tags.GEDCOM_TAG_INDIVIDUAL: individual_tags} if individual_tags is not None else None
+        populate_graph = gedcom.tags.GEDCOM_TAG_INDIVIDUAL in tags and gedcom.tags.GEDCOM_TAG_FAMILY in tags
+        validate, trusted = gf.get_validation_arguments(validation)
+        self.__import_validation = validation
+        stream = not isinstance(input_path, (str, os.PathLike))
+        compressed = not stream and gs.get_compression(input_path) is not None
+        lazy = lazy and not stream and not compressed
+        record_spans = None
+        if track_changes and not stream and not compressed:
+            record_hashes = gr.hash_records(input_path, tags)
+            if self.__record_hashes is None:
+                self.__record_hashes = {}
+            self.__record_hashes.update({reference: record_hash for reference, (span, record_hash) in record_hashes.items()})
+            record_spans = {reference: span for reference, (span, record_hash) in record_hashes.items()}
+        if lazy:
+            records, links = gr.read_lazy_records(input_path, validate, tags, projection, passthrough, trusted)
+            self.__add_parsed_records([(records, True)])
+            if track_changes:
+                self.__lazy_family_links.update({reference: links[reference] for reference in record_spans 
+                                                 if record_spans[reference].tag == gedcom.tags.GEDCOM_TAG_FAMILY and reference in links})
+        elif stream or compressed:
+            with (gs.open_gedcom_input if stream else gs.open_gedcom_stream)(input_path, buffer_size) as lines:
+                self.__add_parsed_records([gr.parse_record_stream(lines, validate, tags, projection, passthrough, trusted)])
+        elif workers > 1:
+            with gf.GedcomFileMap(input_path) as gedcom_map:
+                chunks = gedcom_map.split_records(workers * IMPORT_CHUNKS_PER_WORKER)
+            with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+                parsed_chunks = executor.map(gr.parse_record_chunk, *zip(*[(input_path,) + chunk + (validate, tags, projection, None, passthrough, trusted) 
+                                                                                 for chunk in chunks]))
+                self.__add_parsed_records(parsed_chunks)
+        else:
+            self.__add_parsed_records([gr.parse_record_chunk(input_path, validate=validate, tags=tags, projection=projection, 
+                                                             passthrough=passthrough, trusted=trusted)])
+        if populate_graph and lazy:
+            self.__populate_relationships_graph_from_links(links)
+        elif populate_graph:
+            for individual in self.__individuals.values():
+                self.populate_relationships_graph(individual, self.__individuals, self.__families)
+        if verbatim and not stream and not compressed and projection is None:
+            self.__keep_source_records(input_path, record_spans if record_spans is not None else gr.get_record_spans(input_path, tags))
+
+
+    def __keep_source_records(self, input_path, record_spans):
         '''
-        gedcom_lines_list = []
-        with open(input_path, mode='r', encoding='utf-8-sig') as content_file:
-            content = content_file.readlines()
-        for index, line in enumerate(content):
-            if gf.is_valid_gedcom_line(line):
-                gedcom_lines_list.append(gf.GedcomLine(line, index))
-        # HEADER record is mandatory and must be the first one; however in this implementation the content will be discarded
-        parsed_lines = gd.Header().parse_gedcom(gedcom_lines_list)
-        for line_zero_index in [line for line in gedcom_lines_list[parsed_lines:] if line.level==0]:
-            # Submission record is optional
-            if line_zero_index.tag == gedcom.tags.GEDCOM_TAG_INDIVIDUAL:
-                record = gd.Individual()
-                record.parse_gedcom(gedcom_lines_list[line_zero_index.gedcom_index:])
-                self.__individuals[record.reference] = record
-            elif line_zero_index.tag == gedcom.tags.GEDCOM_TAG_FAMILY:
-                record = gd.Family()
-                record.parse_gedcom(gedcom_lines_list[line_zero_index.gedcom_index:])
-                self.__families[record.reference] = record
-            elif line_zero_index.tag == gedcom.tags.GEDCOM_TAG_OBJECT:
-                record = gd.Multimedia()
-                record.parse_gedcom(gedcom_lines_list[line_zero_index.gedcom_index:])
-                self.__multimedia[record.reference] = record
-            elif line_zero_index.tag == gedcom.tags.GEDCOM_TAG_NOTE:
-                record = gd.Note()
-                record.parse_gedcom(gedcom_lines_list[line_zero_index.gedcom_index:])
-                self.__notes[record.reference] = record
-            elif line_zero_index.tag == gedcom.tags.GEDCOM_TAG_REPOSITORY:
-                record = gd.Repository()
-                record.parse_gedcom(gedcom_lines_list[line_zero_index.gedcom_index:])
-                self.__repositories[record.reference] = record
-            elif line_zero_index.tag == gedcom.tags.GEDCOM_TAG_SOURCE:
-                record = gd.Source()
-                record.parse_gedcom(gedcom_lines_list[line_zero_index.gedcom_index:])
-                self.__sources[record.reference] = record
-            # Content of SUBMISSION and SUBMITTER records will be discarded in this implementation
-            # Content of user-defined tags will be discarded in this implementation
-            elif line_zero_index.tag in (gedcom.tags.GEDCOM_TAG_SUBMITTER, gedcom.tags.GEDCOM_TAG_SUBMISSION) or line_zero_index.is_user_defined_tag():
-                continue
-            elif line_zero_index.is_last_gedcom_line():
-                break
-            else:
+        Keeps the spans of the records just imported from input_path, whose bytes are copied by export_gedcom while they are unchanged
+        :param record_spans: spans of the records of the file by reference, as returned by gedcom.reader.get_record_spans
+        '''
+        records = {**self.__individuals, **self.__families, **self.__notes, **self.__sources, **self.__multimedia, **self.__repositories}
+        self.__source_records = {}
+        for reference, span in record_spans.items():
+            record = records.get(reference)
+            if record is not None:
+                if not isinstance(record, gr.LazyRecord):
+                    # lazy records keep their own span until they are parsed
+                    record.set_source_span(span)
+                self.__source_records[reference] = record
+        self.__source_path = input_path
+        self.__source_stat = self.__get_source_stat(input_path)
+
+
+    def __get_source_stat(self, input_path):
+        try:
+            stat = os.stat(input_path)
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+
+    def __drop_source_records(self):
+        '''
+        Discards the spans kept by an import with verbatim, so that export_gedcom serializes all the records
+        '''
+        self.__source_path = None
+        self.__source_stat = None
+        self.__source_records = {}
+
+
+    def __get_source_span(self, record):
+        '''
+        Return the span of an unchanged record in the file imported with verbatim, None if the record is not unchanged from that file
+        '''
+        if self.__source_records.get(record.reference) is not record:
+            return None
+        return record.get_source_span()
+
+
+    def reload_changed(self, input_path, validation = gf.STRICT_VALIDATION, types = None, individual_tags = None):
+        '''
+        Reloads a GEDCOM file imported by import_gedcom_file after it has been edited, reparsing only its changed records
+        The records of the file are hashed with a raw scan of its bytes (see gedcom.reader.hash_records) and compared with the hashes
+        kept by the last import or reload: new and changed records are parsed and replace the existing ones, deleted records are removed,
+        and the relationships graph is patched only around the individuals of the changed individuals and families, so that
+        besides the scan the time depends on the size of the edit; records not imported from a file (e.g. added with add_new_record) are kept
+        The individuals of a family are assumed to be linked consistently, i.e. to be found through its HUSB, WIFE and CHIL lines
+        The file must have been imported with track_changes, which hashes its records; compressed files and streams are not supported
+        Records imported with verbatim are no longer copied from the file by export_gedcom, since their spans have changed;
+        unchanged records of a lazy import which are not parsed yet are read from the edited file, when parsed
+        :param input_path: input file path of GEDCOM file (e.g. "C:\\users\\public\\mytree.ged")
+        :param validation: validation mode of the lines of the changed records (see import_gedcom_file)
+        :param types: record classes to be reloaded, which should be the ones imported (see import_gedcom_file)
+        :param individual_tags: level 1 tags of the substructures to be reloaded in individual records (see import_gedcom_file)
+        :return: references of the reparsed records, and references of the removed records
+        '''
+        tags = gr.get_record_tags(types)
+        projection = {gedcom.tags.GEDCOM_TAG_INDIVIDUAL: individual_tags} if individual_tags is not None else None
+        records_by_tag = {gedcom.tags.GEDCOM_TAG_INDIVIDUAL: self.__individuals,
+                          gedcom.tags.GEDCOM_TAG_FAMILY: self.__families,
+                          gedcom.tags.GEDCOM_TAG_OBJECT: self.__multimedia,
+                          gedcom.tags.GEDCOM_TAG_NOTE: self.__notes,
+                          gedcom.tags.GEDCOM_TAG_REPOSITORY: self.__repositories,
+                          gedcom.tags.GEDCOM_TAG_SOURCE: self.__sources}
+        validate, trusted = gf.get_validation_arguments(validation)
+        if self.__record_hashes is None:
+            raise ValueError("no GEDCOM file has been imported with track_changes, so changes of %s cannot be detected" % input_path)
+        self.__drop_source_records()
+        record_hashes = gr.hash_records(input_path, tags)
+        changed_spans = [span for reference, (span, record_hash) in record_hashes.items() if self.__record_hashes.get(reference) != record_hash]
+        deleted_references = [reference for reference in self.__record_hashes if reference not in record_hashes]
+        changed_records = gr.parse_record_spans(input_path, changed_spans, validate, projection, trusted)
+        # unchanged records of a lazy import, not parsed yet, are moved to their offsets in the edited file
+        lazy_source = None
+        for reference, (span, record_hash) in record_hashes.items():
+            record = records_by_tag[span.tag].get(reference)
+            if isinstance(record, gr.LazyRecord) and self.__record_hashes.get(reference) == record_hash:
+                if lazy_source is None:
+                    lazy_source = gr.LazyRecordSource(input_path)
+                record.relocate(lazy_source, span)
+        # individuals whose relationships may have changed, before and after the reload
+        affected_references = set()
+        for family in [self.__families.get(span.pointer) for span in changed_spans] + [self.__families.get(reference) for reference in deleted_references] + \
+                      [record for record in changed_records if isinstance(record, gd.Family)]:
+            if family is not None:
+                affected_references.update(self.__get_family_member_references(family))
+        affected_references.update(span.pointer for span in changed_spans if span.tag == gedcom.tags.GEDCOM_TAG_INDIVIDUAL)
+        affected_references.update(reference for reference in deleted_references if reference in self.__individuals)
+        neighbor_references = set()
+        for reference in affected_references:
+            individual = self.__individuals.get(reference)
+            if individual is not None and self.G.has_node(individual):
+                neighbor_references.update(neighbor.reference for neighbor in self.G.predecessors(individual))
+                neighbor_references.update(neighbor.reference for neighbor in self.G.successors(individual))
+                self.G.remove_node(individual)
+        for reference in deleted_references:
+            for records in records_by_tag.values():
+                records.pop(reference, None)
+            del self.__record_hashes[reference]
+        for reference in deleted_references + [span.pointer for span in changed_spans]:
+            self.__lazy_family_links.pop(reference, None)
+        for span, record in zip(changed_spans, changed_records):
+            records_by_tag[span.tag][span.pointer] = record
+            self.__record_hashes[span.pointer] = record_hashes[span.pointer][1]
+            self.__max_indexes[RECORD_TYPES[span.tag]] = 0
+        if gedcom.tags.GEDCOM_TAG_INDIVIDUAL in tags and gedcom.tags.GEDCOM_TAG_FAMILY in tags:
+            for reference in affected_references | neighbor_references:
+                if reference in self.__individuals:
+                    self.populate_relationships_graph(self.__individuals[reference], self.__individuals, self.__families)
+        return [span.pointer for span in changed_spans], deleted_references
+
+
+    def __get_family_member_references(self, family):
+        # References of the individuals of a family, taken from the links of its lazy import if it has not been parsed yet,
+        # since the file it would be parsed from may have changed
+        if isinstance(family, gr.LazyRecord):
+            return [reference for tag, reference in self.__lazy_family_links.get(family.reference, [])]
+        return [family.husband_reference, family.wife_reference] + family.children_references
+
+
+    def __add_parsed_records(self, parsed_chunks):
+        records_by_tag = {gedcom.tags.GEDCOM_TAG_INDIVIDUAL: self.__individuals,
+                          gedcom.tags.GEDCOM_TAG_FAMILY: self.__families,
+                          gedcom.tags.GEDCOM_TAG_OBJECT: self.__multimedia,
+                          gedcom.tags.GEDCOM_TAG_NOTE: self.__notes,
+                          gedcom.tags.GEDCOM_TAG_REPOSITORY: self.__repositories,
+                          gedcom.tags.GEDCOM_TAG_SOURCE: self.__sources}
+        records_by_class = {record_class: records_by_tag[tag] for record_classes in (gr.RECORD_CLASSES, gr.LAZY_RECORD_CLASSES) 
+                            for tag, record_class in record_classes.items()}
+        for records, completed in parsed_chunks:
+            for record in records:
+                if isinstance(record, gd.RawStructure):
+                    self.__raw_records.append(record)
+                    continue
+                records_by_class[type(record)][record.reference] = record
+            if not completed:
                 break
-        for individual in self.__individuals.values():
-            self.populate_relationships_graph(individual, self.__individuals, self.__families)
+
+
+    def __populate_relationships_graph_from_links(self, links):
+        # Same relationships of populate_relationships_graph, taken from the (tag, reference) links of the records just imported
+        family_links = {reference: dict(links[reference]) for reference in self.__families if reference in links}
+        for reference, individual in self.__individuals.items():
+            if reference not in links:
+                # imported before, already in the graph
+                continue
+            self.G.add_node(individual)
+            for tag, family_reference in links[reference]:
+                if tag == gedcom.tags.GEDCOM_TAG_FAMILY_CHILD:
+                    for parent_tag in (gedcom.tags.GEDCOM_TAG_HUSBAND, gedcom.tags.GEDCOM_TAG_WIFE):
+                        parent_reference = self.__get_family_links(family_links, family_reference).get(parent_tag)
+                        if parent_reference:
+                            parent = self.__individuals[parent_reference]
+                            self.G.add_node(parent)
+                            self.G.add_edge(parent, individual, relationship = Relationship.PARENT)
+            for tag, family_reference in links[reference]:
+                if tag == gedcom.tags.GEDCOM_TAG_FAMILY_SPOUSE:
+                    husband_reference = self.__get_family_links(family_links, family_reference).get(gedcom.tags.GEDCOM_TAG_HUSBAND)
+                    if husband_reference and reference != husband_reference:
+                        spouse = self.get_individual_by_ref(husband_reference)
+                        self.G.add_edge(individual, spouse, relationship = Relationship.PARTNER)
+                        self.G.add_edge(spouse, individual, relationship = Relationship.PARTNER)
+
+
+    def __get_family_links(self, family_links, family_reference):
+        # Links of a family by tag, taken from the family record if it has not been imported with links (e.g. imported before)
+        if family_reference not in family_links:
+            family = self.__families.get(family_reference)
+            family_links[family_reference] = {} if family is None else {gedcom.tags.GEDCOM_TAG_HUSBAND: family.husband_reference, 
+                                                                        gedcom.tags.GEDCOM_TAG_WIFE: family.wife_reference}
+        return family_links[family_reference]
 
 
     def link_genealogy(self, new_genealogy, existing_individual, new_genealogy_individual, relationship):
@@ -189,6 +493,51 @@ class Genealogy(object):
                 self.populate_relationships_graph(individual, self.__individuals, self.__families)
 
 
+    def import_gedcom_files(self, input_paths, workers = 1, validation = gf.STRICT_VALIDATION):
+        '''
+        Imports several GEDCOM files (e.g. branches contributed by different researchers) as disconnected genealogies, 
+        as add_disconnected_genealogy does, parsing them concurrently in a pool of processes
+        Before parsing, each file gets a range of reference numbers for each record type, after the ones of this genealogy and of 
+        the previous files, sized by a raw count of its records (see gedcom.gedcom_file.GedcomFileMap.count_record_tags): 
+        records are numbered in their range while they are parsed (see gedcom.reader.parse_renumbered_file), so that no reference 
+        collides and no renaming pass is needed; the relationships graph is built once, after all the files are parsed
+        :param input_paths: input file paths of GEDCOM files
+        :param workers: number of processes parsing the files
+        :param validation: validation mode of the lines of the files (see import_gedcom_file)
+        '''
+        records_by_tag = {gedcom.tags.GEDCOM_TAG_INDIVIDUAL: (self.__individuals, RecordType.INDIVIDUALS),
+                          gedcom.tags.GEDCOM_TAG_FAMILY: (self.__families, RecordType.FAMILIES),
+                          gedcom.tags.GEDCOM_TAG_NOTE: (self.__notes, RecordType.NOTES),
+                          gedcom.tags.GEDCOM_TAG_SOURCE: (self.__sources, RecordType.SOURCES),
+                          gedcom.tags.GEDCOM_TAG_OBJECT: (self.__multimedia, RecordType.OBJECTS),
+                          gedcom.tags.GEDCOM_TAG_REPOSITORY: (self.__repositories, RecordType.REPOSITORIES)}
+        next_numbers = {tag: self.get_next_available_gedcom_id(records, records_type) if records else 1
+                        for tag, (records, records_type) in records_by_tag.items()}
+        first_numbers = []
+        for input_path in input_paths:
+            with gf.GedcomFileMap(input_path) as gedcom_map:
+                record_counts = gedcom_map.count_record_tags()
+            first_numbers.append(dict(next_numbers))
+            for tag in next_numbers:
+                next_numbers[tag] += record_counts[tag]
+        validate, trusted = gf.get_validation_arguments(validation)
+        arguments = (input_paths, first_numbers, [validate] * len(input_paths), [trusted] * len(input_paths))
+        if workers > 1:
+            with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+                parsed_files = list(executor.map(gr.parse_renumbered_file, *arguments))
+        else:
+            parsed_files = map(gr.parse_renumbered_file, *arguments)
+        individuals = []
+        for records, completed in parsed_files:
+            self.__add_parsed_records([(records, completed)])
+            individuals.extend(record for record in records if isinstance(record, gd.Individual))
+        for tag, (records, records_type) in records_by_tag.items():
+            if records:
+                self.__max_indexes[records_type] = next_numbers[tag] - 1
+        for individual in individuals:
+            self.populate_relationships_graph(individual, self.__individuals, self.__families)
+
+
     def populate_relationships_graph(self, existing_individual, individuals, families):
         '''
         Adds an existing individual to the genealogy
@@ -339,10 +688,13 @@ class Genealogy(object):
         :param note: note to be removed
         :type note: Note
         '''
+        changed_structures = []
         for record in [record for record in gc.get_objects() if isinstance(record, structures.Record) and hasattr(record, 'notes')]:
             for i, note_structure in enumerate(record.notes):
                 if note_structure.reference == note_to_be_removed.reference:
                     del record.notes[i]
+                    changed_structures.append(record)
+        self.__mark_dirty_records(changed_structures)
         if note_to_be_removed.reference in self.__notes.keys():
             del self.__notes[note_to_be_removed.reference]
 
@@ -353,10 +705,13 @@ class Genealogy(object):
         :param source: source to be removed
         :type source: Source
         '''
+        changed_structures = []
         for record in [record for record in gc.get_objects() if isinstance(record, structures.Record) and hasattr(record, 'sources')]:
             for i, source_citation in enumerate(record.sources):
                 if source_citation.reference == source_to_be_removed.reference:
                     del record.sources[i]
+                    changed_structures.append(record)
+        self.__mark_dirty_records(changed_structures)
         if source_to_be_removed.reference in self.__sources.keys():
             del self.__sources[source_to_be_removed.reference]
 
@@ -367,10 +722,13 @@ class Genealogy(object):
         :param multimedia: source to be removed
         :type multimedia: Multimedia
         '''
+        changed_structures = []
         for record in [record for record in gc.get_objects() if isinstance(record, structures.Record) and hasattr(record, 'multimedia_links')]:
             for i, multimedia_link in enumerate(record.multimedia_links):
                 if multimedia_link.reference == multimedia_to_be_removed.reference:
                     del record.multimedia_links[i]
+                    changed_structures.append(record)
+        self.__mark_dirty_records(changed_structures)
         if multimedia_to_be_removed.reference in self.__multimedia.keys():
             del self.__multimedia[multimedia_to_be_removed.reference]
 
@@ -381,14 +739,26 @@ class Genealogy(object):
         :param source: source to be removed
         :type source: Source
         '''
+        changed_structures = []
         for record in [record for record in gc.get_objects() if isinstance(record, structures.Record) and hasattr(record, 'repositories')]:
             for i, repo in enumerate(record.repositories):
                 if repo.reference == repository_to_be_removed.reference:
                     del record.repositories[i]
+                    changed_structures.append(record)
+        self.__mark_dirty_records(changed_structures)
         if repository_to_be_removed.reference in self.__repositories.keys():
             del self.__repositories[repository_to_be_removed.reference]
 
 
+    def __mark_dirty_records(self, changed_structures):
+        '''
+        Marks dirty the records of the genealogy which are, or contain at any depth, one of changed_structures
+        (see gedcom.structures.Record.get_cached_gedcom_repr); each structure marks dirty the structures owning it, up to its record
+        '''
+        for structure in changed_structures:
+            structure.mark_dirty()
+
+
     def rename_note_reference(self, old_reference, new_reference):
         '''
         Renames a note reference from old_reference to new_reference in the whole genealogy
@@ -400,11 +770,14 @@ class Genealogy(object):
             del self.__notes[old_reference]
             self.__notes[new_reference] = note
             note.reference = new_reference
+            changed_structures = []
             for note in [note for note in gc.get_objects() 
                          if (isinstance(note, structures.Note) or isinstance(note, structures.NoteStructure)) 
                          and note.reference == old_reference
                          and note in self.__notes]:
                 note.reference = new_reference
+                changed_structures.append(note)
+            self.__mark_dirty_records(changed_structures)
 
 
     def rename_source_reference(self, old_reference, new_reference):
@@ -418,11 +791,14 @@ class Genealogy(object):
             del self.__sources[old_reference]
             self.__sources[new_reference] = source
             source.reference = new_reference
+            changed_structures = []
             for source in [source for source in gc.get_objects() 
                            if (isinstance(source, structures.Source) or isinstance(source, structures.SourceCitation)) 
                            and source.reference == old_reference
                            and source in self.__sources]:
                 source.reference = new_reference
+                changed_structures.append(source)
+            self.__mark_dirty_records(changed_structures)
 
 
     def rename_multimedia_reference(self, old_reference, new_reference):
@@ -436,11 +812,14 @@ class Genealogy(object):
             del self.__multimedia[old_reference]
             self.__multimedia[new_reference] = multimedia_link
             multimedia_link.reference = new_reference
+            changed_structures = []
             for multimedia_link in [multimedia_link for multimedia_link in gc.get_objects() 
                                     if isinstance(multimedia_link, structures.MultimediaLink) 
                                     and multimedia_link.reference == old_reference
                                     and multimedia_link in self.__multimedia]:
                 multimedia_link.reference = new_reference
+                changed_structures.append(multimedia_link)
+            self.__mark_dirty_records(changed_structures)
 
 
     def rename_repository_reference(self, old_reference, new_reference):
@@ -454,11 +833,14 @@ class Genealogy(object):
             del self.__repositories[old_reference]
             self.__repositories[new_reference] = repository
             repository.reference = new_reference
+            changed_structures = []
             for repository in [repository for repository in gc.get_objects() 
                                if isinstance(repository, structures.Repository) 
                                and repository.reference == old_reference
                                and repository in self.__repositories]:
                 repository.reference = new_reference
+                changed_structures.append(repository)
+            self.__mark_dirty_records(changed_structures)
 
 
     def rename_family_reference(self, old_reference, new_reference):
@@ -476,9 +858,11 @@ class Genealogy(object):
                 for child_link in individual.child_to_family_links:
                     if child_link.family_reference == old_reference:
                         child_link.family_reference = new_reference
+                        individual.mark_dirty()
                 for spouse_link in individual.spouse_to_family_links:
                     if spouse_link.family_reference == old_reference:
                         spouse_link.family_reference = new_reference
+                        individual.mark_dirty()
 
 
     def rename_individual_reference(self, old_reference, new_reference):
@@ -493,11 +877,15 @@ class Genealogy(object):
             self.__individuals[new_reference] = individual
             individual.reference = new_reference
             for family in self.__families.values():
-                family.husband_reference = new_reference if family.husband_reference == old_reference else family.husband_reference
-                family.wife_reference = new_reference if family.wife_reference == old_reference else family.wife_reference
+                # references are set only if they change, so that the other families stay clean (see get_cached_gedcom_repr)
+                if family.husband_reference == old_reference:
+                    family.husband_reference = new_reference
+                if family.wife_reference == old_reference:
+                    family.wife_reference = new_reference
                 for n, child_reference in enumerate(family.children_references):
                     if child_reference == old_reference:
                         family.children_references[n] = new_reference
+                        family.mark_dirty()
     
     
     def add_and_link_individual(self, new_individual, existing_individual, relationship):
@@ -629,6 +1017,7 @@ class Genealogy(object):
             child_to_family_link = gd.ChildToFamilyLink()
             child_to_family_link.family_reference = family_reference
             child.child_to_family_links.append(child_to_family_link)
+            child.mark_dirty()
             self.__families[family_reference].children_references.append(child.reference)
             self.__families[family_reference].number_children += 1
     
@@ -643,6 +1032,7 @@ class Genealogy(object):
         spouse_to_family_link.family_reference = family_reference
         if family_reference not in [stfl.family_reference for stfl in parent.spouse_to_family_links]:
             parent.spouse_to_family_links.append(spouse_to_family_link)
+            parent.mark_dirty()
         self.__families[family_reference].add_partner_reference(parent)
 
 
@@ -796,17 +1186,161 @@ class Genealogy(object):
         return self.__max_indexes[records_type]
     
     
-    def get_gedcom(self) -> str:
+    def iter_gedcom_records(self, workers = 1):
         '''
-        Returns a GEDCOM representation of Genealogy as a string
+        Yields the GEDCOM representation of each record of Genealogy, from the header to the trailer, one record at a time
+        Raw records kept by an import with passthrough are written unchanged after the header; the first raw header, 
+        if any, replaces the one generated by pigen
+        If cache_gedcom is True, only the records marked dirty since the last export are serialized again
+        If workers is greater than 1, the records are split into shards which are serialized by a pool of processes
+        (see get_gedcom_reprs), and yielded in the same order of the sequential export
+        :param workers: number of processes serializing the records
         '''
-        header = gd.Header(__version__, "pigen", "5.5")
-        gedcom_repr = header.get_gedcom_repr(0)
+        yield from self.__iter_header_gedcom_reprs()
         records = {**self.__individuals, **self.__families, **self.__notes, **self.__sources, **self.__multimedia, **self.__repositories}
-        for record in (records.values()):
-            gedcom_repr = "%s\n%s" % (gedcom_repr, record.get_gedcom_repr(0))
-        gedcom_repr = "%s\n0 %s" % (gedcom_repr, gedcom.tags.GEDCOM_TAG_TRAILER)
-        return gedcom_repr
+        yield from self.__iter_record_gedcom_reprs(list(records.values()), workers)
+        yield "0 %s" % gedcom.tags.GEDCOM_TAG_TRAILER
+
+
+    def __iter_header_gedcom_reprs(self):
+        # The header, followed by the other raw records
+        header = next((record for record in self.__raw_records if record.tag == gedcom.tags.GEDCOM_TAG_HEADER), None)
+        if header is None:
+            header = gd.Header(__version__, "pigen", "5.5")
+        yield header.get_gedcom_repr(0)
+        for raw_record in self.__raw_records:
+            if raw_record.tag != gedcom.tags.GEDCOM_TAG_HEADER:
+                yield raw_record.get_gedcom_repr(0)
+
+
+    def __iter_record_gedcom_reprs(self, records, workers):
+        # The records, serialized sequentially or by a pool of workers processes
+        if workers > 1:
+            yield from self.__iter_parallel_gedcom_reprs(records, workers)
+        else:
+            for record in records:
+                yield record.get_cached_gedcom_repr() if self.__cache_gedcom else record.get_gedcom_repr(0)
+
+
+    def __iter_parallel_gedcom_reprs(self, records, workers):
+        '''
+        Yields the GEDCOM representation of each record in records, serializing the records in shards of consecutive records
+        by a pool of processes; if cache_gedcom is True, only the dirty records are serialized by the pool, and their cache is updated
+        Where processes can be forked, the worker processes inherit the records and receive only the bounds of their shards, 
+        since pickling the records would take longer than serializing them; otherwise the shards are pickled
+        Lazy records not yet parsed are parsed before the pool is started, since they refer to the memory-mapped file
+        '''
+        dirty = [not self.__cache_gedcom or record.is_dirty() for record in records]
+        dirty_records = list(itertools.compress(records, dirty))
+        for record in dirty_records:
+            if isinstance(record, gr.LazyRecord):
+                record.materialize()
+        shard_size = max(1, -(-len(dirty_records) // (workers * EXPORT_SHARDS_PER_WORKER)))
+        starts = range(0, len(dirty_records), shard_size)
+        if "fork" in multiprocessing.get_all_start_methods():
+            executor = concurrent.futures.ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"),
+                                                              initializer=share_records, initargs=(dirty_records,))
+            shards = executor.map(get_shared_gedcom_reprs, starts, [start + shard_size for start in starts])
+        else:
+            executor = concurrent.futures.ProcessPoolExecutor(workers)
+            shards = executor.map(get_gedcom_reprs, [dirty_records[start:start + shard_size] for start in starts])
+        with executor:
+            gedcom_reprs = itertools.chain.from_iterable(shards)
+            for record, record_dirty in zip(records, dirty):
+                if not record_dirty:
+                    yield record.get_cached_gedcom_repr()
+                    continue
+                gedcom_repr = next(gedcom_reprs)
+                if self.__cache_gedcom:
+                    record.cache_gedcom_repr(gedcom_repr)
+                yield gedcom_repr
+
+
+    def get_gedcom(self, workers = 1) -> str:
+        '''
+        Returns a GEDCOM representation of Genealogy as a string
+        :param workers: number of processes serializing the records (see iter_gedcom_records)
+        '''
+        return "\n".join(self.iter_gedcom_records(workers))
+
+
+    def export_gedcom(self, destination, buffer_size = gs.GEDCOM_STREAM_BLOCK_SIZE, workers = 1):
+        '''
+        Writes the GEDCOM representation of Genealogy, as returned by get_gedcom, UTF-8 encoded to a file or a stream
+        Records are written as they are serialized, through a buffer of buffer_size (see gedcom.streams.open_gedcom_output), 
+        so that only one record at a time is kept in memory, whatever the size of the genealogy
+        If workers is greater than 1, records are serialized by a pool of processes and written in order as their shards are completed
+        (see iter_gedcom_records): the output is the same of the sequential export
+        If records have been imported with verbatim (see import_gedcom_file), the bytes of the ones not marked dirty since are copied 
+        from the memory-mapped file, with a single write for each run of records adjacent in the file, and only the changed and 
+        the new records are serialized: unchanged records keep the lines and the line terminators of the file, including the ones
+        not parsed by current implementation, so the output may differ from get_gedcom
+        :param destination: output file path (e.g. "C:\\users\\public\\mytree.ged"), binary stream (e.g. sys.stdout.buffer) 
+                            or text stream; streams are not closed
+        :param buffer_size: size of the blocks written to destination
+        :param workers: number of processes serializing the records
+        '''
+        if self.__source_path is not None and self.__get_source_stat(self.__source_path) != self.__source_stat:
+            # the file has been changed since the import, so the spans no longer locate the records
+            self.__drop_source_records()
+        with gs.open_gedcom_output(destination, buffer_size) as output:
+            if self.__source_path is not None:
+                self.__write_verbatim_gedcom(output, workers)
+                return
+            separator = ""
+            for gedcom_repr in self.iter_gedcom_records(workers):
+                output.write(separator)
+                output.write(gedcom_repr)
+                separator = "\n"
+
+
+    def __write_verbatim_gedcom(self, output, workers):
+        '''
+        Writes the GEDCOM representation of Genealogy to a text stream as export_gedcom does, copying the unchanged records 
+        imported with verbatim from the memory-mapped file: if output encodes its text as UTF-8, the bytes are written straight 
+        to its binary stream (see gedcom.streams.get_binary_output), otherwise they are decoded
+        '''
+        binary_output = gs.get_binary_output(output)
+        with gf.GedcomFileMap(self.__source_path) as gedcom_map:
+            separator = ""
+            for gedcom_repr in self.__iter_verbatim_gedcom_reprs(workers):
+                output.write(separator)
+                if isinstance(gedcom_repr, str):
+                    output.write(gedcom_repr)
+                    separator = "\n"
+                    continue
+                start, end = gedcom_repr
+                if binary_output is not None:
+                    output.flush()
+                    gedcom_map.write_bytes(binary_output, start, end)
+                else:
+                    output.write(gedcom_map.get_bytes(start, end).decode('utf-8'))
+                # the last line of the run keeps its terminator, unless it is the last line of the file
+                separator = "" if gedcom_map.get_bytes(end - 1, end) in (b"\n", b"\r") else "\n"
+
+
+    def __iter_verbatim_gedcom_reprs(self, workers):
+        '''
+        Yields the GEDCOM representations of iter_gedcom_records, except for the unchanged records imported with verbatim, 
+        for which the (start, end) offsets of each run of records adjacent in the file are yielded
+        '''
+        yield from self.__iter_header_gedcom_reprs()
+        records = list({**self.__individuals, **self.__families, **self.__notes, **self.__sources, **self.__multimedia, **self.__repositories}.values())
+        spans = [self.__get_source_span(record) for record in records]
+        gedcom_reprs = self.__iter_record_gedcom_reprs([record for record, span in zip(records, spans) if span is None], workers)
+        run = None
+        for span in spans:
+            if span is not None and run is not None and span.start == run[1]:
+                run = (run[0], span.end)
+                continue
+            if run is not None:
+                yield run
+            run = (span.start, span.end) if span is not None else None
+            if span is None:
+                yield next(gedcom_reprs)
+        if run is not None:
+            yield run
+        yield "0 %s" % gedcom.tags.GEDCOM_TAG_TRAILER
 
 
     def get_partner_of(self, individual: gd.Individual) -> gd.Individual:
@@ -936,6 +1470,15 @@ class Genealogy(object):
     def get_repositories(self):
         return self.__repositories
 
+    def get_import_validation(self):
+        return self.__import_validation
+
+    def get_raw_records(self):
+        return self.__raw_records
+
+    def get_cache_gedcom(self):
+        return self.__cache_gedcom
+
     def set_g(self, value):
         self.__G = value
 
@@ -957,6 +1500,15 @@ class Genealogy(object):
     def set_repositories(self, value):
         self.__repositories = value
 
+    def set_cache_gedcom(self, value):
+        if not value:
+            # the cached representations are released, keeping the records unchanged
+            for records in (self.__individuals, self.__families, self.__notes, self.__sources, self.__multimedia, self.__repositories):
+                for record in records.values():
+                    if not record.is_dirty():
+                        record.cache_gedcom_repr(None)
+        self.__cache_gedcom = value
+
     def del_g(self):
         del self.__G
 
@@ -985,3 +1537,6 @@ class Genealogy(object):
     sources = property(get_sources, set_sources, del_sources, "Dictionary of sources, whose keys are the sources' references")
     multimedia = property(get_multimedia, set_multimedia, del_multimedia, "Dictionary of multimedia objects, whose keys are the multimedia' references")
     repositories = property(get_repositories, set_repositories, del_repositories, "Dictionary of repositories, whose keys are the repositories' references")
+    raw_records = property(get_raw_records, None, None, "Header, submission, submitter and user-defined records kept unparsed by imports with passthrough")
+    cache_gedcom = property(get_cache_gedcom, set_cache_gedcom, None, "If True, get_gedcom and export_gedcom serialize again only the records changed since the last export")
+    import_validation = property(get_import_validation, None, None, "Validation mode of the lines used by the last import of a GEDCOM file (e.g. gedcom.gedcom_file.TRUSTED_INPUT)")
@@ -7,10 +7,7 @@ import os
 import kanren
 
 def print_gedcom(genealogy, filepath):
-    exported_gedcom = genealogy.get_gedcom()
-    f = open(filepath, "w")
-    f.write(exported_gedcom.get_gedcom())
-    f.close()
+    genealogy.export_gedcom(filepath)
 
 def plot_tree(graph):
     pos = nx.spring_layout(graph)
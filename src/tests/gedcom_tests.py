@@ -1,7 +1,17 @@
 import unittest
+import io
 import os.path
+import pathlib
+import tempfile
+import shutil
 import gedcom.structures
-from gedcom.gedcom_file import GedcomLine
+from gedcom.gedcom_file import GedcomLine, GedcomLines, GedcomFileMap, read_gedcom_file, read_gedcom_lines, tokenize_gedcom, is_valid_gedcom_line, get_gedcom_relevant_end
+from gedcom.gedcom_file import split_text_for_gedcom, join_continued_text, split_gedcom_line, get_validation_arguments,\
+    STRICT_VALIDATION, LENIENT_VALIDATION, TRUSTED_INPUT
+import gedcom.tags
+from gedcom import iter_records, read_line_table, fetch_record, peek_gedcom_file
+from gedcom.reader import RECORD_INDEX_SUFFIX, load_record_index, read_lazy_records
+from gedcom.streams import BackgroundReader
 
 def file_to_string(file_path):
     with open(file_path, 'r') as file:
@@ -9,12 +19,8 @@ def file_to_string(file_path):
     return outstring
 
 def file_to_gedcom_lines(file_path):
-    gedcom_lines_list = []
-    with open(file_path, mode='r', encoding='utf-8-sig') as content_file:
-        content = content_file.readlines()
-    for line in content:
-        gedcom_lines_list.append(GedcomLine(line))
-    return gedcom_lines_list
+    # test chunks are not complete GEDCOM files (e.g. the last line has no terminator), so they are not validated
+    return read_gedcom_file(file_path, validate=False)
 
 class TestHeader(unittest.TestCase):
     COMPONENT_NAME = "Header"
@@ -71,6 +77,25 @@ class TestIndividual(unittest.TestCase):
         file.close()
         self.assertEqual(compare_file, record.get_gedcom_repr(0), error_message)
 
+    def testIndividualRecordAtOffset(self):
+        # the record is parsed in place from a shared list of lines, surrounded by other records
+        filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/individual_record_chunk_1")
+        gedcom_lines = file_to_gedcom_lines(os.path.join(os.path.abspath(__file__), "../gedcom_files/family_record_chunk_1"))
+        start = len(gedcom_lines)
+        gedcom_lines += file_to_gedcom_lines(filepath) + file_to_gedcom_lines(os.path.join(os.path.abspath(__file__), "../gedcom_files/note_record_chunk_1"))
+        record = gedcom.structures.Individual()
+        parsed_lines = record.parse_gedcom(gedcom_lines, start)
+        self.assertEqual(len(file_to_gedcom_lines(filepath)), parsed_lines)
+        self.assertEqual(file_to_string(filepath), record.get_gedcom_repr(0))
+
+    def testReferenceNumberAsLastLine(self):
+        # a REFN line without TYPE may end the lines of the record
+        for lines, expected in [(["0 @I1@ INDI", "1 NAME John /Smith/", "1 REFN 123"], [("123", "")]),
+                                (["0 @I1@ INDI", "1 REFN 123", "2 TYPE user"], [("123", "user")])]:
+            record = gedcom.structures.Individual()
+            record.parse_gedcom(GedcomLines(read_gedcom_lines([line + "\n" for line in lines])))
+            self.assertEqual(expected, record.user_reference_numbers)
+
 class TestAddressStructure(unittest.TestCase):
     COMPONENT_NAME = "AddressStructure"
     
@@ -450,6 +475,366 @@ class TestSubmitterRecord(unittest.TestCase):
         read_file = file_to_string(filepath)
         self.assertEqual(read_file, record.get_gedcom_repr(starting_gedcom_level), error_message)
 
+class TestTokenizer(unittest.TestCase):
+    COMPONENT_NAME = "Tokenizer"
+
+    def testTokenizeGedcom(self):
+        lines = ["0 @I1@ INDI\n", "1 NAME Giacomo /Ricca/ \n", "1 BIRT\n", "not a gedcom line\n", "2 DATE 1 JAN 1900", "0 TRLR"]
+        tokens = list(tokenize_gedcom(lines))
+        self.assertEqual([(0, "@I1@", "INDI", "", 0),
+                          (1, "", "NAME", "Giacomo /Ricca/", 1),
+                          (1, "", "BIRT", "", 2),
+                          (0, "", "TRLR", "", 5)], tokens)
+        self.assertEqual(5, len(list(tokenize_gedcom(lines, validate=False))))
+
+    def testSameRulesAsValidation(self):
+        # expected results of the line regex of is_valid_gedcom_line before the tokenizer was introduced
+        lines = ["0 HEAD\n", "01 NAME x\n", "1  NAME x\n", "1 @x NAME\n", "1 NA-ME x\n", "1 NAME x", "0 TRLR", "0 TRLR\n", "\n", 
+                 "2 @I1@ INDI\r\n", "1 NOTE  spaced \r\n", "10 CONC x\n", "1 _UID 12\n", "1 @@ NAME\n", "a NAME\n", "1 NAME\n"]
+        expected = [True, False, False, False, False, False, True, True, False, True, True, True, True, False, False, True]
+        self.assertEqual(expected, [is_valid_gedcom_line(line) for line in lines])
+        self.assertEqual([i for i, valid in enumerate(expected) if valid], [token.line_number for token in tokenize_gedcom(lines)])
+
+    def testTrustedInput(self):
+        filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        with open(filepath, mode='r', encoding='utf-8-sig') as content_file:
+            lines = content_file.readlines()
+        self.assertEqual(list(tokenize_gedcom(lines)), list(tokenize_gedcom(lines, trusted=True)))
+        self.assertEqual((1, "", "NAME", "Giacomo /Ricca/", 7), split_gedcom_line("1 NAME  Giacomo /Ricca/ \r\n", 7))
+        self.assertEqual([(True, False), (False, False), (True, True)], 
+                         [get_validation_arguments(validation) for validation in (STRICT_VALIDATION, LENIENT_VALIDATION, TRUSTED_INPUT)])
+        self.assertRaises(ValueError, get_validation_arguments, True)
+        self.assertEqual((0, "@N1@", "NOTE", "", 0), split_gedcom_line("0 @N1@ NOTE"))
+        self.assertIsNone(split_gedcom_line("\n"))
+
+    def testGedcomLineFromToken(self):
+        filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/individual_record_chunk_3")
+        with open(filepath, mode='r', encoding='utf-8-sig') as content_file:
+            content = content_file.readlines()
+        for line, tokenized_line in zip(content, read_gedcom_file(filepath, validate=False, keep_content=True)):
+            gedcom_line = GedcomLine(line)
+            self.assertEqual((gedcom_line.level, gedcom_line.pointer, gedcom_line.tag, gedcom_line.value, gedcom_line.content), 
+                             (tokenized_line.level, tokenized_line.pointer, tokenized_line.tag, tokenized_line.value, tokenized_line.content))
+
+    def testCompactGedcomLine(self):
+        lines = read_gedcom_file(os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged"))
+        self.assertFalse(hasattr(lines[0], "__dict__"))
+        self.assertEqual({None}, set(line.content for line in lines))
+        for line in lines:
+            self.assertEqual(line.tag_id, gedcom.tags.get_tag_id(line.tag))
+            if line.tag_id != gedcom.tags.UNKNOWN_TAG_ID:
+                self.assertEqual(line.tag, gedcom.tags.TAG_NAMES[line.tag_id])
+        tag_count = len(gedcom.tags.TAG_NAMES)
+        user_defined_line = read_gedcom_lines(["1 @I1@ _UID 1234\n"])[0]
+        self.assertEqual((gedcom.tags.UNKNOWN_TAG_ID, "_UID"), (user_defined_line.tag_id, user_defined_line.tag))
+        self.assertEqual("1 @I1@ _UID 1234", str(user_defined_line))
+        self.assertEqual(tag_count, len(gedcom.tags.TAG_NAMES))
+        self.assertNotIn("_UID", gedcom.tags.TAG_IDS)
+
+class TestGedcomLines(unittest.TestCase):
+    COMPONENT_NAME = "GedcomLines"
+
+    def testSubtreeExtents(self):
+        valid_top_level_tags_list = [None, 
+                                     [gedcom.tags.GEDCOM_TAG_ADDRESS, gedcom.tags.GEDCOM_TAG_PHONE, gedcom.tags.GEDCOM_TAG_EMAIL, gedcom.tags.GEDCOM_TAG_FAX, gedcom.tags.GEDCOM_TAG_WEB],
+                                     gedcom.tags.EVENT_DETAIL_TAGS,
+                                     gedcom.tags.EVENT_DETAIL_TAGS + [gedcom.tags.GEDCOM_TAG_HUSBAND, gedcom.tags.GEDCOM_TAG_WIFE]]
+        for chunk in ["individual_record_chunk_3", "family_record_chunk_2", "event_detail_chunk_1", "address_structure_chunk_4"]:
+            filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/" + chunk)
+            error_message = "\n" + self.COMPONENT_NAME + " unit test error indexing " + filepath
+            gedcom_lines = file_to_gedcom_lines(filepath)
+            indexed_lines = GedcomLines(gedcom_lines)
+            for valid_top_level_tags in valid_top_level_tags_list:
+                for start in range(len(gedcom_lines)):
+                    self.assertEqual(get_gedcom_relevant_end(gedcom_lines, start, None, valid_top_level_tags), 
+                                     get_gedcom_relevant_end(indexed_lines, start, None, valid_top_level_tags), error_message)
+                    self.assertEqual(get_gedcom_relevant_end(gedcom_lines, start, min(start + 3, len(gedcom_lines)), valid_top_level_tags), 
+                                     get_gedcom_relevant_end(indexed_lines, start, min(start + 3, len(gedcom_lines)), valid_top_level_tags), error_message)
+
+
+class TestRecordIterator(unittest.TestCase):
+    COMPONENT_NAME = "RecordIterator"
+    maxDiff = None
+
+    def testIterRecords(self):
+        filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        error_message = "\n" + self.COMPONENT_NAME + " unit test error parsing " + filepath
+        gedcom_lines = GedcomLines(read_gedcom_file(filepath))
+        expected_records = []
+        for index, line in enumerate(gedcom_lines):
+            if line.level == 0 and line.tag in (gedcom.tags.GEDCOM_TAG_INDIVIDUAL, gedcom.tags.GEDCOM_TAG_FAMILY, gedcom.tags.GEDCOM_TAG_NOTE):
+                record = {gedcom.tags.GEDCOM_TAG_INDIVIDUAL: gedcom.structures.Individual, 
+                          gedcom.tags.GEDCOM_TAG_FAMILY: gedcom.structures.Family, 
+                          gedcom.tags.GEDCOM_TAG_NOTE: gedcom.structures.Note}[line.tag]()
+                record.parse_gedcom(gedcom_lines, index)
+                expected_records.append(record)
+        records = list(iter_records(filepath, types=(gedcom.structures.Individual, gedcom.structures.Family, gedcom.structures.Note)))
+        self.assertEqual([type(record) for record in expected_records], [type(record) for record in records], error_message)
+        self.assertEqual([record.get_gedcom_repr(0) for record in expected_records], [record.get_gedcom_repr(0) for record in records], error_message)
+        self.assertEqual({gedcom.structures.Source}, set(type(record) for record in iter_records(filepath, types=(gedcom.structures.Source,))), error_message)
+
+    def testReferenceNumberAsLastLine(self):
+        # each record is parsed from its own lines, which may end with a REFN line without TYPE
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "test.ged")
+            with open(filepath, 'w') as test_file:
+                test_file.write("0 HEAD\n0 @I1@ INDI\n1 NAME John /Smith/\n1 REFN 123\n0 @I2@ INDI\n1 REFN 456\n2 TYPE user\n0 TRLR\n")
+            records = list(iter_records(filepath))
+        self.assertEqual([[("123", "")], [("456", "user")]], [record.user_reference_numbers for record in records])
+
+
+    def testLazyRecords(self):
+        filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        error_message = "\n" + self.COMPONENT_NAME + " unit test error parsing " + filepath
+        records, links = read_lazy_records(filepath, tags=[gedcom.tags.GEDCOM_TAG_INDIVIDUAL])
+        gedcom_map = records[0]._LazyRecord__source.get_gedcom_map()
+        span = records[0].get_source_span()
+        self.assertEqual(span.pointer, gedcom_map.read_record_lines(span)[0].pointer, error_message)
+        expected_reprs = [record.get_gedcom_repr(0) for record in iter_records(filepath, types=(gedcom.structures.Individual,))]
+        self.assertEqual(expected_reprs, [record.get_gedcom_repr(0) for record in records], error_message)
+        # the map is closed once all the lazy records are parsed
+        self.assertRaises(ValueError, gedcom_map.read_record_lines, span)
+
+
+class TestRecordIndex(unittest.TestCase):
+    COMPONENT_NAME = "RecordIndex"
+
+    def testFetchRecord(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "allged.ged")
+            shutil.copy(os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged"), filepath)
+            error_message = "\n" + self.COMPONENT_NAME + " unit test error fetching from " + filepath
+            for record in iter_records(filepath):
+                fetched_record = fetch_record(filepath, record.reference)
+                self.assertEqual(type(record), type(fetched_record), error_message)
+                self.assertEqual(record.get_gedcom_repr(0), fetched_record.get_gedcom_repr(0), error_message)
+            self.assertTrue(os.path.exists(filepath + RECORD_INDEX_SUFFIX), error_message)
+            self.assertIsNone(fetch_record(filepath, "@MISSING@"), error_message)
+
+    def testStaleIndex(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "test.ged")
+            with open(filepath, 'w') as test_file:
+                test_file.write("0 HEAD\n0 @I1@ INDI\n1 NAME Giacomo /Ricca/\n0 TRLR\n")
+            self.assertEqual("Giacomo /Ricca/", fetch_record(filepath, "@I1@").personal_name_structures[0].name)
+            # same size and content, different modification time: the index is still valid
+            os.utime(filepath, ns=(0, 0))
+            record_index = load_record_index(filepath)
+            self.assertEqual(0, record_index["mtime"])
+            # different size: the index is rebuilt
+            with open(filepath, 'w') as test_file:
+                test_file.write("0 HEAD\n0 @I0@ INDI\n0 @I1@ INDI\n1 NAME Giacomo /Ricca/\n0 TRLR\n")
+            self.assertEqual("Giacomo /Ricca/", fetch_record(filepath, "@I1@").personal_name_structures[0].name)
+            self.assertIsNotNone(fetch_record(filepath, "@I0@"))
+
+    def testPathLikeInput(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = pathlib.Path(directory, "test.ged")
+            filepath.write_text("0 HEAD\n0 @I1@ INDI\n1 NAME Giacomo /Ricca/\n0 TRLR\n")
+            self.assertEqual("Giacomo /Ricca/", fetch_record(filepath, "@I1@").personal_name_structures[0].name)
+            self.assertTrue(os.path.exists(str(filepath) + RECORD_INDEX_SUFFIX))
+            self.assertEqual(1, len(load_record_index(filepath)["records"]))
+
+
+class TestPeek(unittest.TestCase):
+    COMPONENT_NAME = "Peek"
+
+    def testPeekGedcomFile(self):
+        filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        error_message = "\n" + self.COMPONENT_NAME + " unit test error peeking " + filepath
+        gedcom_lines = GedcomLines(read_gedcom_file(filepath))
+        header = gedcom.structures.Header()
+        header.parse_gedcom(gedcom_lines)
+        summary = peek_gedcom_file(filepath)
+        self.assertEqual(header.get_gedcom_repr(0), summary.header.get_gedcom_repr(0), error_message)
+        self.assertEqual("5.5", summary.header.gedcom_version, error_message)
+        self.assertEqual({line.tag for line in gedcom_lines if line.level == 0}, set(summary.record_counts), error_message)
+        for tag in (gedcom.tags.GEDCOM_TAG_INDIVIDUAL, gedcom.tags.GEDCOM_TAG_FAMILY, gedcom.tags.GEDCOM_TAG_SOURCE):
+            self.assertEqual(len([line for line in gedcom_lines if line.level == 0 and line.tag == tag]), summary.record_counts[tag], error_message)
+
+
+class TestBackgroundReader(unittest.TestCase):
+    COMPONENT_NAME = "BackgroundReader"
+
+    def testBackgroundReader(self):
+        content = bytes(range(256)) * 1000
+        with BackgroundReader(io.BytesIO(content), block_size=1000, queue_size=2) as reader:
+            self.assertEqual(content, reader.read())
+        with BackgroundReader(io.BytesIO(content), block_size=1000, queue_size=2) as reader:
+            # closing the reader before the end of the stream stops its background thread
+            self.assertEqual(content[:10], reader.read(10))
+
+        class FailingStream(io.BytesIO):
+            def read(self, size=-1):
+                raise OSError("read error")
+
+        with BackgroundReader(FailingStream()) as reader:
+            self.assertRaises(OSError, reader.read)
+
+
+class TestGedcomFileMap(unittest.TestCase):
+    COMPONENT_NAME = "GedcomFileMap"
+
+    def testSameLinesAsTextReader(self):
+        filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        error_message = "\n" + self.COMPONENT_NAME + " unit test error reading " + filepath
+        expected_lines = read_gedcom_file(filepath, keep_content=True)
+        with GedcomFileMap(filepath) as gedcom_map:
+            spans = list(gedcom_map.iter_record_spans())
+            lines = [line for span in spans for line in gedcom_map.read_record_lines(span, keep_content=True)]
+        self.assertEqual([line.tag for line in expected_lines if line.level == 0], [span.tag for span in spans], error_message)
+        self.assertEqual([(line.gedcom_index, line.content, line.value) for line in expected_lines], 
+                         [(line.gedcom_index, line.content, line.value) for line in lines], error_message)
+
+    def testProjectedRecordLines(self):
+        filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        error_message = "\n" + self.COMPONENT_NAME + " unit test error reading " + filepath
+        tags = [gedcom.tags.GEDCOM_TAG_NAME, gedcom.tags.GEDCOM_TAG_BIRTH, gedcom.tags.GEDCOM_TAG_FAMILY_SPOUSE]
+        with GedcomFileMap(filepath) as gedcom_map:
+            for span in gedcom_map.iter_record_spans():
+                expected_lines = []
+                kept = True
+                for line in gedcom_map.read_record_lines(span, keep_content=True):
+                    if line.level == 1:
+                        kept = line.tag in tags
+                    if line.level == 0 or kept:
+                        expected_lines.append((line.gedcom_index, line.content))
+                lines = gedcom_map.read_record_lines(span, keep_content=True, tags=tags)
+                self.assertEqual(expected_lines, [(line.gedcom_index, line.content) for line in lines], error_message)
+
+    def testTerminators(self):
+        content = "0 HEAD\n1 CHAR UTF-8\n0 @I1@ INDI\n1 NAME Giacomo /Ricca/\n0 @N1@ NOTE caffè\n0 TRLR"
+        for terminator, prefix in [("\n", b""), ("\r\n", b""), ("\r", b""), ("\n", b"\xef\xbb\xbf")]:
+            with tempfile.TemporaryDirectory() as directory:
+                filepath = os.path.join(directory, "test.ged")
+                with open(filepath, 'wb') as test_file:
+                    test_file.write(prefix + content.replace("\n", terminator).encode('utf-8'))
+                with GedcomFileMap(filepath) as gedcom_map:
+                    spans = list(gedcom_map.iter_record_spans())
+                    self.assertEqual([("", "HEAD", 0), ("@I1@", "INDI", 2), ("@N1@", "NOTE", 4), ("", "TRLR", 5)], 
+                                     [(span.pointer, span.tag, span.line_number) for span in spans], repr(terminator))
+                    self.assertEqual(["INDI", "NAME"], [line.tag for line in gedcom_map.read_record_lines(spans[1])], repr(terminator))
+                    self.assertEqual("caffè", gedcom_map.read_record_lines(spans[2])[0].value, repr(terminator))
+                    self.assertEqual({"HEAD": 1, "INDI": 1, "NOTE": 1, "TRLR": 1}, gedcom_map.count_record_tags(), repr(terminator))
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "empty.ged")
+            open(filepath, 'wb').close()
+            with GedcomFileMap(filepath) as gedcom_map:
+                self.assertEqual([], list(gedcom_map.iter_record_spans()))
+
+
+class TestParseTable(unittest.TestCase):
+    COMPONENT_NAME = "ParseTable"
+
+    def testFirstEntryWins(self):
+        first, second = object(), object()
+        parse_table = gedcom.structures.build_parse_table((gedcom.tags.GEDCOM_TAG_NOTE, 1, first),
+                                                          ([gedcom.tags.GEDCOM_TAG_NOTE, gedcom.tags.GEDCOM_TAG_SOURCE], None, second),
+                                                          (gedcom.structures.USER_DEFINED_TAGS, None, first))
+        self.assertIs(first, parse_table[(gedcom.tags.get_tag_id(gedcom.tags.GEDCOM_TAG_NOTE), 1)])
+        self.assertIs(second, parse_table[(gedcom.tags.get_tag_id(gedcom.tags.GEDCOM_TAG_NOTE), 2)])
+        self.assertIs(second, parse_table[(gedcom.tags.get_tag_id(gedcom.tags.GEDCOM_TAG_SOURCE), 1)])
+        self.assertIs(first, parse_table[(gedcom.structures.USER_DEFINED_TAGS, None)])
+
+    def testUnknownLinesAreSkipped(self):
+        gedcom_lines = read_gedcom_lines(["1 CHAN", "2 DATE 1 JAN 2000", "2 _UID 1234", "3 TIME 12:00:00", "3 TIME 10:30:00"], validate=False)
+        change_date = gedcom.structures.ChangeDate()
+        self.assertEqual(5, change_date.parse_gedcom(gedcom_lines))
+        self.assertEqual("1 JAN 2000", change_date.date)
+        self.assertEqual("10:30:00", change_date.time)
+
+    def testScopedLines(self):
+        gedcom_lines = read_gedcom_lines(["0 HEAD", "1 SOUR pigen", "2 VERS 1.0", "3 _UID 1234", "2 DATA data", "3 DATE 1 JAN 2000", 
+                                          "1 DATE 2 FEB 2001", "1 GEDC", "2 VERS 5.5.1", "1 CHAR UTF-8", "2 VERS 1"], validate=False)
+        header = gedcom.structures.Header()
+        self.assertEqual(11, header.parse_gedcom(gedcom_lines))
+        self.assertEqual(("pigen", "1.0", "1 JAN 2000", "2 FEB 2001"), 
+                         (header.source_system_id, header.source_system_version, header.source_system_data_date, header.transmission_date))
+        self.assertEqual(("5.5.1", "UTF-8", "1"), (header.gedcom_version, header.character_set, header.character_set_version))
+        # EVEN lines are parsed only in the scope of a DATA line
+        gedcom_lines = read_gedcom_lines(["0 @S1@ SOUR", "1 EVEN BIRT", "1 TITL Title", "2 CONT continued", "1 DATA", "2 EVEN DEAT"], validate=False)
+        source = gedcom.structures.Source()
+        self.assertEqual(6, source.parse_gedcom(gedcom_lines))
+        self.assertEqual("Title\ncontinued", source.source_title)
+        self.assertEqual(["DEAT"], [source_event.event_recorded for source_event in source.data_events])
+
+
+class TestContinuedText(unittest.TestCase):
+    COMPONENT_NAME = "ContinuedText"
+
+    def testLongNoteRoundTrip(self):
+        text = "\n".join("line%s:" % i + "x" * (i % 500) for i in range(3000))
+        for structure, tag, level in [(gedcom.structures.Note, gedcom.tags.GEDCOM_TAG_NOTE, 0), 
+                                      (gedcom.structures.NoteStructure, gedcom.tags.GEDCOM_TAG_NOTE, 1),
+                                      (gedcom.structures.AddressStructure, gedcom.tags.GEDCOM_TAG_ADDRESS, 1)]:
+            gedcom_repr = split_text_for_gedcom(text, tag, level, gedcom.tags.MAX_TEXT_LENGTH)
+            gedcom_lines = GedcomLines(read_gedcom_lines(line + "\n" for line in gedcom_repr.split("\n")))
+            self.assertEqual((text, len(gedcom_lines)), join_continued_text(gedcom_lines, 0))
+            parsed_structure = structure()
+            self.assertEqual(len(gedcom_lines), parsed_structure.parse_gedcom(gedcom_lines), tag)
+            self.assertEqual(text, parsed_structure.address_line if tag == gedcom.tags.GEDCOM_TAG_ADDRESS else parsed_structure.text, tag)
+
+
+class TestGedcomEmitter(unittest.TestCase):
+    COMPONENT_NAME = "GedcomEmitter"
+
+    def testLargeRecordRoundTrip(self):
+        lines = ["0 @I1@ INDI", "1 NAME John /Smith/"]
+        for i in range(2000):
+            lines += ["1 BIRT", "2 DATE %s JAN 1900" % (i % 28 + 1), "2 PLAC Place %s" % i, "2 NOTE Note %s" % i, "3 CONT continued"]
+        individual = gedcom.structures.Individual()
+        individual.parse_gedcom(GedcomLines(read_gedcom_lines([line + "\n" for line in lines])))
+        emitted_lines = []
+        individual.emit_gedcom_lines(emitted_lines, 0)
+        self.assertEqual("\n".join(lines), individual.get_gedcom_repr(0))
+        self.assertEqual(individual.get_gedcom_repr(0), "\n".join(emitted_lines))
+
+
+class TestRawStructure(unittest.TestCase):
+    COMPONENT_NAME = "RawStructure"
+
+    def testPassthrough(self):
+        lines = ["0 @I1@ INDI", "1 NAME John /Smith/", "1 _UID  0123 ", "2 _SRC vendor", "1 ASSO @I2@", "2 RELA Godfather", "1 SEX M"]
+        individual = gedcom.structures.Individual()
+        individual.parse_gedcom(GedcomLines(read_gedcom_lines([line + "\n" for line in lines], keep_content=True)))
+        self.assertEqual(["1 _UID  0123 ", "2 _SRC vendor"], individual.raw_structures[0].lines)
+        self.assertEqual(gedcom.tags.GEDCOM_TAG_ASSOCIATES, individual.raw_structures[1].tag)
+        self.assertEqual(sorted(lines), sorted(individual.get_gedcom_repr(0).split("\n")))
+        self.assertEqual("2 _UID  0123 \n3 _SRC vendor", individual.raw_structures[0].get_gedcom_repr(2))
+        # without the raw content of the lines, the structures are skipped
+        individual = gedcom.structures.Individual()
+        individual.parse_gedcom(GedcomLines(read_gedcom_lines([line + "\n" for line in lines])))
+        self.assertEqual([], individual.raw_structures)
+        self.assertEqual("0 @I1@ INDI\n1 NAME John /Smith/\n1 SEX M", individual.get_gedcom_repr(0))
+
+
+class TestLineTable(unittest.TestCase):
+    COMPONENT_NAME = "LineTable"
+
+    def testSameLinesAsTextReader(self):
+        filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        error_message = "\n" + self.COMPONENT_NAME + " unit test error reading " + filepath
+        gedcom_lines = read_gedcom_file(filepath)
+        table = read_line_table(filepath)
+        self.assertEqual([(line.level, line.pointer, line.tag, line.value) for line in gedcom_lines], 
+                         [(table.levels[row], table.get_pointer(row), table.get_tag(row), table.get_value(row)) for row in range(len(table))], error_message)
+        birth_dates = []
+        last_line_by_level = {}
+        for line in gedcom_lines:
+            last_line_by_level[line.level] = line
+            if line.tag == gedcom.tags.GEDCOM_TAG_DATE and last_line_by_level[line.level - 1].tag == gedcom.tags.GEDCOM_TAG_BIRTH:
+                birth_dates.append((last_line_by_level[0].pointer, line.value))
+        self.assertTrue(birth_dates, error_message)
+        self.assertEqual([value for pointer, value in birth_dates], table.get_values(gedcom.tags.GEDCOM_TAG_DATE, gedcom.tags.GEDCOM_TAG_BIRTH), error_message)
+        self.assertEqual(birth_dates, table.get_record_values(gedcom.tags.GEDCOM_TAG_DATE, gedcom.tags.GEDCOM_TAG_BIRTH), error_message)
+        # tags not defined in gedcom.tags get ids of the table only
+        unknown_tags = set(line.tag for line in gedcom_lines if line.tag not in gedcom.tags.TAG_IDS)
+        self.assertTrue(unknown_tags, error_message)
+        for tag in unknown_tags:
+            self.assertEqual([row for row, line in enumerate(gedcom_lines) if line.tag == tag], table.get_rows(tag), error_message)
+        self.assertEqual([], table.get_rows("_NONE"), error_message)
+        self.assertEqual(list(gedcom.tags.TAG_NAMES), table.tag_names[:len(gedcom.tags.TAG_NAMES)], error_message)
+
 
 if __name__ == "__main__":
 
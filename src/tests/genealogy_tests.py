@@ -1,9 +1,17 @@
 import unittest
 import genealogy
 from gedcom.structures import Individual, Family, Note, NoteStructure, Source,\
-    SourceCitation, Multimedia, MultimediaLink
+    SourceCitation, Multimedia, MultimediaLink, PersonalNameStructure
 from genealogy import Genealogy
+from gedcom.reader import LazyRecord, hash_records
+from gedcom.gedcom_file import STRICT_VALIDATION, TRUSTED_INPUT
+import io
 import os.path
+import gzip
+import zipfile
+import tempfile
+import shutil
+import threading
 from tests.gedcom_tests import file_to_string
 
 
@@ -290,6 +298,342 @@ class GenealogyTests(unittest.TestCase):
         self.assertEqual(compare_file, g.get_gedcom())
 
 
+    def test_parallel_gedcom_import(self):
+        input_filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        g = Genealogy(input_filepath)
+        parallel_g = Genealogy(input_filepath, workers=3)
+        self.assertEqual(g.get_gedcom(), parallel_g.get_gedcom())
+        self.assertEqual(sorted((a.reference, b.reference) for a, b in g.G.edges()), sorted((a.reference, b.reference) for a, b in parallel_g.G.edges()))
+
+
+    def test_lazy_gedcom_import(self):
+        input_filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        g = Genealogy(input_filepath)
+        lazy_g = Genealogy(input_filepath, lazy=True)
+        self.assertTrue(all(isinstance(individual, LazyRecord) and isinstance(individual, Individual) for individual in lazy_g.get_individuals_list()))
+        self.assertEqual(sorted((a.reference, b.reference) for a, b in g.G.edges()), sorted((a.reference, b.reference) for a, b in lazy_g.G.edges()))
+        self.assertTrue(all(isinstance(individual, LazyRecord) for individual in lazy_g.get_individuals_list()))
+        individual = next(iter(lazy_g.get_individuals_list()))
+        self.assertEqual(g.get_individual_by_ref(individual.reference).get_gedcom_repr(0), individual.get_gedcom_repr(0))
+        self.assertIs(type(individual), Individual)
+        self.assertEqual(g.get_gedcom(), lazy_g.get_gedcom())
+        # a lazy import into a genealogy which already has families links only the records just imported
+        second_filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/sample_family.ged")
+        g.import_gedcom_file(second_filepath)
+        lazy_g.import_gedcom_file(second_filepath, lazy=True)
+        self.assertEqual(sorted((a.reference, b.reference) for a, b in g.G.edges()), sorted((a.reference, b.reference) for a, b in lazy_g.G.edges()))
+        # records not parsed yet fail to parse once their file is changed
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "allged.ged")
+            shutil.copyfile(input_filepath, filepath)
+            lazy_g = Genealogy(filepath, lazy=True)
+            individual = lazy_g.get_individual_by_ref("@PERSON1@")
+            with open(filepath, 'a') as edited_file:
+                edited_file.write("\n")
+            with self.assertRaises(RuntimeError):
+                individual.personal_name_structures
+
+
+    def test_selective_gedcom_import(self):
+        input_filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        individual_tags = ["NAME", "BIRT", "DEAT", "FAMC", "FAMS"]
+        g = Genealogy(input_filepath)
+        for lazy in [False, True]:
+            selective_g = Genealogy(input_filepath, lazy=lazy, types=(Individual, Family), individual_tags=individual_tags)
+            self.assertEqual(sorted((a.reference, b.reference) for a, b in g.G.edges()), sorted((a.reference, b.reference) for a, b in selective_g.G.edges()))
+            self.assertEqual(len(g.get_individuals_list()), len(selective_g.get_individuals_list()))
+            self.assertFalse(selective_g.notes)
+            self.assertFalse(selective_g.sources)
+            individual = g.get_individual_by_ref("@PERSON1@")
+            selective_individual = selective_g.get_individual_by_ref("@PERSON1@")
+            self.assertEqual(individual.personal_name_structures[0].name, selective_individual.personal_name_structures[0].name)
+            self.assertFalse(selective_individual.notes)
+        notes_g = Genealogy(input_filepath, types=(Note,))
+        self.assertFalse(notes_g.get_individuals_list())
+        self.assertEqual(sorted(g.notes), sorted(notes_g.notes))
+
+
+    def test_trusted_gedcom_import(self):
+        input_filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        g = Genealogy(input_filepath)
+        self.assertEqual(STRICT_VALIDATION, g.import_validation)
+        for workers, lazy in [(1, False), (2, False), (1, True)]:
+            trusted_g = Genealogy(input_filepath, workers=workers, lazy=lazy, validation=TRUSTED_INPUT)
+            self.assertEqual(TRUSTED_INPUT, trusted_g.import_validation)
+            self.assertEqual(g.get_gedcom(), trusted_g.get_gedcom())
+        self.assertIsNone(Genealogy().import_validation)
+        self.assertRaises(ValueError, Genealogy, input_filepath, validation="trusted input")
+
+
+    def test_passthrough_gedcom_import(self):
+        input_filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        user_defined_line = "1 _MYOWNTAG This is a non-standard tag. Not recommended but allowed"
+        with open(input_filepath, encoding='utf-8-sig') as input_file:
+            input_lines = input_file.read().splitlines()
+        # header, submission and submitter records come first in the file, the user-defined record is the last one
+        raw_lines = input_lines[:input_lines.index("0 @PERSON1@ INDI")] + input_lines[-2:-1]
+        g = Genealogy(input_filepath)
+        self.assertEqual([], g.raw_records)
+        record_lines = g.get_gedcom().split("\n")
+        record_lines = record_lines[record_lines.index("0 @PERSON1@ INDI"):]
+        self.assertNotIn(user_defined_line, record_lines)
+        for workers, lazy in [(1, False), (2, False), (1, True)]:
+            passthrough_g = Genealogy(input_filepath, workers=workers, lazy=lazy, passthrough=True)
+            self.assertEqual(["HEAD", "SUBM", "SUBN", "_MYOWNTAG"], [raw_record.tag for raw_record in passthrough_g.raw_records])
+            gedcom_lines = passthrough_g.get_gedcom().split("\n")
+            self.assertEqual(raw_lines, gedcom_lines[:len(raw_lines)])
+            self.assertIn(user_defined_line, gedcom_lines)
+            self.assertEqual(record_lines, [line for line in gedcom_lines[len(raw_lines):] if line != user_defined_line])
+        with open(input_filepath, 'rb') as input_file:
+            self.assertEqual(passthrough_g.get_gedcom(), Genealogy(input_file, passthrough=True).get_gedcom())
+
+
+    def test_export_gedcom(self):
+        input_filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        g = Genealogy(input_filepath, passthrough=True)
+        gedcom_repr = g.get_gedcom()
+        with tempfile.TemporaryDirectory() as directory:
+            output_filepath = os.path.join(directory, "exported.ged")
+            g.export_gedcom(output_filepath, buffer_size=256)
+            with open(output_filepath, 'rb') as output_file:
+                self.assertEqual(gedcom_repr.encode('utf-8'), output_file.read())
+        binary_stream = io.BytesIO(b"prefix")
+        binary_stream.seek(0, io.SEEK_END)
+        g.export_gedcom(binary_stream, buffer_size=256)
+        self.assertFalse(binary_stream.closed)
+        self.assertEqual(b"prefix" + gedcom_repr.encode('utf-8'), binary_stream.getvalue())
+        text_stream = io.StringIO()
+        g.export_gedcom(text_stream)
+        self.assertEqual(gedcom_repr, text_stream.getvalue())
+
+
+    def test_parallel_gedcom_export(self):
+        input_filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        g = Genealogy(input_filepath, passthrough=True)
+        gedcom_repr = g.get_gedcom()
+        self.assertEqual(gedcom_repr, g.get_gedcom(workers=2))
+        binary_stream = io.BytesIO()
+        g.export_gedcom(binary_stream, workers=2)
+        self.assertEqual(gedcom_repr.encode('utf-8'), binary_stream.getvalue())
+        g = Genealogy(input_filepath, lazy=True)
+        self.assertEqual(Genealogy(input_filepath).get_gedcom(), g.get_gedcom(workers=3))
+        g.cache_gedcom = True
+        gedcom_repr = g.get_gedcom(workers=2)
+        self.assertFalse(any(individual.is_dirty() for individual in g.individuals.values()))
+        g.get_individual_by_ref("@PERSON1@").restriction_notice = "privacy"
+        self.assertNotEqual(gedcom_repr, g.get_gedcom(workers=2))
+        g.cache_gedcom = False
+        self.assertEqual(g.get_gedcom(), g.get_gedcom(workers=2))
+
+
+    def test_gedcom_cache(self):
+        input_filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        g = Genealogy(input_filepath)
+        g.cache_gedcom = True
+        gedcom_repr = g.get_gedcom()
+        records = list(g.individuals.values()) + list(g.families.values()) + list(g.sources.values())
+        self.assertFalse(any(record.is_dirty() for record in records))
+        self.assertEqual(gedcom_repr, g.get_gedcom())
+        # changes made in place to substructures mark their record dirty
+        g.get_individual_by_ref("@PERSON2@").personal_name_structures[0].name = "/Spouse/"
+        self.assertTrue(g.get_individual_by_ref("@PERSON2@").is_dirty())
+        self.assertIn("1 NAME /Spouse/", g.get_gedcom())
+        g.remove_source(g.sources["@SOURCE1@"])
+        self.assertTrue(g.get_individual_by_ref("@PERSON1@").is_dirty())
+        self.assertNotIn("@SOURCE1@", g.get_gedcom())
+        individual = g.get_individual_by_ref("@PERSON1@")
+        individual.restriction_notice = "privacy"
+        self.assertTrue(individual.is_dirty())
+        self.assertFalse(g.get_individual_by_ref("@PERSON2@").is_dirty())
+        g.rename_family_reference("@FAMILY1@", "@F100@")
+        g.rename_individual_reference("@PERSON3@", "@I100@")
+        cached_gedcom_repr = g.get_gedcom()
+        self.assertNotEqual(gedcom_repr, cached_gedcom_repr)
+        g.cache_gedcom = False
+        self.assertTrue(all(record.is_dirty() for record in list(g.individuals.values()) + list(g.families.values())))
+        self.assertEqual(g.get_gedcom(), cached_gedcom_repr)
+        g = genealogy.Genealogy()
+        g.cache_gedcom = True
+        pinco_pallino = Individual("Pinco", "Pallino", "M", "15-feb-1900", "16-mar-1950")
+        tizio_pallino = Individual("Tizio", "Pallino", "M", "11-mar-1920", "26-nov-1970")
+        caia_pallino = Individual("Caia", "Pallino", "F", "11-mar-1922", "26-nov-1972")
+        for individual in [pinco_pallino, tizio_pallino, caia_pallino]:
+            g.add_new_individual(individual)
+        g.get_gedcom()
+        g.link_individual(pinco_pallino, tizio_pallino, genealogy.Relationship.PARENT)
+        g.get_gedcom()
+        g.link_individual(caia_pallino, tizio_pallino, genealogy.Relationship.SIBLING)
+        g.un_link_individual(pinco_pallino, tizio_pallino, genealogy.Relationship.PARENT)
+        name_structure = PersonalNameStructure()
+        name_structure.name = "Pincus /Pallino/"
+        pinco_pallino.personal_name_structures.append(name_structure)
+        pinco_pallino.mark_dirty()
+        g.get_gedcom()
+        name_structure.name = "Pinco /Pallini/"
+        cached_gedcom_repr = g.get_gedcom()
+        self.assertIn("1 NAME Pinco /Pallini/", cached_gedcom_repr)
+        g.cache_gedcom = False
+        self.assertEqual(g.get_gedcom(), cached_gedcom_repr)
+
+
+    def test_verbatim_gedcom_export(self):
+        input_filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        with open(input_filepath, 'rb') as input_file:
+            source = input_file.read().replace(b"\n", b"\r\n")
+        with tempfile.TemporaryDirectory() as directory:
+            source_filepath = os.path.join(directory, "source.ged")
+            with open(source_filepath, 'wb') as source_file:
+                source_file.write(source)
+            spans = {reference: span for reference, (span, record_hash) in hash_records(source_filepath).items()}
+            g = Genealogy(source_filepath, verbatim=True)
+            individual = g.get_individual_by_ref("@PERSON1@")
+            individual.restriction_notice = "privacy"
+            binary_stream = io.BytesIO()
+            g.export_gedcom(binary_stream)
+            exported = binary_stream.getvalue()
+            self.assertIn(individual.get_gedcom_repr(0).encode('utf-8') + b"\n", exported)
+            self.assertNotIn(source[spans["@PERSON1@"].start:spans["@PERSON1@"].end], exported)
+            self.assertIn(source[spans["@PERSON2@"].start:spans["@PERSON2@"].end], exported)
+            exported_filepath = os.path.join(directory, "exported.ged")
+            g.export_gedcom(exported_filepath)
+            with open(exported_filepath, 'rb') as exported_file:
+                self.assertEqual(exported, exported_file.read())
+            self.assertEqual(g.get_gedcom(), Genealogy(exported_filepath).get_gedcom())
+            text_stream = io.StringIO()
+            g.export_gedcom(text_stream)
+            self.assertEqual(exported.decode('utf-8'), text_stream.getvalue())
+            g = Genealogy(source_filepath, lazy=True, verbatim=True)
+            g.get_individual_by_ref("@PERSON1@").restriction_notice = "privacy"
+            binary_stream = io.BytesIO()
+            g.export_gedcom(binary_stream)
+            self.assertEqual(exported, binary_stream.getvalue())
+            # records whose substructures are changed in place, or marked dirty before being parsed, are serialized
+            person2_source = source[spans["@PERSON2@"].start:spans["@PERSON2@"].end]
+            for lazy in [False, True]:
+                g = Genealogy(source_filepath, lazy=lazy, verbatim=True)
+                if lazy:
+                    g.get_individual_by_ref("@PERSON2@").mark_dirty()
+                else:
+                    g.get_individual_by_ref("@PERSON2@").personal_name_structures[0].name = "/Spouse/"
+                binary_stream = io.BytesIO()
+                g.export_gedcom(binary_stream)
+                self.assertNotIn(person2_source, binary_stream.getvalue())
+                self.assertIn(g.get_individual_by_ref("@PERSON2@").get_gedcom_repr(0).encode('utf-8') + b"\n", binary_stream.getvalue())
+            # records are serialized once the file is changed, while lazy records can no longer be parsed
+            g = Genealogy(source_filepath, verbatim=True)
+            lazy_g = Genealogy(source_filepath, lazy=True, verbatim=True)
+            with open(source_filepath, 'ab') as source_file:
+                source_file.write(b"\r\n")
+            binary_stream = io.BytesIO()
+            g.export_gedcom(binary_stream)
+            self.assertEqual(g.get_gedcom().encode('utf-8'), binary_stream.getvalue())
+            self.assertRaises(RuntimeError, lazy_g.export_gedcom, io.BytesIO())
+
+
+    def test_compressed_gedcom_import(self):
+        input_filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        g = Genealogy(input_filepath)
+        with tempfile.TemporaryDirectory() as directory:
+            gzip_filepath = os.path.join(directory, "allged.ged.gz")
+            with open(input_filepath, 'rb') as input_file, gzip.open(gzip_filepath, 'wb') as gzip_file:
+                gzip_file.write(input_file.read())
+            gedzip_filepath = os.path.join(directory, "allged.gdz")
+            with zipfile.ZipFile(gedzip_filepath, 'w', zipfile.ZIP_DEFLATED) as gedzip_file:
+                gedzip_file.write(input_filepath, "gedcom.ged")
+                gedzip_file.writestr("photos/readme.txt", "media files")
+            for compressed_filepath in [gzip_filepath, gedzip_filepath]:
+                compressed_g = Genealogy(compressed_filepath)
+                self.assertEqual(g.get_gedcom(), compressed_g.get_gedcom(), compressed_filepath)
+                self.assertEqual(sorted((a.reference, b.reference) for a, b in g.G.edges()), sorted((a.reference, b.reference) for a, b in compressed_g.G.edges()))
+
+
+    def test_stream_gedcom_import(self):
+        input_filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        g = Genealogy(input_filepath)
+        with open(input_filepath, 'rb') as input_file:
+            content = input_file.read()
+        for source in [content, io.BytesIO(content), io.StringIO(content.decode('utf-8-sig'))]:
+            stream_g = Genealogy(source, buffer_size=100)
+            self.assertEqual(g.get_gedcom(), stream_g.get_gedcom(), type(source))
+            self.assertEqual(sorted((a.reference, b.reference) for a, b in g.G.edges()), sorted((a.reference, b.reference) for a, b in stream_g.G.edges()))
+        source = io.BytesIO(content)
+        thread_count = threading.active_count()
+        Genealogy(source)
+        self.assertFalse(source.closed)
+        # streams of the caller are read on the calling thread only, and not read any more after the import
+        self.assertEqual(thread_count, threading.active_count())
+
+        class UploadStream(object):
+            def __init__(self, content):
+                self.content = io.BytesIO(content)
+
+            def read(self, size=-1):
+                return self.content.read(size)
+
+        self.assertEqual(g.get_gedcom(), Genealogy(UploadStream(content), buffer_size=100).get_gedcom())
+
+
+    def test_reload_changed(self):
+        input_filepath = os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")
+        with open(input_filepath, 'r', encoding='utf-8-sig') as input_file:
+            content = input_file.read()
+        edits = [("1 NAME /Child 2/\n", "1 NAME /Second child/\n"),
+                 ("0 @PERSON7@ INDI\n1 NAME /Child 3/\n1 FAMC @FAMILY2@\n", ""),
+                 ("1 CHIL @PERSON7@\n", ""),
+                 ("1 CHIL @PERSON4@\n", "1 CHIL @PERSON4@\n1 CHIL @PERSON9@\n"),
+                 ("0 TRLR", "0 @PERSON9@ INDI\n1 NAME /Child 4/\n1 FAMC @FAMILY1@\n0 TRLR")]
+        for old, new in edits:
+            self.assertEqual(1, content.count(old), old)
+            content = content.replace(old, new)
+        for lazy in [False, True]:
+            with tempfile.TemporaryDirectory() as directory:
+                filepath = os.path.join(directory, "allged.ged")
+                shutil.copyfile(input_filepath, filepath)
+                # records are hashed only on request
+                self.assertRaises(ValueError, Genealogy(filepath).reload_changed, filepath)
+                g = Genealogy(filepath, lazy=lazy, track_changes=True)
+                self.assertEqual(([], []), g.reload_changed(filepath))
+                with open(filepath, 'w', encoding='utf-8') as edited_file:
+                    edited_file.write(content)
+                reloaded_references, removed_references = g.reload_changed(filepath)
+                self.assertEqual(["@PERSON4@", "@FAMILY1@", "@FAMILY2@", "@PERSON9@"], reloaded_references)
+                self.assertEqual(["@PERSON7@"], removed_references)
+                edited_g = Genealogy(filepath)
+                # unchanged lazy records are parsed from the edited file
+                self.assertEqual(edited_g.get_gedcom(), g.get_gedcom())
+            self.assertEqual(sorted((a.reference, b.reference, data) for a, b, data in edited_g.G.edges(data="relationship")), 
+                             sorted((a.reference, b.reference, data) for a, b, data in g.G.edges(data="relationship")))
+            self.assertEqual(sorted(individual.reference for individual in edited_g.G.nodes()), sorted(individual.reference for individual in g.G.nodes()))
+
+
+    def test_batch_gedcom_import(self):
+        input_filepaths = [os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged"), 
+                           os.path.join(os.path.abspath(__file__), "../gedcom_files/sample_family.ged"),
+                           os.path.join(os.path.abspath(__file__), "../gedcom_files/allged.ged")]
+        genealogies = [Genealogy(input_filepath) for input_filepath in input_filepaths]
+        batch_g = Genealogy()
+        batch_g.import_gedcom_files(input_filepaths)
+        self.assertEqual(sum(len(g.individuals) for g in genealogies), len(batch_g.individuals))
+        self.assertEqual(sum(len(g.families) for g in genealogies), len(batch_g.families))
+        self.assertEqual(sum(len(g.G.edges()) for g in genealogies), len(batch_g.G.edges()))
+        # the content of a file is kept, with its references renamed consistently
+        single_g = Genealogy()
+        single_g.import_gedcom_files(input_filepaths[:1])
+        renamed_references = {}
+        self.assertEqual(len(genealogies[0].get_gedcom().split("\n")), len(single_g.get_gedcom().split("\n")))
+        for line, single_line in zip(genealogies[0].get_gedcom().split("\n"), single_g.get_gedcom().split("\n")):
+            for word, single_word in zip(line.split(" "), single_line.split(" ")):
+                if word.startswith("@"):
+                    self.assertEqual(single_word, renamed_references.setdefault(word, single_word))
+                else:
+                    self.assertEqual(word, single_word)
+        self.assertEqual(len(renamed_references), len(set(renamed_references.values())))
+        parallel_g = Genealogy()
+        parallel_g.import_gedcom_files(input_filepaths, workers=2)
+        self.assertEqual(batch_g.get_gedcom(), parallel_g.get_gedcom())
+        self.assertEqual("@I%s@" % (len(batch_g.individuals) + 1), "@I%s@" % batch_g.get_next_available_gedcom_id(batch_g.individuals, genealogy.RecordType.INDIVIDUALS))
+
+
     def test_add_disconnected_genealogy(self):
         # 1. load sample family GEDCOM file as a Genealogy named sample_genealogy
         # 2. load again sample family GEDCOM file as another Genealogy named sample_genealogy_2